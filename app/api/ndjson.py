@@ -0,0 +1,80 @@
+from collections.abc import AsyncIterator
+
+import anyio
+from starlette.responses import StreamingResponse
+from starlette.types import Receive
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# (1-based line number, raw line bytes); oversized lines carry None instead of bytes.
+NDJSONLine = tuple[int, bytes | None]
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Streaming response whose body generator is still reading the request body.
+
+    StreamingResponse normally races the generator for receive() messages to detect
+    disconnects, which would swallow request body chunks; here request.stream() itself
+    raises ClientDisconnect when the client goes away.
+    """
+
+    media_type = NDJSON_MEDIA_TYPE
+
+    async def listen_for_disconnect(self, receive: Receive) -> None:
+        await anyio.sleep_forever()
+
+
+async def iter_ndjson_chunks(
+    stream: AsyncIterator[bytes],
+    chunk_size: int,
+    max_line_bytes: int,
+) -> AsyncIterator[list[NDJSONLine]]:
+    """
+    Split an incoming byte stream into lists of at most chunk_size non-blank lines.
+
+    Only one chunk plus one partial line is buffered at a time, so memory stays flat
+    however long the stream is. Lines longer than max_line_bytes are yielded as None.
+    """
+    chunk: list[NDJSONLine] = []
+    buffer = bytearray()
+    line_no = 0
+    oversized = False
+
+    def emit(line: bytes | None) -> None:
+        nonlocal line_no
+        line_no += 1
+        if line is None or line.strip():
+            chunk.append((line_no, line))
+
+    async for data in stream:
+        start = 0
+        while True:
+            end = data.find(b"\n", start)
+            if end < 0:
+                if not oversized:
+                    buffer += data[start:]
+                    if len(buffer) > max_line_bytes:
+                        oversized = True
+                        buffer.clear()
+                break
+
+            if oversized:
+                emit(None)
+            else:
+                buffer += data[start:end]
+                emit(None if len(buffer) > max_line_bytes else bytes(buffer))
+            buffer.clear()
+            oversized = False
+            start = end + 1
+
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+    if oversized:
+        emit(None)
+    elif buffer:
+        emit(bytes(buffer))
+    if chunk:
+        yield chunk
@@ -2,6 +2,7 @@ from celery import Celery, Task
 from kombu import Queue
 
 from app.config import settings
+from app.observability.celery_metrics import setup_worker_metrics
 
 celery_app = Celery(
     "ree",
@@ -29,6 +30,15 @@ class TrainingShortTask(TrainingTask):
     time_limit = 240
 
 
+class BulkTask(Task):
+    autoretry_for = (Exception,)
+    retry_backoff = 30
+    retry_jitter = True
+    retry_kwargs = {"max_retries": 3}
+    soft_time_limit = 900
+    time_limit = 1200
+
+
 celery_app.conf.update(
     timezone=settings.celery_timezone,
     enable_utc=True,
@@ -47,7 +57,9 @@ celery_app.conf.update(
     task_queues=(
         Queue("celery"),
         Queue("training"),
+        Queue("bulk"),
     ),
 )
 
 celery_app.autodiscover_tasks(["app.tasks"])
+setup_worker_metrics()
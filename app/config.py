@@ -8,6 +8,7 @@ class Settings(BaseSettings):
 
     host: str = Field(default="0.0.0.0")
     port: int = Field(default=8000)
+    web_concurrency: int = Field(default=2)
 
     cors_origins: list[str] = Field(
         default_factory=lambda: ["*"],
@@ -21,6 +22,7 @@ class Settings(BaseSettings):
         default="rpc://",
     )
     celery_timezone: str = Field(default="Europe/Ljubljana")
+    celery_metrics_port: int = Field(default=9100)
 
     api_base_url: str = Field(default="http://127.0.0.1:9080")
     api_key: str = Field(default="")
@@ -35,6 +37,37 @@ class Settings(BaseSettings):
     s3_bucket_snapshots: str = Field(default="ree-snapshots")
 
     model_registry_refresh_seconds: int = Field(default=60)
+    model_registry_background_refresh: bool = Field(default=True)
+    model_cache_dir: str = Field(default="")
+    model_cache_max_bytes: int = Field(default=2 * 1024**3)
+    model_eager_load: bool = Field(default=True)
+    model_warmup_batch_sizes: list[int] = Field(default_factory=lambda: [1, 16, 256])
+    model_pool_max_versions: int = Field(default=2)
+    model_pool_max_bytes: int = Field(default=1024**3)
+
+    prediction_cache_enabled: bool = Field(default=True)
+    prediction_cache_max_entries: int = Field(default=100_000)
+    prediction_cache_ttl_seconds: float = Field(default=300.0)
+
+    inference_workers: int = Field(default=2)
+    inference_queue_size: int = Field(default=32)
+    inference_retry_after_seconds: int = Field(default=1)
+
+    micro_batching_enabled: bool = Field(default=False)
+    micro_batch_window_ms: float = Field(default=2.0)
+    micro_batch_max_size: int = Field(default=256)
+
+    shadow_model_version: str = Field(default="")
+    shadow_sample_rate: float = Field(default=0.05)
+    shadow_max_pending: int = Field(default=4)
+
+    estimate_stream_chunk_size: int = Field(default=1000)
+    estimate_stream_max_line_bytes: int = Field(default=64 * 1024)
+
+    bulk_estimate_row_groups_per_chunk: int = Field(default=1)
+    bulk_estimate_output_prefix: str = Field(default="bulk")
+    bulk_estimate_finalize_poll_seconds: int = Field(default=15)
+    bulk_estimate_timeout_seconds: int = Field(default=6 * 3600)
 
     # Training publish gating
     train_min_rows: int = Field(default=500)
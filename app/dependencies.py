@@ -1,9 +1,13 @@
 """Dependency injection utilities for FastAPI."""
 
-from fastapi import HTTPException, Request
+from fastapi import Header, HTTPException, Request
 
 from app.ml.base import Predictor
-from app.ml.registry import ModelNotReadyError, ModelRegistry
+from app.ml.registry import ModelNotReadyError, ModelRegistry, ModelVersionNotFoundError
+from app.services.inference_executor import InferenceExecutor
+from app.services.micro_batcher import MicroBatcher
+from app.services.prediction_cache import PredictionCache
+from app.services.shadow_scorer import ShadowScorer
 
 
 def get_registry(request: Request) -> ModelRegistry:
@@ -11,12 +15,56 @@ def get_registry(request: Request) -> ModelRegistry:
     return request.app.state.registry
 
 
-def get_predictor(request: Request) -> Predictor:
-    """Get current Predictor from ModelRegistry."""
+def require_warm_model(request: Request) -> None:
+    """503 while the active model is still being loaded and warmed up at startup."""
+    registry: ModelRegistry = request.app.state.registry
+    if not registry.is_ready() and registry.is_loading():
+        raise HTTPException(
+            status_code=503,
+            detail={"message": "model_warming_up", "reason": "Active model is still loading"},
+        )
+
+
+MODEL_VERSION_HEADER = "X-Model-Version"
+
+
+def get_predictor(
+    request: Request,
+    model_version: str | None = Header(
+        default=None,
+        alias=MODEL_VERSION_HEADER,
+        description="Serve this model version instead of the active one",
+    ),
+) -> Predictor:
+    """Get current Predictor from ModelRegistry, or the version pinned via X-Model-Version."""
     registry: ModelRegistry = request.app.state.registry
     try:
-        return registry.get_predictor()
+        return registry.get_predictor(model_version=(model_version or "").strip() or None)
+    except ModelVersionNotFoundError as e:
+        raise HTTPException(
+            status_code=404, detail={"message": "model_version_not_found", "reason": str(e)}
+        ) from e
     except ModelNotReadyError as e:
         raise HTTPException(
             status_code=503, detail={"message": "model_not_ready", "reason": str(e)}
         ) from e
+
+
+def get_prediction_cache(request: Request) -> PredictionCache | None:
+    """Get the prediction result cache from app.state (None when disabled)."""
+    return getattr(request.app.state, "prediction_cache", None)
+
+
+def get_inference_executor(request: Request) -> InferenceExecutor:
+    """Get the dedicated inference executor from app.state."""
+    return request.app.state.inference_executor
+
+
+def get_micro_batcher(request: Request) -> MicroBatcher | None:
+    """Get the /estimate micro-batcher from app.state (None when disabled)."""
+    return getattr(request.app.state, "micro_batcher", None)
+
+
+def get_shadow_scorer(request: Request) -> ShadowScorer | None:
+    """Get the candidate-model shadow scorer from app.state (None when disabled)."""
+    return getattr(request.app.state, "shadow_scorer", None)
@@ -0,0 +1,32 @@
+"""
+Gunicorn settings for multi-worker serving with a copy-on-write shared model.
+
+    gunicorn -c python:app.gunicorn_conf app.main:app
+
+Set PROMETHEUS_MULTIPROC_DIR to an empty directory so /metrics/prometheus aggregates
+all workers instead of whichever one served the scrape.
+"""
+
+import os
+
+from app.config import settings
+
+bind = f"{settings.host}:{settings.port}"
+workers = int(os.getenv("WEB_CONCURRENCY", str(settings.web_concurrency)))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+graceful_timeout = 30
+
+
+def when_ready(server) -> None:
+    # Runs in the master after the app is imported and before any worker is forked.
+    from app.ml.shared import preload_registry, start_master_refresh
+
+    start_master_refresh(preload_registry())
+
+
+def child_exit(server, worker) -> None:
+    # Prometheus multiprocess mode: stop counting the dead worker's live gauges.
+    from app.observability.prometheus import mark_process_dead
+
+    mark_process_dead(worker.pid)
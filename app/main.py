@@ -1,15 +1,20 @@
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Callable
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.ml.registry import ModelRegistry
+from app.ml.registry import create_registry
+from app.ml.shared import shared_registry
 from app.observability.logging import configure_logging, log
 from app.observability.prometheus import PrometheusMiddleware
 from app.observability.request_id import RequestIdMiddleware
 from app.routes import router
+from app.services.inference_executor import InferenceExecutor
+from app.services.micro_batcher import MicroBatcher
+from app.services.prediction_cache import PredictionCache
+from app.services.shadow_scorer import ShadowScorer
 from app.storage.s3 import S3Storage
 
 configure_logging()
@@ -21,25 +26,70 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Initialize and cleanup application resources."""
     # Startup
     log().info("initializing_resources")
-    app.state.storage = S3Storage()
-    app.state.registry = ModelRegistry(
-        app.state.storage,
-        refresh_seconds=settings.model_registry_refresh_seconds,
+    app.state.storage = app.state.storage_factory()
+    registry = shared_registry()
+    if registry is not None:
+        # Forked from a gunicorn master that owns the model and its refresh.
+        registry.detach_after_fork(app.state.storage)
+    else:
+        registry = create_registry(app.state.storage)
+        registry.start_background_refresh()
+        if settings.model_eager_load:
+            # Off the event loop: /health answers meanwhile, /ready reports warming up.
+            registry.start_eager_load()
+    app.state.registry = registry
+
+    app.state.prediction_cache = None
+    if settings.prediction_cache_enabled:
+        cache = PredictionCache(
+            max_entries=settings.prediction_cache_max_entries,
+            ttl_seconds=settings.prediction_cache_ttl_seconds,
+        )
+        registry.add_swap_listener(lambda _ref: cache.clear())
+        app.state.prediction_cache = cache
+
+    app.state.inference_executor = InferenceExecutor(
+        max_workers=settings.inference_workers,
+        max_queue=settings.inference_queue_size,
     )
+    app.state.micro_batcher = None
+    if settings.micro_batching_enabled:
+        app.state.micro_batcher = MicroBatcher(
+            app.state.inference_executor,
+            window_ms=settings.micro_batch_window_ms,
+            max_batch_size=settings.micro_batch_max_size,
+        )
+    app.state.shadow_scorer = None
+    if settings.shadow_model_version:
+        app.state.shadow_scorer = ShadowScorer(
+            registry,
+            settings.shadow_model_version,
+            sample_rate=settings.shadow_sample_rate,
+            max_pending=settings.shadow_max_pending,
+        )
     log().info("resources_initialized")
 
     yield
 
     # Shutdown
     log().info("shutting_down")
+    app.state.registry.stop_background_refresh()
+    app.state.inference_executor.shutdown()
+    if app.state.shadow_scorer is not None:
+        app.state.shadow_scorer.shutdown()
 
 
-def create_app() -> FastAPI:
+def create_app(storage_factory: Callable[[], S3Storage] = S3Storage) -> FastAPI:
+    """
+    Build the API. `storage_factory` is called once at startup; benchmarks pass one
+    that serves models from a local directory instead of S3.
+    """
     api = FastAPI(
         title="Norway Real Estate Price Estimator",
         version="1.0.0",
         lifespan=lifespan,
     )
+    api.state.storage_factory = storage_factory
 
     api.add_middleware(
         CORSMiddleware,
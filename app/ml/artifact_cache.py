@@ -0,0 +1,101 @@
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from app.observability.logging import log
+
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+
+def _safe(part: str) -> str:
+    return _UNSAFE_CHARS.sub("_", part.strip().strip('"')) or "_"
+
+
+class ArtifactCache:
+    """
+    Read-through on-disk cache for model artifacts.
+
+    Entries live under <root>/<model_version>/<etag>/<name>, are written atomically
+    (temp file + rename) and the directory is kept under max_bytes by evicting the
+    least recently used files (mtime is bumped on every hit).
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int):
+        self._root = Path(root)
+        self._max_bytes = max(int(max_bytes), 0)
+        self._root.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, model_version: str, name: str, etag: str) -> Path:
+        return self._root / _safe(model_version) / _safe(etag) / _safe(name)
+
+    def get(self, model_version: str, name: str, etag: str) -> bytes | None:
+        path = self.path_for(model_version, name, etag)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            log().warning("model_cache_read_failed", path=str(path), error=str(e))
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, model_version: str, name: str, etag: str, data: bytes) -> Path | None:
+        path = self.path_for(model_version, name, etag)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    fh.write(data)
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                os.replace(tmp, path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            log().warning("model_cache_write_failed", path=str(path), error=str(e))
+            return None
+
+        self._evict(keep=path)
+        return path
+
+    def _evict(self, keep: Path) -> None:
+        entries: list[tuple[float, int, Path]] = []
+        total = 0
+        for path in self._root.rglob("*"):
+            if not path.is_file() or path.name.startswith("."):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort(key=lambda e: e[0])
+        for _, size, path in entries:
+            if total <= self._max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            self._prune_empty_dirs(path.parent)
+
+    def _prune_empty_dirs(self, directory: Path) -> None:
+        while directory != self._root and self._root in directory.parents:
+            try:
+                directory.rmdir()
+            except OSError:
+                return
+            directory = directory.parent
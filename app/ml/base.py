@@ -1,9 +1,27 @@
 from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
 
-from app.schemas import EstimationFeatures
+import numpy as np
+
+from app.schemas import EstimationFeaturesBase
 
 
 class Predictor(ABC):
     @abstractmethod
-    def predict_one(self, features: EstimationFeatures) -> int:
+    def predict_one(self, features: EstimationFeaturesBase) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def predict_batch(self, features: Sequence[EstimationFeaturesBase]) -> np.ndarray:
+        """Return integer NOK prices (int64), one per input, in input order."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def predict_columns(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        """
+        Like predict_batch, for inputs that are already columnar.
+
+        columns maps each EstimationFeatures field to an array (see
+        FeatureEncoder.encode_columns); inputs must already satisfy its validation rules.
+        """
         raise NotImplementedError
@@ -0,0 +1,203 @@
+import sys
+import time
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any
+
+import numpy as np
+
+from app.schemas import EstimationFeaturesBase, RealEstateType
+
+# Mirrors app.training.modeling; used when a model's feature_schema.json predates the
+# "categorical"/"numeric" keys.
+DEFAULT_CATEGORICAL_COLS: list[str] = [
+    "realestate_type",
+    "municipality_number",
+]
+
+DEFAULT_NUMERIC_COLS: list[str] = [
+    "lat",
+    "lon",
+    "built_year",
+    "building_age",
+    "bra",
+    "total_area",
+    "floor",
+    "bedrooms",
+    "rooms",
+    "area_ratio",
+]
+
+_BASE_NUMERIC_COLS = {
+    "lat",
+    "lon",
+    "built_year",
+    "bra",
+    "total_area",
+    "floor",
+    "bedrooms",
+    "rooms",
+}
+
+_REALESTATE_TYPE_VALUES: dict[RealEstateType, str] = {
+    rt: sys.intern(rt.value) for rt in RealEstateType
+}
+
+_MUNICIPALITY_CACHE_MAX = 4096
+
+
+@dataclass(frozen=True)
+class EncodedFeatures:
+    numeric: np.ndarray
+    categorical: np.ndarray
+    numeric_names: list[str]
+    categorical_names: list[str]
+
+    def __len__(self) -> int:
+        return int(self.numeric.shape[0])
+
+
+class FeatureEncoder:
+    """
+    Columnar encoder compiled from a model's feature_schema.json.
+
+    Writes feature values straight into preallocated NumPy arrays (float32 numerics,
+    object categoricals) so inference never builds per-row dicts or a DataFrame.
+    """
+
+    def __init__(self, categorical: Sequence[str], numeric: Sequence[str]):
+        self.categorical_names = [str(c) for c in categorical]
+        self.numeric_names = [str(c) for c in numeric]
+
+        unknown_cat = [c for c in self.categorical_names if c not in _CATEGORICAL_ENCODERS]
+        unknown_num = [
+            c
+            for c in self.numeric_names
+            if c not in _BASE_NUMERIC_COLS and c not in _DERIVED_NUMERIC_COLS
+        ]
+        if unknown_cat or unknown_num:
+            raise ValueError(f"Unsupported feature columns: {unknown_cat + unknown_num}")
+
+        self._municipality_cache: dict[int, str] = {}
+        self._current_year_value = 0
+        self._current_year_expires_at = 0.0
+
+    @classmethod
+    def from_schema(cls, schema: dict[str, Any] | None) -> "FeatureEncoder":
+        schema = schema or {}
+        return cls(
+            categorical=schema.get("categorical") or DEFAULT_CATEGORICAL_COLS,
+            numeric=schema.get("numeric") or DEFAULT_NUMERIC_COLS,
+        )
+
+    def encode(self, features: Sequence[EstimationFeaturesBase]) -> EncodedFeatures:
+        return self.encode_columns(_FeatureColumns(features))
+
+    def encode_columns(self, columns: Mapping[str, np.ndarray]) -> EncodedFeatures:
+        """
+        Encode already-columnar inputs: one array per EstimationFeatures field.
+
+        realestate_type holds the enum values as strings; numeric columns are float64
+        (or int64), with NaN for missing optional values.
+        """
+        n = len(columns["bra"])
+
+        categorical = np.empty((n, len(self.categorical_names)), dtype=object)
+        for j, name in enumerate(self.categorical_names):
+            categorical[:, j] = _CATEGORICAL_ENCODERS[name](self, columns[name])
+
+        numeric = np.empty((n, len(self.numeric_names)), dtype=np.float32)
+        for j, name in enumerate(self.numeric_names):
+            if name in _DERIVED_NUMERIC_COLS:
+                numeric[:, j] = _DERIVED_NUMERIC_COLS[name](self, columns)
+            else:
+                numeric[:, j] = columns[name]
+
+        return EncodedFeatures(
+            numeric=numeric,
+            categorical=categorical,
+            numeric_names=self.numeric_names,
+            categorical_names=self.categorical_names,
+        )
+
+    def current_year(self) -> int:
+        """Current year, recomputed once per day rather than per row."""
+        now = time.time()
+        if now >= self._current_year_expires_at:
+            today = date.today()
+            midnight = datetime.combine(today + timedelta(days=1), datetime.min.time())
+            self._current_year_value = today.year
+            self._current_year_expires_at = midnight.timestamp()
+        return self._current_year_value
+
+    def _municipality_str(self, value: int) -> str:
+        cached = self._municipality_cache.get(value)
+        if cached is None:
+            cached = sys.intern(str(int(value)))
+            if len(self._municipality_cache) < _MUNICIPALITY_CACHE_MAX:
+                self._municipality_cache[value] = cached
+        return cached
+
+
+class _FeatureColumns(dict):
+    """Columns of a sequence of EstimationFeatures, built on first access."""
+
+    def __init__(self, features: Sequence[EstimationFeaturesBase]):
+        super().__init__()
+        self._features = features
+
+    def __missing__(self, name: str) -> np.ndarray:
+        if name == "realestate_type":
+            col = np.array(
+                [_REALESTATE_TYPE_VALUES[f.realestate_type] for f in self._features],
+                dtype=object,
+            )
+        else:
+            # Optional fields (floor, bedrooms, rooms) map None -> NaN.
+            col = np.array([getattr(f, name) for f in self._features], dtype=np.float64)
+        self[name] = col
+        return col
+
+
+def _encode_realestate_type(encoder: FeatureEncoder, column: np.ndarray) -> np.ndarray:
+    return column
+
+
+def _encode_municipality_number(encoder: FeatureEncoder, column: np.ndarray) -> np.ndarray:
+    # Few distinct municipalities per batch: stringify each one once.
+    values, inverse = np.unique(column, return_inverse=True)
+    strings = np.array([encoder._municipality_str(int(v)) for v in values], dtype=object)
+    return strings[inverse]
+
+
+def _building_age(encoder: FeatureEncoder, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+    return encoder.current_year() - columns["built_year"]
+
+
+def _area_ratio(encoder: FeatureEncoder, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+    bra = np.asarray(columns["bra"], dtype=np.float64)
+    total_area = np.asarray(columns["total_area"], dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total_area > 0, bra / total_area, np.nan)
+
+
+_CATEGORICAL_ENCODERS: dict[str, Callable[[FeatureEncoder, np.ndarray], np.ndarray]] = {
+    "realestate_type": _encode_realestate_type,
+    "municipality_number": _encode_municipality_number,
+}
+
+_DERIVED_NUMERIC_COLS: dict[
+    str, Callable[[FeatureEncoder, Mapping[str, np.ndarray]], np.ndarray]
+] = {
+    "building_age": _building_age,
+    "area_ratio": _area_ratio,
+}
+
+# Every input field an encoder can read, in declaration order; the rest (gnr/bnr/snr
+# cadastral numbers) never reach a model. Derived columns only use fields listed here.
+MODEL_INPUT_FIELDS: tuple[str, ...] = tuple(
+    name
+    for name in EstimationFeaturesBase.model_fields
+    if name in _CATEGORICAL_ENCODERS or name in _BASE_NUMERIC_COLS
+)
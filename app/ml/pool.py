@@ -0,0 +1,70 @@
+import threading
+from collections import OrderedDict
+
+from app.ml.base import Predictor
+from app.observability.prometheus import (
+    MODEL_POOL_EVICTIONS_TOTAL,
+    MODEL_POOL_RESIDENT_BYTES,
+    MODEL_POOL_RESIDENT_VERSIONS,
+)
+
+
+class PredictorPool:
+    """
+    LRU pool of loaded predictors keyed by model_version, bounded by count and bytes.
+
+    Sizes are the serialized artifact sizes, a proxy for resident memory. The most
+    recently inserted predictor is always kept, even when it alone exceeds max_bytes.
+    """
+
+    def __init__(self, max_versions: int = 2, max_bytes: int = 1024**3):
+        self._max_versions = max(int(max_versions), 1)
+        self._max_bytes = int(max_bytes)
+        self._entries: OrderedDict[str, tuple[Predictor, int]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, model_version: str) -> bool:
+        return model_version in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def reset_lock(self) -> None:
+        """Replace the lock in a forked child; the parent may have held it at fork time."""
+        self._lock = threading.Lock()
+
+    def versions(self) -> list[str]:
+        """Resident versions, least recently used first."""
+        with self._lock:
+            return list(self._entries)
+
+    def get(self, model_version: str) -> Predictor | None:
+        with self._lock:
+            entry = self._entries.get(model_version)
+            if entry is None:
+                return None
+            self._entries.move_to_end(model_version)
+            return entry[0]
+
+    def put(self, model_version: str, predictor: Predictor, size_bytes: int) -> None:
+        with self._lock:
+            old = self._entries.pop(model_version, None)
+            if old is not None:
+                self._total_bytes -= old[1]
+            self._entries[model_version] = (predictor, int(size_bytes))
+            self._total_bytes += int(size_bytes)
+
+            while len(self._entries) > 1 and (
+                len(self._entries) > self._max_versions or self._total_bytes > self._max_bytes
+            ):
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_bytes
+                MODEL_POOL_EVICTIONS_TOTAL.inc()
+
+            MODEL_POOL_RESIDENT_VERSIONS.set(len(self._entries))
+            MODEL_POOL_RESIDENT_BYTES.set(self._total_bytes)
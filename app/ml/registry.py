@@ -1,11 +1,29 @@
+import re
+import threading
 import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
 from dataclasses import dataclass
 from typing import Any
 
 from app.config import settings
+from app.ml.artifact_cache import ArtifactCache
 from app.ml.base import Predictor
+from app.ml.pool import PredictorPool
 from app.ml.sklearn_predictor import SklearnPredictor
 from app.ml.stub import StubPredictor
+from app.ml.warmup import DEFAULT_WARMUP_BATCH_SIZES, warm_up
+from app.observability.logging import log
+from app.observability.prometheus import (
+    MODEL_ARTIFACT_CACHE_TOTAL,
+    MODEL_LOAD_DURATION_SECONDS,
+    MODEL_POOL_LOADS_TOTAL,
+    MODEL_REGISTRY_REFRESH_CHECKS_TOTAL,
+    MODEL_REGISTRY_RELOAD_COALESCED_TOTAL,
+    MODEL_REGISTRY_RELOADS_TOTAL,
+    MODEL_VERSION_INFO,
+    MODEL_WARMUP_DURATION_SECONDS,
+)
 from app.storage.s3 import S3Storage, S3StorageError
 
 
@@ -13,39 +31,348 @@ class ModelNotReadyError(RuntimeError):
     pass
 
 
+class ModelVersionNotFoundError(ModelNotReadyError):
+    pass
+
+
+_MODEL_VERSION_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+
 @dataclass(frozen=True)
 class ModelRef:
     model_version: str
     model_type: str
     artifact_key: str
+    native_artifact_key: str = ""
 
 
 class ModelRegistry:
     """
     Loads model pointer (latest.json) and model artifact from S3-compatible storage.
     Caches predictor in-memory with TTL to avoid hitting S3 on each request.
+    When the TTL expires only latest.json is re-read; the artifact is downloaded and
+    deserialized again only if the pointer references a different model.
+
+    With background refresh enabled a daemon thread polls latest.json, loads and warms
+    new versions off the request path and swaps them in; get_predictor() then only reads
+    the current reference.
+
+    Other versions can be pinned per call (get_predictor(model_version=...)); they are
+    loaded lazily from models/<version>/ into an LRU PredictorPool, which also keeps the
+    previously active model after a swap.
     """
 
-    def __init__(self, storage: S3Storage, refresh_seconds: int = 60):
+    def __init__(
+        self,
+        storage: S3Storage,
+        refresh_seconds: int = 60,
+        background_refresh: bool = False,
+        artifact_cache: ArtifactCache | None = None,
+        pool: PredictorPool | None = None,
+        warmup_batch_sizes: Sequence[int] = DEFAULT_WARMUP_BATCH_SIZES,
+    ):
         self._storage = storage
+        self._artifact_cache = artifact_cache
         self._refresh_seconds = max(int(refresh_seconds), 1)
+        self._background_refresh = bool(background_refresh)
+        self._warmup_batch_sizes = tuple(warmup_batch_sizes)
 
-        self._cached_predictor: StubPredictor | None = None
+        self._cached_predictor: Predictor | None = None
+        self._cached_ref: ModelRef | None = None
         self._cached_version: str | None = None
         self._cached_at: float = 0.0
+        self._cached_bytes = 0
 
-    def get_predictor(self) -> Predictor:
-        now = time.time()
-        if self._cached_predictor and (now - self._cached_at) < self._refresh_seconds:
+        self._pool = pool or PredictorPool()
+        self._pinned_inflight: dict[str, Future] = {}
+        # Artifact bytes read per version while it is being built; _build_sized takes the
+        # entry back out, so nothing is left behind for versions that are not pooled.
+        self._artifact_bytes: dict[str, int] = {}
+
+        self._reload_lock = threading.Lock()
+        self._inflight: Future | None = None
+
+        self._refresh_thread: threading.Thread | None = None
+        self._refresh_external = False
+        self._stop_refresh = threading.Event()
+        self._swap_listeners: list[Callable[[ModelRef], None]] = []
+
+    def get_predictor(self, model_version: str | None = None) -> Predictor:
+        if model_version:
+            return self._get_pinned(model_version)
+
+        predictor = self._cached_predictor
+        if predictor is not None and (self._refresh_thread is not None or self._refresh_external):
+            return predictor
+
+        if predictor is not None and (time.time() - self._cached_at) < self._refresh_seconds:
+            return predictor
+
+        predictor, _ = self._reload_single_flight(stale=predictor)
+        return predictor
+
+    def refresh(self) -> bool:
+        """
+        Load, warm up and swap in the model referenced by latest.json if it changed.
+        Returns True when a new predictor was swapped in.
+        """
+        _, swapped = self._reload_single_flight(stale=None)
+        return swapped
+
+    def is_ready(self) -> bool:
+        """True once a (warmed) active model has been swapped in."""
+        return self._cached_predictor is not None
+
+    def is_loading(self) -> bool:
+        """True while latest.json is being checked or its model loaded and warmed."""
+        return self._inflight is not None
+
+    def start_eager_load(self) -> None:
+        """
+        Load and warm the active model in the background, so the first request is warm.
+
+        Not needed with the background refresher, whose first iteration does the same.
+        Failures (e.g. no model published yet) are logged; requests then load lazily.
+        """
+        if self._refresh_thread is not None or self._refresh_external:
+            return
+
+        def load() -> None:
+            try:
+                self.refresh()
+            except Exception as e:
+                log().warning("model_eager_load_failed", error=str(e))
+
+        threading.Thread(target=load, name="model-registry-eager-load", daemon=True).start()
+
+    def _get_pinned(self, model_version: str) -> Predictor:
+        if model_version == self._cached_version and self._cached_predictor is not None:
             return self._cached_predictor
 
-        model_ref = self._load_latest()
-        predictor = self._build_predictor(model_ref)
+        predictor = self._pool.get(model_version)
+        if predictor is not None:
+            return predictor
 
-        self._cached_predictor = predictor
+        # Single flight per version, as for latest.json reloads.
+        with self._reload_lock:
+            future = self._pinned_inflight.get(model_version)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._pinned_inflight[model_version] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            model_ref = self._ref_for_version(model_version)
+            predictor, size_bytes = self._load_warm(model_ref)
+            self._pool.put(model_version, predictor, size_bytes)
+            MODEL_POOL_LOADS_TOTAL.inc()
+            log().info("model_version_loaded", model_version=model_version)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(predictor)
+            return predictor
+        finally:
+            with self._reload_lock:
+                self._pinned_inflight.pop(model_version, None)
+
+    def _ref_for_version(self, model_version: str) -> ModelRef:
+        if not _MODEL_VERSION_RE.match(model_version):
+            raise ModelVersionNotFoundError(f"Invalid model version: {model_version!r}")
+
+        prefix = f"models/{model_version}"
+        for model_type, name in (("sklearn", "model.pkl"), ("stub", "model.json")):
+            key = f"{prefix}/{name}"
+            try:
+                if self._storage.exists(bucket=settings.s3_bucket_models, key=key):
+                    return ModelRef(
+                        model_version=model_version, model_type=model_type, artifact_key=key
+                    )
+            except S3StorageError as e:
+                raise ModelNotReadyError(f"Failed to look up {key}") from e
+
+        raise ModelVersionNotFoundError(f"Unknown model version: {model_version}")
+
+    def _reload_single_flight(self, stale: Predictor | None) -> tuple[Predictor, bool]:
+        """
+        Only one thread checks latest.json and loads the artifact at a time. Concurrent
+        callers keep serving the stale predictor if they have one, otherwise they wait
+        for the in-flight load and share its result (or error).
+        """
+        with self._reload_lock:
+            future = self._inflight
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight = future
+
+        if not leader:
+            if stale is not None:
+                MODEL_REGISTRY_RELOAD_COALESCED_TOTAL.labels(outcome="served_stale").inc()
+                return stale, False
+            MODEL_REGISTRY_RELOAD_COALESCED_TOTAL.labels(outcome="waited").inc()
+            return future.result(), False
+
+        try:
+            result = self._reload()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result[0])
+            return result
+        finally:
+            with self._reload_lock:
+                self._inflight = None
+
+    def _reload(self) -> tuple[Predictor, bool]:
+        now = time.time()
+        model_ref = self._check_latest()
+        if self._cached_predictor is not None and model_ref == self._cached_ref:
+            self._cached_at = now
+            return self._cached_predictor, False
+
+        predictor, size_bytes = self._load_warm(model_ref)
+        MODEL_REGISTRY_RELOADS_TOTAL.inc()
+
+        self._swap(model_ref, predictor, now, size_bytes)
+        log().info("model_swapped", model_version=model_ref.model_version)
+        for listener in list(self._swap_listeners):
+            try:
+                listener(model_ref)
+            except Exception as e:
+                log().warning("model_swap_listener_failed", error=str(e))
+        return predictor, True
+
+    def add_swap_listener(self, listener: Callable[[ModelRef], None]) -> None:
+        """Register a callback invoked on the reloading thread after a model swap."""
+        self._swap_listeners.append(listener)
+
+    def detach_after_fork(self, storage: S3Storage) -> None:
+        """
+        Prepare a registry inherited from a pre-fork parent for use in a worker process.
+
+        The parent keeps polling latest.json and replaces workers on a version change, so
+        the worker serves the inherited (copy-on-write shared) predictor as-is. The storage
+        client is replaced because connection pools must not be shared across processes,
+        and every lock is recreated: the parent's refresh thread may hold one at fork time.
+        """
+        self._storage = storage
+        self._pool.reset_lock()
+        self._reload_lock = threading.Lock()
+        self._inflight = None
+        self._pinned_inflight = {}
+        self._refresh_thread = None
+        self._stop_refresh = threading.Event()
+        self._swap_listeners = []
+        self._refresh_external = True
+
+    def start_background_refresh(self) -> None:
+        if not self._background_refresh or self._refresh_thread is not None:
+            return
+
+        self._stop_refresh.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop,
+            name="model-registry-refresh",
+            daemon=True,
+        )
+        self._refresh_thread.start()
+
+    def stop_background_refresh(self, timeout: float = 5.0) -> None:
+        thread = self._refresh_thread
+        if thread is None:
+            return
+
+        self._stop_refresh.set()
+        thread.join(timeout=timeout)
+        self._refresh_thread = None
+
+    def _refresh_loop(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                log().warning("model_refresh_failed", error=str(e))
+
+            if self._stop_refresh.wait(self._refresh_seconds):
+                return
+
+    def latest_ref(self) -> ModelRef:
+        """Read the model reference latest.json currently points to."""
+        return self._load_latest()
+
+    def load_predictor(self, model_ref: ModelRef) -> Predictor:
+        """Load the referenced model without touching the served (cached) predictor."""
+        predictor, _ = self._build_sized(model_ref)
+        return predictor
+
+    def _load_warm(self, model_ref: ModelRef) -> tuple[Predictor, int]:
+        """Build and warm a predictor; returns it with its artifact size in bytes."""
+        # Every served predictor, active or pinned, is warmed before it becomes visible.
+        started = time.perf_counter()
+        predictor, size_bytes = self._build_sized(model_ref)
+        loaded = time.perf_counter()
+        MODEL_LOAD_DURATION_SECONDS.observe(loaded - started)
+
+        try:
+            warm_up(predictor, self._warmup_batch_sizes)
+        except Exception as e:
+            raise ModelNotReadyError(f"Warm-up failed for {model_ref.model_version}: {e}") from e
+        warmup_seconds = time.perf_counter() - loaded
+        MODEL_WARMUP_DURATION_SECONDS.observe(warmup_seconds)
+        log().info(
+            "model_loaded",
+            model_version=model_ref.model_version,
+            load_seconds=round(loaded - started, 3),
+            warmup_seconds=round(warmup_seconds, 3),
+        )
+        return predictor, size_bytes
+
+    def _build_sized(self, model_ref: ModelRef) -> tuple[Predictor, int]:
+        try:
+            predictor = self._build_predictor(model_ref)
+        finally:
+            size_bytes = self._artifact_bytes.pop(model_ref.model_version, 0)
+        return predictor, size_bytes
+
+    def _check_latest(self) -> ModelRef:
+        try:
+            model_ref = self._load_latest()
+        except ModelNotReadyError:
+            MODEL_REGISTRY_REFRESH_CHECKS_TOTAL.labels(result="error").inc()
+            raise
+
+        result = "unchanged" if model_ref == self._cached_ref else "changed"
+        MODEL_REGISTRY_REFRESH_CHECKS_TOTAL.labels(result=result).inc()
+        return model_ref
+
+    def _swap(
+        self, model_ref: ModelRef, predictor: Predictor, now: float, size_bytes: int = 0
+    ) -> None:
+        previous, previous_version = self._cached_predictor, self._cached_version
+        if (
+            previous is not None
+            and previous_version
+            and previous_version != model_ref.model_version
+        ):
+            # Stays resident for clients pinned to it.
+            self._pool.put(previous_version, previous, self._cached_bytes)
+
+        # Readers only dereference _cached_predictor, so a single assignment is the swap.
+        self._cached_bytes = int(size_bytes)
+        self._cached_ref = model_ref
         self._cached_version = model_ref.model_version
         self._cached_at = now
-        return predictor
+        self._cached_predictor = predictor
+        if previous_version and previous_version != model_ref.model_version:
+            # Zeroed rather than removed: removal does not reach multiprocess metric files.
+            MODEL_VERSION_INFO.labels(model_version=previous_version).set(0)
+        MODEL_VERSION_INFO.labels(model_version=model_ref.model_version).set(1)
 
     def _load_latest(self) -> ModelRef:
         try:
@@ -70,6 +397,7 @@ class ModelRegistry:
             model_version=model_version,
             model_type=model_type,
             artifact_key=artifact_key,
+            native_artifact_key=str(latest.get("native_artifact_key", "") or "").strip(),
         )
 
     def _load_feature_schema(self, artifact_key: str) -> dict[str, Any]:
@@ -80,6 +408,25 @@ class ModelRegistry:
         except S3StorageError as e:
             raise ModelNotReadyError(f"Missing feature schema: {schema_key}") from e
 
+    def _get_artifact_bytes(self, model_version: str, key: str) -> bytes:
+        cache = self._artifact_cache
+        if cache is None:
+            data = self._storage.get_bytes(bucket=settings.s3_bucket_models, key=key)
+            self._artifact_bytes[model_version] = len(data)
+            return data
+
+        name = key.rsplit("/", 1)[-1]
+        etag = self._storage.get_etag(bucket=settings.s3_bucket_models, key=key)
+        data = cache.get(model_version, name, etag)
+        if data is not None:
+            MODEL_ARTIFACT_CACHE_TOTAL.labels(result="hit").inc()
+        else:
+            MODEL_ARTIFACT_CACHE_TOTAL.labels(result="miss").inc()
+            data = self._storage.get_bytes(bucket=settings.s3_bucket_models, key=key)
+            cache.put(model_version, name, etag, data)
+        self._artifact_bytes[model_version] = len(data)
+        return data
+
     def _build_predictor(self, model_ref: ModelRef) -> Predictor:
         if model_ref.model_type not in {"stub", "sklearn"}:
             raise ModelNotReadyError(f"Unsupported model type: {model_ref.model_type}")
@@ -98,24 +445,66 @@ class ModelRegistry:
             )
 
         if model_ref.model_type == "sklearn":
+            schema = self._load_feature_schema(model_ref.artifact_key)
+            prediction_transform = str(schema.get("prediction_transform", "")).strip()
+
             try:
-                data = self._storage.get_bytes(
-                    bucket=settings.s3_bucket_models,
-                    key=model_ref.artifact_key,
+                native = self._build_native_predictor(model_ref, schema, prediction_transform)
+                if native is not None:
+                    return native
+
+                try:
+                    data = self._get_artifact_bytes(
+                        model_ref.model_version, model_ref.artifact_key
+                    )
+                except S3StorageError as e:
+                    raise ModelNotReadyError(
+                        f"Failed to load model artifact: {model_ref.artifact_key}"
+                    ) from e
+
+                return SklearnPredictor.from_bytes(
+                    model_version=model_ref.model_version,
+                    data=data,
+                    prediction_transform=prediction_transform,
+                    feature_schema=schema,
                 )
-            except S3StorageError as e:
+            except ValueError as e:
                 raise ModelNotReadyError(
-                    f"Failed to load model artifact: {model_ref.artifact_key}"
+                    f"Incompatible feature schema for {model_ref.model_version}: {e}"
                 ) from e
 
-            schema = self._load_feature_schema(model_ref.artifact_key)
-            prediction_transform = str(schema.get("prediction_transform", "")).strip()
+    def _build_native_predictor(
+        self,
+        model_ref: ModelRef,
+        schema: dict[str, Any],
+        prediction_transform: str,
+    ) -> Predictor | None:
+        """
+        Load the model from its native (non-pickle) artifact when one was published.
+        Returns None so the caller falls back to model.pkl if it is missing or unreadable.
+        """
+        native_key = model_ref.native_artifact_key or str(schema.get("native_model_key", ""))
+        if not native_key.strip():
+            return None
 
-            return SklearnPredictor.from_bytes(
+        try:
+            data = self._get_artifact_bytes(model_ref.model_version, native_key.strip())
+            return SklearnPredictor.from_native_bytes(
                 model_version=model_ref.model_version,
                 data=data,
                 prediction_transform=prediction_transform,
+                feature_schema=schema,
+            )
+        except ValueError:
+            raise
+        except Exception as e:
+            log().warning(
+                "native_model_load_failed",
+                model_version=model_ref.model_version,
+                key=native_key,
+                error=str(e),
             )
+            return None
 
     def get_active_metrics(self) -> dict[str, Any]:
         ref = self._load_latest()
@@ -136,3 +525,27 @@ class ModelRegistry:
             "metrics_key": metrics_key,
             "metrics": metrics,
         }
+
+
+def create_registry(storage: S3Storage, background_refresh: bool | None = None) -> ModelRegistry:
+    """Build a ModelRegistry configured from settings."""
+    artifact_cache = None
+    if settings.model_cache_dir:
+        artifact_cache = ArtifactCache(
+            settings.model_cache_dir,
+            max_bytes=settings.model_cache_max_bytes,
+        )
+    if background_refresh is None:
+        background_refresh = settings.model_registry_background_refresh
+
+    return ModelRegistry(
+        storage,
+        refresh_seconds=settings.model_registry_refresh_seconds,
+        background_refresh=background_refresh,
+        artifact_cache=artifact_cache,
+        pool=PredictorPool(
+            max_versions=settings.model_pool_max_versions,
+            max_bytes=settings.model_pool_max_bytes,
+        ),
+        warmup_batch_sizes=settings.model_warmup_batch_sizes,
+    )
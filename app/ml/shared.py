@@ -0,0 +1,51 @@
+"""
+Pre-fork model sharing for multi-worker serving (gunicorn with preload_app).
+
+The master process loads and warms the active model once, freezes the GC so the loaded
+objects are never touched again, and then forks workers that inherit the predictor
+copy-on-write. The master keeps polling latest.json; when a new version is swapped in it
+sends itself SIGHUP so gunicorn gracefully replaces the workers with fresh forks that
+share the new model.
+"""
+
+import gc
+import os
+import signal
+
+from app.ml.registry import ModelRef, ModelRegistry, create_registry
+from app.observability.logging import log
+from app.storage.s3 import S3Storage
+
+_shared_registry: ModelRegistry | None = None
+
+
+def preload_registry() -> ModelRegistry:
+    """Load and warm the active model in the current (master) process."""
+    global _shared_registry
+
+    registry = create_registry(S3Storage(), background_refresh=True)
+    try:
+        registry.refresh()
+    except Exception as e:
+        # Workers fall back to loading on their own until the master has a model.
+        log().warning("model_preload_failed", error=str(e))
+
+    gc.freeze()
+    _shared_registry = registry
+    return registry
+
+
+def start_master_refresh(registry: ModelRegistry) -> None:
+    """Poll for new versions in the master and recycle workers after each swap."""
+    registry.add_swap_listener(_reload_workers)
+    registry.start_background_refresh()
+
+
+def shared_registry() -> ModelRegistry | None:
+    return _shared_registry
+
+
+def _reload_workers(model_ref: ModelRef) -> None:
+    gc.freeze()
+    log().info("model_reload_workers", model_version=model_ref.model_version)
+    os.kill(os.getpid(), signal.SIGHUP)
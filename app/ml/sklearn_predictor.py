@@ -1,13 +1,24 @@
-from datetime import date
+from collections.abc import Mapping, Sequence
 from io import BytesIO
 from typing import Any
 
-import joblib
 import numpy as np
-import pandas as pd
 
 from app.ml.base import Predictor
-from app.schemas import EstimationFeatures
+from app.ml.features import EncodedFeatures, FeatureEncoder
+from app.observability.prometheus import (
+    ESTIMATE_STAGE_DURATION_SECONDS,
+    PREDICTION_LATENCY,
+    request_path_timer,
+)
+from app.schemas import EstimationFeaturesBase
+
+# joblib, pandas and catboost are imported where a predictor first needs them, keeping
+# them out of the API's import-time path (scripts/check_import_time.py).
+
+_ENCODING_SECONDS = ESTIMATE_STAGE_DURATION_SECONDS.labels(stage="encoding")
+_PREDICT_SECONDS = ESTIMATE_STAGE_DURATION_SECONDS.labels(stage="predict")
+_POSTPROCESS_SECONDS = ESTIMATE_STAGE_DURATION_SECONDS.labels(stage="postprocess")
 
 
 class SklearnPredictor(Predictor):
@@ -16,10 +27,14 @@ class SklearnPredictor(Predictor):
         model_version: str,
         pipeline: Any,
         prediction_transform: str | None = None,
+        feature_schema: dict[str, Any] | None = None,
     ):
         self.model_version = model_version
         self._pipeline = pipeline
         self._prediction_transform = prediction_transform
+        self._encoder = FeatureEncoder.from_schema(feature_schema)
+        # CatBoost models take columnar FeaturesData directly; anything else gets a DataFrame.
+        self._is_catboost = hasattr(pipeline, "get_cat_feature_indices")
 
     @classmethod
     def from_bytes(
@@ -27,48 +42,85 @@ class SklearnPredictor(Predictor):
         model_version: str,
         data: bytes,
         prediction_transform: str | None = None,
+        feature_schema: dict[str, Any] | None = None,
     ) -> "SklearnPredictor":
+        import joblib
+
         pipeline = joblib.load(BytesIO(data))
         return cls(
             model_version=model_version,
             pipeline=pipeline,
             prediction_transform=prediction_transform,
+            feature_schema=feature_schema,
         )
 
-    def predict_one(self, features: EstimationFeatures) -> int:
-        row = self._features_to_row(features)
-        df = pd.DataFrame([row])
-        y_pred = self._pipeline.predict(df)
-        pred = float(y_pred[0])
-        if self._prediction_transform == "expm1":
-            pred = float(np.expm1(pred))
-
-        price = int(pred)
-        return max(price, 0)
-
-    @staticmethod
-    def _features_to_row(f: EstimationFeatures) -> dict[str, Any]:
-        total_area = float(f.total_area)
-        bra = float(f.bra)
-        area_ratio = bra / total_area if total_area > 0 else None
-
-        building_age = None
-        try:
-            building_age = date.today().year - int(f.built_year)
-        except Exception:
-            building_age = None
-
-        return {
-            "realestate_type": str(f.realestate_type.value),
-            "municipality_number": int(f.municipality_number),
-            "lat": float(f.lat),
-            "lon": float(f.lon),
-            "built_year": int(f.built_year),
-            "building_age": building_age,
-            "bra": bra,
-            "total_area": total_area,
-            "floor": f.floor,
-            "bedrooms": f.bedrooms,
-            "rooms": f.rooms,
-            "area_ratio": area_ratio,
-        }
+    @classmethod
+    def from_native_bytes(
+        cls,
+        model_version: str,
+        data: bytes,
+        prediction_transform: str | None = None,
+        feature_schema: dict[str, Any] | None = None,
+    ) -> "SklearnPredictor":
+        """Load a CatBoost model saved in its native .cbm format (no pickle involved)."""
+        from catboost import CatBoostRegressor
+
+        model = CatBoostRegressor()
+        model.load_model(blob=data, format="cbm")
+        return cls(
+            model_version=model_version,
+            pipeline=model,
+            prediction_transform=prediction_transform,
+            feature_schema=feature_schema,
+        )
+
+    def predict_one(self, features: EstimationFeaturesBase) -> int:
+        return int(self.predict_batch([features])[0])
+
+    @request_path_timer(PREDICTION_LATENCY)
+    def predict_batch(self, features: Sequence[EstimationFeaturesBase]) -> np.ndarray:
+        if not features:
+            return np.empty(0, dtype=np.int64)
+
+        with request_path_timer(_ENCODING_SECONDS):
+            encoded = self._encoder.encode(features)
+        return self._predict_encoded(encoded)
+
+    @request_path_timer(PREDICTION_LATENCY)
+    def predict_columns(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        if len(columns["bra"]) == 0:
+            return np.empty(0, dtype=np.int64)
+
+        with request_path_timer(_ENCODING_SECONDS):
+            encoded = self._encoder.encode_columns(columns)
+        return self._predict_encoded(encoded)
+
+    def _predict_encoded(self, encoded: EncodedFeatures) -> np.ndarray:
+        with request_path_timer(_PREDICT_SECONDS):
+            y_pred = self._pipeline.predict(self._model_input(encoded))
+
+        with request_path_timer(_POSTPROCESS_SECONDS):
+            y_pred = np.asarray(y_pred, dtype=float)
+            if self._prediction_transform == "expm1":
+                y_pred = np.expm1(y_pred)
+            return np.maximum(y_pred.astype(np.int64), 0)
+
+    def _model_input(self, encoded: EncodedFeatures) -> Any:
+        if self._is_catboost:
+            from catboost import FeaturesData
+
+            return FeaturesData(
+                num_feature_data=encoded.numeric,
+                cat_feature_data=encoded.categorical,
+                num_feature_names=encoded.numeric_names,
+                cat_feature_names=encoded.categorical_names,
+            )
+
+        import pandas as pd
+
+        columns: dict[str, Any] = {}
+        for j, name in enumerate(encoded.categorical_names):
+            columns[name] = encoded.categorical[:, j]
+        for j, name in enumerate(encoded.numeric_names):
+            columns[name] = encoded.numeric[:, j]
+        return pd.DataFrame(columns, copy=False)
@@ -1,7 +1,17 @@
+from collections.abc import Mapping, Sequence
 from typing import Any
 
+import numpy as np
+
 from app.ml.base import Predictor
-from app.schemas import EstimationFeatures
+from app.observability.prometheus import (
+    ESTIMATE_STAGE_DURATION_SECONDS,
+    PREDICTION_LATENCY,
+    request_path_timer,
+)
+from app.schemas import EstimationFeaturesBase
+
+_PREDICT_SECONDS = ESTIMATE_STAGE_DURATION_SECONDS.labels(stage="predict")
 
 
 class StubPredictor(Predictor):
@@ -21,9 +31,28 @@ class StubPredictor(Predictor):
             total_area_coef=total_area_coef,
         )
 
-    def predict_one(self, features: EstimationFeatures) -> int:
+    def predict_one(self, features: EstimationFeaturesBase) -> int:
         usable_area = features.usable_area * self.usable_area_coef
         total_area = features.total_area * self.total_area_coef
         price = int(usable_area + total_area)
 
         return max(price, 0)
+
+    @request_path_timer(PREDICTION_LATENCY)
+    def predict_batch(self, features: Sequence[EstimationFeaturesBase]) -> np.ndarray:
+        n = len(features)
+        usable_area = np.fromiter((f.usable_area for f in features), dtype=float, count=n)
+        total_area = np.fromiter((f.total_area for f in features), dtype=float, count=n)
+        return self._price(usable_area, total_area)
+
+    @request_path_timer(PREDICTION_LATENCY)
+    def predict_columns(self, columns: Mapping[str, np.ndarray]) -> np.ndarray:
+        return self._price(
+            np.asarray(columns["bra"], dtype=float), np.asarray(columns["total_area"], dtype=float)
+        )
+
+    @request_path_timer(_PREDICT_SECONDS)
+    def _price(self, usable_area: np.ndarray, total_area: np.ndarray) -> np.ndarray:
+        prices = usable_area * self.usable_area_coef + total_area * self.total_area_coef
+
+        return np.maximum(prices.astype(np.int64), 0)
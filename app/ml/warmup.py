@@ -0,0 +1,54 @@
+from collections.abc import Sequence
+from itertools import cycle, islice
+
+from app.ml.base import Predictor
+from app.observability.prometheus import off_request_path
+from app.schemas import EstimationFeatures, RealEstateType
+
+DEFAULT_WARMUP_BATCH_SIZES: tuple[int, ...] = (1, 16, 256)
+
+# (municipality_number, lat, lon): Oslo, Bergen, Trondheim, Tromsø.
+_LOCATIONS = [
+    (301, 59.91, 10.75),
+    (4601, 60.39, 5.32),
+    (5001, 63.43, 10.39),
+    (5501, 69.65, 18.96),
+]
+
+
+def _warmup_features() -> list[EstimationFeatures]:
+    """One representative property per RealEstateType, rotated over a few locations."""
+    features = []
+    for i, realestate_type in enumerate(RealEstateType):
+        municipality_number, lat, lon = _LOCATIONS[i % len(_LOCATIONS)]
+        bra = 40.0 + 25.0 * i
+        features.append(
+            EstimationFeatures(
+                realestate_type=realestate_type,
+                municipality_number=municipality_number,
+                lat=lat,
+                lon=lon,
+                built_year=1960 + 10 * i,
+                total_area=bra * 1.3,
+                bra=bra,
+                floor=(i % 5) + 1 if realestate_type == RealEstateType.leilighet else None,
+                bedrooms=(i % 4) + 1 if i % 2 == 0 else None,
+                rooms=(i % 4) + 2 if i % 3 == 0 else None,
+            )
+        )
+    return features
+
+
+def warm_up(predictor: Predictor, batch_sizes: Sequence[int] = DEFAULT_WARMUP_BATCH_SIZES) -> None:
+    """
+    Run synthetic batches so one-time model initialization happens off the hot path.
+
+    Every batch cycles through all RealEstateType values; one batch per size, so both
+    the single-item and the vectorized code paths are exercised. Not counted in the
+    request-path latency metrics.
+    """
+    templates = _warmup_features()
+    with off_request_path():
+        for size in batch_sizes:
+            if size > 0:
+                predictor.predict_batch(list(islice(cycle(templates), size)))
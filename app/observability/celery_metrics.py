@@ -0,0 +1,45 @@
+import os
+
+from celery.signals import worker_process_shutdown, worker_ready
+from prometheus_client import start_http_server
+
+from app.config import settings
+from app.observability.logging import log
+from app.observability.prometheus import (
+    MULTIPROC_DIR_ENV,
+    mark_process_dead,
+    multiprocess_enabled,
+    scrape_registry,
+)
+
+
+def setup_worker_metrics() -> None:
+    """
+    Expose Celery worker metrics on REE_CELERY_METRICS_PORT (0 disables).
+
+    The HTTP server runs in the worker's main process. Tasks run in prefork children, so
+    their metrics are only visible with PROMETHEUS_MULTIPROC_DIR set.
+    """
+    worker_ready.connect(_start_metrics_server, weak=False)
+    worker_process_shutdown.connect(_mark_child_dead, weak=False)
+
+
+def _start_metrics_server(sender=None, **kwargs) -> None:
+    port = settings.celery_metrics_port
+    if port <= 0:
+        return
+    if not multiprocess_enabled():
+        log().warning(
+            "celery_metrics_single_process",
+            reason=f"{MULTIPROC_DIR_ENV} is not set; metrics from pool processes are not exposed",
+        )
+    try:
+        start_http_server(port, registry=scrape_registry())
+    except OSError as e:
+        log().warning("celery_metrics_server_failed", port=port, error=str(e))
+        return
+    log().info("celery_metrics_server_started", port=port)
+
+
+def _mark_child_dead(sender=None, pid=None, **kwargs) -> None:
+    mark_process_dead(pid or os.getpid())
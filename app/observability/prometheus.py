@@ -1,16 +1,26 @@
+import os
 import time
-from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 
-from fastapi import Request, Response
+from fastapi import Response
 from prometheus_client import (
     CONTENT_TYPE_LATEST,
     CollectorRegistry,
     Counter,
     Gauge,
     Histogram,
+    Summary,
     generate_latest,
+    multiprocess,
 )
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# With PROMETHEUS_MULTIPROC_DIR set (gunicorn workers, Celery prefork children), every
+# process writes its values to per-process files there and scrapes aggregate them; the
+# directory must exist and be emptied before the process group starts.
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
 
 REGISTRY = CollectorRegistry()
 
@@ -42,6 +52,220 @@ PREDICTION_LATENCY = Histogram(
     buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0),
 )
 
+ESTIMATE_STAGE_DURATION_SECONDS = Histogram(
+    "estimate_stage_duration_seconds",
+    "Time per estimation batch spent in each hot-path stage",
+    ["stage"],
+    registry=REGISTRY,
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+ESTIMATE_BATCH_SIZE = Histogram(
+    "estimate_batch_size",
+    "Items per /estimate request",
+    registry=REGISTRY,
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000),
+)
+
+ESTIMATE_ITEM_LATENCY_SECONDS = Histogram(
+    "estimate_item_latency_seconds",
+    "/estimate service time (prediction through serialization) divided by batch size",
+    registry=REGISTRY,
+    buckets=(0.000001, 0.000005, 0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05),
+)
+
+# Off for predictor calls made outside the /estimate request path (model warm-up, shadow
+# scoring, bulk Celery chunks), so they don't skew the request-path latency histograms.
+_REQUEST_PATH_TIMING: ContextVar[bool] = ContextVar("request_path_timing", default=True)
+
+
+@contextmanager
+def request_path_timer(histogram: Histogram) -> Iterator[None]:
+    """histogram.time(), skipped inside off_request_path(); usable as a decorator."""
+    if not _REQUEST_PATH_TIMING.get():
+        yield
+        return
+    with histogram.time():
+        yield
+
+
+@contextmanager
+def off_request_path() -> Iterator[None]:
+    """Keep predictor calls in this block out of the request-path latency metrics."""
+    token = _REQUEST_PATH_TIMING.set(False)
+    try:
+        yield
+    finally:
+        _REQUEST_PATH_TIMING.reset(token)
+
+
+MODEL_VERSION_INFO = Gauge(
+    "model_version_info",
+    "Model versions served by the registry: 1 for the active one, 0 for ones it replaced",
+    ["model_version"],
+    registry=REGISTRY,
+    multiprocess_mode="livemax",
+)
+
+MODEL_LOAD_DURATION_SECONDS = Histogram(
+    "model_load_duration_seconds",
+    "Time to download (or read from cache) and deserialize a model artifact",
+    registry=REGISTRY,
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+
+MODEL_WARMUP_DURATION_SECONDS = Histogram(
+    "model_warmup_duration_seconds",
+    "Time spent on synthetic warm-up predictions before a model is served",
+    registry=REGISTRY,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+MODEL_REGISTRY_REFRESH_CHECKS_TOTAL = Counter(
+    "model_registry_refresh_checks_total",
+    "Model registry refresh checks against latest.json by result",
+    ["result"],
+    registry=REGISTRY,
+)
+
+MODEL_REGISTRY_RELOADS_TOTAL = Counter(
+    "model_registry_reloads_total",
+    "Model artifact downloads and deserializations performed by the registry",
+    registry=REGISTRY,
+)
+
+MODEL_REGISTRY_RELOAD_COALESCED_TOTAL = Counter(
+    "model_registry_reload_coalesced_total",
+    "Callers that hit an in-flight registry reload instead of starting their own",
+    ["outcome"],
+    registry=REGISTRY,
+)
+
+MODEL_ARTIFACT_CACHE_TOTAL = Counter(
+    "model_artifact_cache_total",
+    "Local model artifact cache lookups by result",
+    ["result"],
+    registry=REGISTRY,
+)
+
+MODEL_POOL_RESIDENT_VERSIONS = Gauge(
+    "model_pool_resident_versions",
+    "Pinned model versions resident in the predictor pool (besides the active model)",
+    registry=REGISTRY,
+    multiprocess_mode="livemax",
+)
+
+MODEL_POOL_RESIDENT_BYTES = Gauge(
+    "model_pool_resident_bytes",
+    "Artifact bytes of the predictors resident in the predictor pool",
+    registry=REGISTRY,
+    multiprocess_mode="livesum",
+)
+
+MODEL_POOL_LOADS_TOTAL = Counter(
+    "model_pool_loads_total",
+    "Model versions loaded into the predictor pool on demand",
+    registry=REGISTRY,
+)
+
+MODEL_POOL_EVICTIONS_TOTAL = Counter(
+    "model_pool_evictions_total",
+    "Predictors evicted from the predictor pool",
+    registry=REGISTRY,
+)
+
+PREDICTION_CACHE_ITEMS_TOTAL = Counter(
+    "prediction_cache_items_total",
+    "Estimated items looked up in the prediction result cache by result",
+    ["result"],
+    registry=REGISTRY,
+)
+
+PREDICTION_CACHE_SIZE = Gauge(
+    "prediction_cache_size",
+    "Entries currently held in the prediction result cache",
+    registry=REGISTRY,
+    multiprocess_mode="livesum",
+)
+
+INFERENCE_QUEUE_DEPTH = Gauge(
+    "inference_queue_depth",
+    "Estimate jobs waiting for a free inference worker",
+    registry=REGISTRY,
+    multiprocess_mode="livesum",
+)
+
+INFERENCE_QUEUE_WAIT_SECONDS = Histogram(
+    "inference_queue_wait_seconds",
+    "Time estimate jobs spent queued before an inference worker picked them up",
+    registry=REGISTRY,
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+INFERENCE_REJECTED_TOTAL = Counter(
+    "inference_rejected_total",
+    "Estimate requests rejected because the inference queue was full",
+    registry=REGISTRY,
+)
+
+MICRO_BATCH_SIZE = Histogram(
+    "micro_batch_size",
+    "Items per coalesced model call made by the /estimate micro-batcher",
+    registry=REGISTRY,
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+
+MICRO_BATCH_WAIT_SECONDS = Histogram(
+    "micro_batch_wait_seconds",
+    "Time a request waited in the micro-batcher before its batch was flushed",
+    registry=REGISTRY,
+    buckets=(0.0001, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05),
+)
+
+SHADOW_BATCHES_TOTAL = Counter(
+    "shadow_batches_total",
+    "Sampled /estimate batches handed to shadow scoring by result",
+    ["result"],
+    registry=REGISTRY,
+)
+
+SHADOW_PREDICTION_LATENCY_SECONDS = Histogram(
+    "shadow_prediction_latency_seconds",
+    "Candidate model call latency on shadowed batches, per model version",
+    ["model_version"],
+    registry=REGISTRY,
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0),
+)
+
+SHADOW_PREDICTION_ABS_PCT_DIFF = Histogram(
+    "shadow_prediction_abs_pct_diff",
+    "Per-item |candidate - primary| / primary price on shadowed batches",
+    ["primary_version", "candidate_version"],
+    registry=REGISTRY,
+    buckets=(0.005, 0.01, 0.02, 0.05, 0.1, 0.15, 0.2, 0.3, 0.5, 1.0),
+)
+
+SHADOW_PREDICTION_DIFF_NOK = Summary(
+    "shadow_prediction_diff_nok",
+    "Per-item candidate - primary price in NOK on shadowed batches (sum/count = bias)",
+    ["primary_version", "candidate_version"],
+    registry=REGISTRY,
+)
+
+BULK_ESTIMATE_ROWS_TOTAL = Counter(
+    "bulk_estimate_rows_total",
+    "Rows processed by bulk estimation jobs by result",
+    ["result"],
+    registry=REGISTRY,
+)
+
+BULK_ESTIMATE_CHUNK_DURATION_SECONDS = Histogram(
+    "bulk_estimate_chunk_duration_seconds",
+    "Duration of one bulk estimation chunk (read, validate, score, write)",
+    registry=REGISTRY,
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600),
+)
+
 TRAINING_STEP_DURATION_SECONDS = Histogram(
     "training_step_duration_seconds",
     "Duration of training steps in seconds",
@@ -55,6 +279,7 @@ ROLLING_SNAPSHOT_ROWS = Gauge(
     "Row counts for rolling snapshots",
     ["metric"],
     registry=REGISTRY,
+    multiprocess_mode="mostrecent",
 )
 
 TRAINING_GATING_REASONS_TOTAL = Counter(
@@ -65,23 +290,74 @@ TRAINING_GATING_REASONS_TOTAL = Counter(
 )
 
 
-class PrometheusMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable):
+UNMATCHED_PATH = "<unmatched>"
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the route that handled the request (bounded label cardinality)."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_PATH
+
+
+class PrometheusMiddleware:
+    """
+    Request count and duration per method, route template and status.
+
+    Pure ASGI: no per-request task or body stream wrapping, so streaming responses pass
+    through untouched. Duration covers the full response, body included.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
         start = time.perf_counter()
-        response: Response = await call_next(request)
-        elapsed = time.perf_counter() - start
 
-        path = request.url.path
-        method = request.method
-        status = str(response.status_code)
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            # The router stores the matched route in the (shared) scope.
+            path = route_template(scope)
+            method = scope["method"]
+            HTTP_REQUESTS_TOTAL.labels(method=method, path=path, status=str(status_code)).inc()
+            HTTP_REQUEST_DURATION_SECONDS.labels(method=method, path=path).observe(elapsed)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get(MULTIPROC_DIR_ENV))
+
+
+def scrape_registry() -> CollectorRegistry:
+    """Registry to expose: REGISTRY, or every process's metric files in multiprocess mode."""
+    if not multiprocess_enabled():
+        return REGISTRY
+    # Fresh per scrape, as prometheus_client recommends; REGISTRY itself must not be
+    # exposed too, its values are already in this process's files.
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
 
-        HTTP_REQUESTS_TOTAL.labels(method=method, path=path, status=status).inc()
-        HTTP_REQUEST_DURATION_SECONDS.labels(method=method, path=path).observe(elapsed)
-        return response
+def mark_process_dead(pid: int) -> None:
+    """Drop a dead process's live* gauge values (its counters and histograms are kept)."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid)
 
 
 def prometheus_response() -> Response:
     return Response(
-        content=generate_latest(REGISTRY),
+        content=generate_latest(scrape_registry()),
         media_type=CONTENT_TYPE_LATEST,
     )
@@ -1,44 +1,56 @@
 import time
 import uuid
-from collections.abc import Callable
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from structlog.contextvars import bind_contextvars, clear_contextvars
 
 from app.observability.logging import log
 
 
-class RequestIdMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, header_name: str = "X-Request-Id"):
-        super().__init__(app)
+class RequestIdMiddleware:
+    """Binds a request id to the log context, echoes it back and logs each request."""
+
+    def __init__(self, app: ASGIApp, header_name: str = "X-Request-Id"):
+        self.app = app
         self.header_name = header_name
 
-    async def dispatch(self, request: Request, call_next: Callable):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         clear_contextvars()
 
-        request_id = request.headers.get(self.header_name) or str(uuid.uuid4())
+        request_id = Headers(scope=scope).get(self.header_name) or str(uuid.uuid4())
         bind_contextvars(request_id=request_id)
 
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)[self.header_name] = request_id
+            await send(message)
+
         start = time.perf_counter()
         try:
-            response: Response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception:
             log().exception(
                 "http_request_failed",
-                method=request.method,
-                path=request.url.path,
+                method=scope["method"],
+                path=scope["path"],
             )
             raise
 
         latency_ms = int((time.perf_counter() - start) * 1000)
-        response.headers[self.header_name] = request_id
 
         log().info(
             "http_request_completed",
-            method=request.method,
-            path=request.url.path,
-            status_code=response.status_code,
+            method=scope["method"],
+            path=scope["path"],
+            status_code=status_code,
             latency_ms=latency_ms,
         )
-        return response
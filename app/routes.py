@@ -1,14 +1,36 @@
+import asyncio
+from collections.abc import AsyncIterator
 from typing import Any
 
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from starlette.background import BackgroundTask
 
-from app.api.examples import ESTIMATE_REQUEST_EXAMPLES
+from app.api.estimate_body import ESTIMATE_REQUEST_OPENAPI, parse_estimate_request
+from app.api.ndjson import NDJSON_MEDIA_TYPE, NDJSONStreamingResponse, iter_ndjson_chunks
 from app.api.routes.metrics import router as metrics_router
 from app.config import settings
-from app.dependencies import get_predictor
+from app.dependencies import (
+    get_inference_executor,
+    get_micro_batcher,
+    get_prediction_cache,
+    get_predictor,
+    get_shadow_scorer,
+    require_warm_model,
+)
 from app.ml.base import Predictor
-from app.schemas import EstimateRequest, EstimateResponse, HealthCheckResponse
-from app.services.estimate_service import estimate_batch
+from app.schemas import EstimateResponse, HealthCheckResponse, ValidatedEstimateRequest
+from app.services.columnar_media import (
+    COLUMNAR_MEDIA_TYPES,
+    ColumnarValidationError,
+    columnar_media_type,
+)
+from app.services.estimate_service import estimate_batch_coalesced, estimate_batch_json
+from app.services.inference_executor import InferenceExecutor, InferenceQueueFullError
+from app.services.micro_batcher import MicroBatcher
+from app.services.prediction_cache import PredictionCache
+from app.services.shadow_scorer import ShadowScorer
+from app.services.stream_service import score_ndjson_chunk
 
 router = APIRouter()
 router.include_router(metrics_router)
@@ -30,26 +52,161 @@ async def get_health() -> HealthCheckResponse:
     "/estimate",
     response_model=EstimateResponse,
     responses={
-        503: {"description": "Model not ready"},
+        404: {"description": "Unknown model version requested via X-Model-Version"},
+        503: {"description": "Model not ready, or the inference queue is full (see Retry-After)"},
     },
+    openapi_extra=ESTIMATE_REQUEST_OPENAPI,
     tags=["estimation"],
 )
-def estimate(
-    payload: EstimateRequest = Body(..., openapi_examples=ESTIMATE_REQUEST_EXAMPLES),
+async def estimate(
     predictor: Predictor = Depends(get_predictor),
+    # After get_predictor, as with a Body() param: no model -> 503 even for a bad body.
+    payload: ValidatedEstimateRequest = Depends(parse_estimate_request),
+    cache: PredictionCache | None = Depends(get_prediction_cache),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    batcher: MicroBatcher | None = Depends(get_micro_batcher),
+    shadow: ShadowScorer | None = Depends(get_shadow_scorer),
 ) -> Any:
     if not payload:
         raise HTTPException(status_code=422, detail="Empty payload")
 
-    return estimate_batch(payload, predictor=predictor)
+    try:
+        # Small payloads are coalesced with concurrent requests; large ones gain nothing
+        # from it and go straight to the executor.
+        if batcher is not None and len(payload) < batcher.max_batch_size:
+            body, prices = await estimate_batch_coalesced(payload, predictor, batcher, cache)
+        else:
+            body, prices = await executor.run(estimate_batch_json, payload, predictor, cache)
+    except InferenceQueueFullError as e:
+        raise _inference_queue_full(e) from e
+
+    # Handed off only once the response is sent; the shadow model never delays it.
+    background = None
+    if shadow is not None and shadow.should_sample(predictor):
+        background = BackgroundTask(shadow.submit, list(payload.values()), prices, predictor)
+
+    # Pre-rendered EstimateResponse JSON; returning a Response skips re-validation.
+    return Response(content=body, media_type="application/json", background=background)
+
+
+@router.post(
+    "/estimate/stream",
+    response_class=NDJSONStreamingResponse,
+    responses={
+        200: {
+            "description": "One NDJSON result or error record per input line, in input order",
+            "content": {NDJSON_MEDIA_TYPE: {}},
+        },
+        503: {"description": "Model not ready"},
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "description": 'NDJSON: one `{"id": ..., <estimation features>}` object per line',
+            "content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}}},
+        }
+    },
+    tags=["estimation"],
+)
+async def estimate_stream(
+    request: Request,
+    predictor: Predictor = Depends(get_predictor),
+    cache: PredictionCache | None = Depends(get_prediction_cache),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+) -> NDJSONStreamingResponse:
+    async def results() -> AsyncIterator[bytes]:
+        chunks = iter_ndjson_chunks(
+            request.stream(),
+            chunk_size=settings.estimate_stream_chunk_size,
+            max_line_bytes=settings.estimate_stream_max_line_bytes,
+        )
+        async for chunk in chunks:
+            # Headers are already sent, so a full queue cannot become a 503 here; bulk
+            # streams back off and retry instead, yielding to interactive traffic.
+            while True:
+                try:
+                    yield await executor.run(score_ndjson_chunk, chunk, predictor, cache)
+                    break
+                except InferenceQueueFullError:
+                    await asyncio.sleep(settings.inference_retry_after_seconds)
+
+    return NDJSONStreamingResponse(results())
+
+
+@router.post(
+    "/estimate/columnar",
+    response_class=Response,
+    responses={
+        200: {
+            "description": (
+                "Table of `id, estimated_price, model_version, warnings` in the request's format"
+            ),
+            "content": {media_type: {} for media_type in COLUMNAR_MEDIA_TYPES},
+        },
+        415: {"description": "Body is neither an Arrow IPC stream nor Parquet"},
+        422: {"description": "Column validation errors, with row counts and sample ids"},
+        503: {"description": "Model not ready, or the inference queue is full (see Retry-After)"},
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "description": "Table with an `id` column plus the estimation feature columns",
+            "content": {
+                media_type: {"schema": {"type": "string", "format": "binary"}}
+                for media_type in COLUMNAR_MEDIA_TYPES
+            },
+        }
+    },
+    tags=["estimation"],
+)
+async def estimate_columnar(
+    request: Request,
+    predictor: Predictor = Depends(get_predictor),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+) -> Response:
+    media_type = columnar_media_type(request.headers.get("content-type"))
+    if media_type is None:
+        raise HTTPException(
+            status_code=415, detail=f"Content-Type must be one of {list(COLUMNAR_MEDIA_TYPES)}"
+        )
+
+    body = await request.body()
+    try:
+        content = await executor.run(_estimate_table, body, media_type, predictor)
+    except ColumnarValidationError as e:
+        raise RequestValidationError(e.errors) from e
+    except InferenceQueueFullError as e:
+        raise _inference_queue_full(e) from e
+
+    return Response(content=content, media_type=media_type)
 
 
 @router.get(
     "/ready",
     tags=["readycheck"],
     summary="Perform a Ready Check",
-    response_description="Return HTTP Status Code 200 (OK)",
+    response_description="Return HTTP Status Code 200 (OK) once the model is loaded and warm",
     status_code=status.HTTP_200_OK,
+    responses={503: {"description": "Model not loaded yet, or still warming up"}},
 )
-def get_ready(predictor: Predictor = Depends(get_predictor)) -> dict[str, str]:
+def get_ready(
+    _warm: None = Depends(require_warm_model),
+    # Loads (and warms) the model here if nothing is loading it in the background.
+    predictor: Predictor = Depends(get_predictor),
+) -> dict[str, str]:
     return {"status": "ready"}
+
+
+def _estimate_table(body: bytes, media_type: str, predictor: Predictor) -> bytes:
+    # pyarrow is only imported on the first columnar request, on the inference thread.
+    from app.services.columnar_service import estimate_table
+
+    return estimate_table(body, media_type, predictor)
+
+
+def _inference_queue_full(e: InferenceQueueFullError) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail={"message": "inference_queue_full", "reason": str(e)},
+        headers={"Retry-After": str(settings.inference_retry_after_seconds)},
+    )
@@ -1,3 +1,4 @@
+from collections.abc import Mapping
 from enum import Enum
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
@@ -18,11 +19,12 @@ class RealEstateType(str, Enum):
     hytte = "hytte"
 
 
-class EstimationFeatures(BaseModel):
+class EstimationFeaturesBase(BaseModel):
     """
-    Strict input contract for estimation.
+    Field-level input contract for estimation, without the cross-field rules.
 
-    We prefer to return 422 rather than producing a misleading estimate.
+    Validated entirely inside pydantic-core; the cross-field rules live in
+    strict_validation_error so they can be checked without a per-item validator.
     """
 
     model_config = ConfigDict(extra="ignore")
@@ -50,18 +52,42 @@ class EstimationFeatures(BaseModel):
     def usable_area(self) -> float:
         return self.bra
 
+
+TOTAL_AREA_BELOW_BRA = "total_area must be >= bra"
+LEILIGHET_FLOOR_MISSING = "floor is required for realestate_type 'leilighet'"
+
+
+def strict_validation_error(features: EstimationFeaturesBase) -> str | None:
+    """Return the first violated cross-field rule, or None when the features are valid."""
+    if features.total_area < features.bra:
+        return TOTAL_AREA_BELOW_BRA
+
+    if features.realestate_type == RealEstateType.leilighet and features.floor is None:
+        return LEILIGHET_FLOOR_MISSING
+
+    return None
+
+
+class EstimationFeatures(EstimationFeaturesBase):
+    """
+    Strict input contract for estimation.
+
+    We prefer to return 422 rather than producing a misleading estimate.
+    """
+
     @model_validator(mode="after")
     def strict_validation(self):
-        if self.total_area < self.bra:
-            raise ValueError("total_area must be >= bra")
-
-        if self.realestate_type == RealEstateType.leilighet and self.floor is None:
-            raise ValueError("floor is required for realestate_type 'leilighet'")
+        error = strict_validation_error(self)
+        if error is not None:
+            raise ValueError(error)
 
         return self
 
 
 EstimateRequest = dict[str, EstimationFeatures]
+# A validated /estimate body as the services receive it: items are EstimationFeatures,
+# or EstimationFeaturesBase that already passed strict_validation_error.
+ValidatedEstimateRequest = Mapping[str, EstimationFeaturesBase]
 
 
 class EstimateResult(BaseModel):
@@ -0,0 +1,146 @@
+import io
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import pyarrow.parquet as pq
+
+from app.ml.base import Predictor
+from app.observability.prometheus import off_request_path
+from app.services.columnar_media import PARQUET_MEDIA_TYPE, ColumnarValidationError
+from app.services.columnar_service import result_table, validate_table, write_table
+from app.storage.s3 import S3ObjectReader, S3Storage
+
+# Large buffered reads so pyarrow's many small footer/page reads become few ranged GETs.
+_READ_BUFFER_BYTES = 8 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class BulkJobPaths:
+    prefix: str
+
+    @property
+    def job_key(self) -> str:
+        return f"{self.prefix}/job.json"
+
+    @property
+    def manifest_key(self) -> str:
+        return f"{self.prefix}/manifest.json"
+
+    def part_key(self, chunk_index: int) -> str:
+        return f"{self.prefix}/part-{chunk_index:05d}.parquet"
+
+    def chunk_result_key(self, chunk_index: int) -> str:
+        return f"{self.prefix}/chunks/chunk-{chunk_index:05d}.json"
+
+
+def open_parquet(storage: S3Storage, bucket: str, key: str) -> pq.ParquetFile:
+    raw = S3ObjectReader(storage, bucket=bucket, key=key)
+    return pq.ParquetFile(io.BufferedReader(raw, buffer_size=_READ_BUFFER_BYTES))
+
+
+def plan_chunks(
+    storage: S3Storage, bucket: str, key: str, row_groups_per_chunk: int
+) -> list[list[int]]:
+    """Split the input Parquet file into chunks of consecutive row groups."""
+    step = max(int(row_groups_per_chunk), 1)
+    num_row_groups = open_parquet(storage, bucket, key).metadata.num_row_groups
+    return [
+        list(range(start, min(start + step, num_row_groups)))
+        for start in range(0, num_row_groups, step)
+    ]
+
+
+def score_chunk(
+    storage: S3Storage,
+    bucket: str,
+    input_key: str,
+    row_groups: list[int],
+    predictor: Predictor,
+    output_key: str,
+) -> dict[str, Any]:
+    """
+    Validate and score the given row groups and write the result Parquet part.
+
+    Invalid chunks are not written; their column errors (as returned by
+    /estimate/columnar) are reported in the result instead.
+    """
+    table = open_parquet(storage, bucket, input_key).read_row_groups(row_groups)
+    result: dict[str, Any] = {"row_groups": row_groups, "rows": table.num_rows}
+
+    try:
+        ids, columns = validate_table(table)
+    except ColumnarValidationError as e:
+        result.update(status="invalid", errors=e.errors)
+        return result
+
+    with off_request_path():
+        prices = predictor.predict_columns(columns)
+    model_version = getattr(predictor, "model_version", "unknown")
+    data = write_table(result_table(ids, prices, model_version, columns), PARQUET_MEDIA_TYPE)
+    storage.put_bytes(bucket=bucket, key=output_key, data=data, content_type=PARQUET_MEDIA_TYPE)
+
+    result.update(status="scored", output_key=output_key)
+    return result
+
+
+def pending_chunks(
+    storage: S3Storage, bucket: str, paths: BulkJobPaths, chunk_indexes: Iterable[int]
+) -> list[int]:
+    """The given chunks whose result is not written yet; one HEAD request each."""
+    return [
+        i
+        for i in chunk_indexes
+        if not storage.exists(bucket=bucket, key=paths.chunk_result_key(i))
+    ]
+
+
+def load_chunk_results(
+    storage: S3Storage, bucket: str, paths: BulkJobPaths, chunk_indexes: Iterable[int]
+) -> list[dict[str, Any]]:
+    return [storage.get_json(bucket=bucket, key=paths.chunk_result_key(i)) for i in chunk_indexes]
+
+
+def collect_chunk_results(
+    storage: S3Storage, bucket: str, paths: BulkJobPaths, chunks: int
+) -> tuple[list[dict[str, Any]], list[int]]:
+    """Chunk results written so far, and the indexes of the chunks still missing."""
+    missing = pending_chunks(storage, bucket, paths, range(chunks))
+    done = sorted(set(range(chunks)).difference(missing))
+    return load_chunk_results(storage, bucket, paths, done), missing
+
+
+def job_status(storage: S3Storage, bucket: str, paths: BulkJobPaths) -> dict[str, Any]:
+    """The manifest of a finished job, or the progress of a running one."""
+    if storage.exists(bucket=bucket, key=paths.manifest_key):
+        return storage.get_json(bucket=bucket, key=paths.manifest_key)
+    job = storage.get_json(bucket=bucket, key=paths.job_key)
+    results, missing = collect_chunk_results(storage, bucket, paths, job["chunks"])
+    return {**job, "status": "running", "chunks_done": len(results), "chunks_missing": missing}
+
+
+def summarize_job(
+    job: dict[str, Any], chunk_results: list[dict[str, Any]], missing_chunks: Sequence[int] = ()
+) -> dict[str, Any]:
+    scored = [c for c in chunk_results if c.get("status") == "scored"]
+    invalid = [c for c in chunk_results if c.get("status") == "invalid"]
+    if missing_chunks:
+        status = "incomplete"
+    elif invalid:
+        status = "completed_with_errors"
+    else:
+        status = "completed"
+    return {
+        **job,
+        "status": status,
+        "chunks_total": len(chunk_results) + len(missing_chunks),
+        "chunks_scored": len(scored),
+        "chunks_invalid": len(invalid),
+        "chunks_missing": list(missing_chunks),
+        "rows_scored": sum(int(c.get("rows", 0)) for c in scored),
+        "rows_invalid": sum(int(c.get("rows", 0)) for c in invalid),
+        "parts": [c["output_key"] for c in scored],
+        "errors": [
+            {"row_groups": c["row_groups"], "errors": c.get("errors", [])} for c in invalid
+        ],
+    }
@@ -0,0 +1,25 @@
+"""
+Columnar request media types and errors, importable without pyarrow.
+
+The API routes only need these at import time; app.services.columnar_service (and
+with it pyarrow) is loaded on the first columnar request.
+"""
+
+from typing import Any
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+COLUMNAR_MEDIA_TYPES = (ARROW_STREAM_MEDIA_TYPE, PARQUET_MEDIA_TYPE)
+
+
+class ColumnarValidationError(Exception):
+    """Column-level validation errors, in FastAPI's 422 `detail` shape plus count/ids."""
+
+    def __init__(self, errors: list[dict[str, Any]]):
+        super().__init__(f"{len(errors)} validation error(s)")
+        self.errors = errors
+
+
+def columnar_media_type(content_type: str | None) -> str | None:
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    return media_type if media_type in COLUMNAR_MEDIA_TYPES else None
@@ -0,0 +1,263 @@
+from typing import Any
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from app.ml.base import Predictor
+from app.observability.prometheus import PREDICTIONS_TOTAL
+from app.schemas import LEILIGHET_FLOOR_MISSING, TOTAL_AREA_BELOW_BRA, RealEstateType
+from app.services.columnar_media import PARQUET_MEDIA_TYPE, ColumnarValidationError
+
+_REALESTATE_TYPES = [rt.value for rt in RealEstateType]
+
+# Failing ids listed per error; the error's "count" carries the full number.
+_MAX_REPORTED_IDS = 10
+
+
+def estimate_table(body: bytes, media_type: str, predictor: Predictor) -> bytes:
+    """
+    Score an Arrow IPC stream or Parquet table of EstimationFeatures columns (plus `id`).
+
+    Validation is vectorized per column and the whole table is scored with one
+    predict_columns call. Returns a table of `id, estimated_price, model_version,
+    warnings` in the same format as the request.
+    """
+    table = read_table(body, media_type)
+    ids, columns = validate_table(table)
+    prices = predictor.predict_columns(columns)
+    model_version = getattr(predictor, "model_version", "unknown")
+    for realestate_type, count in zip(
+        *np.unique(columns["realestate_type"], return_counts=True), strict=True
+    ):
+        PREDICTIONS_TOTAL.labels(realestate_type=realestate_type).inc(int(count))
+    return write_table(result_table(ids, prices, model_version, columns), media_type)
+
+
+def read_table(body: bytes, media_type: str) -> pa.Table:
+    try:
+        if media_type == PARQUET_MEDIA_TYPE:
+            return pq.read_table(pa.BufferReader(body))
+        with pa.ipc.open_stream(body) as reader:
+            return reader.read_all()
+    except (pa.ArrowException, OSError) as e:
+        raise ColumnarValidationError(
+            [{"type": "columnar_invalid", "loc": ["body"], "msg": str(e), "input": None}]
+        ) from e
+
+
+def write_table(table: pa.Table, media_type: str) -> bytes:
+    sink = pa.BufferOutputStream()
+    if media_type == PARQUET_MEDIA_TYPE:
+        pq.write_table(table, sink)
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def validate_table(table: pa.Table) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """
+    Apply the EstimationFeatures rules column-wise.
+
+    Returns the ids (as strings) and the feature columns expected by
+    Predictor.predict_columns; raises ColumnarValidationError listing every failing
+    rule with the number of offending rows and the first few of their ids.
+    """
+    v = _TableValidator(table)
+
+    v.require(["id", "realestate_type", "municipality_number", "lat", "lon"])
+    v.require(["built_year", "total_area", "bra"])
+    v.raise_if_errors()
+
+    ids = v.ids()
+    columns: dict[str, np.ndarray] = {
+        "realestate_type": v.realestate_type(),
+        "municipality_number": v.numeric("municipality_number", integer=True, ge=1),
+        "lat": v.numeric("lat", ge=-90, le=90),
+        "lon": v.numeric("lon", ge=-180, le=180),
+        "built_year": v.numeric("built_year", integer=True, ge=1800, le=2100),
+        "total_area": v.numeric("total_area", gt=0),
+        "bra": v.numeric("bra", gt=0),
+        "floor": v.numeric("floor", integer=True, required=False),
+        "bedrooms": v.numeric("bedrooms", integer=True, ge=0, required=False),
+        "rooms": v.numeric("rooms", integer=True, ge=0, required=False),
+    }
+    v.raise_if_errors()
+
+    # Cross-field rules only make sense on rows whose fields are individually valid.
+    with np.errstate(invalid="ignore"):
+        v.check(
+            columns["total_area"] < columns["bra"],
+            "total_area",
+            "value_error",
+            f"Value error, {TOTAL_AREA_BELOW_BRA}",
+        )
+    is_leilighet = columns["realestate_type"] == RealEstateType.leilighet.value
+    v.check(
+        is_leilighet & np.isnan(columns["floor"]),
+        "floor",
+        "value_error",
+        f"Value error, {LEILIGHET_FLOOR_MISSING}",
+    )
+    v.raise_if_errors()
+
+    return ids, columns
+
+
+def result_table(
+    ids: np.ndarray,
+    prices: np.ndarray,
+    model_version: str,
+    columns: dict[str, np.ndarray],
+) -> pa.Table:
+    n = len(ids)
+    # warnings: ["bedrooms_missing"?, "rooms_missing"?] per row, as one flat list array.
+    missing = np.column_stack([np.isnan(columns["bedrooms"]), np.isnan(columns["rooms"])])
+    labels = np.broadcast_to(np.array(["bedrooms_missing", "rooms_missing"], dtype=object), (n, 2))
+    offsets = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(missing.sum(axis=1), out=offsets[1:])
+    warnings = pa.ListArray.from_arrays(
+        pa.array(offsets), pa.array(labels[missing], type=pa.string())
+    )
+
+    return pa.table(
+        {
+            "id": pa.array(ids, type=pa.string()),
+            "estimated_price": pa.array(prices, type=pa.int64()),
+            "model_version": pa.repeat(pa.scalar(model_version, type=pa.string()), n),
+            "warnings": warnings,
+        }
+    )
+
+
+class _TableValidator:
+    def __init__(self, table: pa.Table):
+        self._table = table
+        self._ids: np.ndarray | None = None
+        self.errors: list[dict[str, Any]] = []
+
+    def require(self, names: list[str]) -> None:
+        for name in names:
+            if name not in self._table.column_names:
+                self.errors.append(_error(name, "missing", "Field required"))
+
+    def raise_if_errors(self) -> None:
+        if self.errors:
+            raise ColumnarValidationError(self.errors)
+
+    def ids(self) -> np.ndarray:
+        col = self._table["id"]
+        if not (_is_string(col.type) or pa.types.is_integer(col.type)):
+            self.errors.append(_error("id", "string_type", "Input should be a valid string"))
+            self.raise_if_errors()
+        ids = col.cast(pa.string())
+        self._ids = ids.to_numpy(zero_copy_only=False)
+        self.check(_to_mask(ids.is_null()), "id", "missing", "Field required")
+        return self._ids
+
+    def realestate_type(self) -> np.ndarray:
+        col = self._table["realestate_type"]
+        if not _is_string(col.type):
+            allowed = ", ".join(f"'{v}'" for v in _REALESTATE_TYPES)
+            self.errors.append(_error("realestate_type", "enum", f"Input should be {allowed}"))
+            return np.empty(len(col), dtype=object)
+        values = col.cast(pa.string())
+        known = pc.is_in(values, value_set=pa.array(_REALESTATE_TYPES)).fill_null(False)
+        allowed = ", ".join(f"'{v}'" for v in _REALESTATE_TYPES[:-1])
+        self.check(
+            ~_to_mask(known),
+            "realestate_type",
+            "enum",
+            f"Input should be {allowed} or '{_REALESTATE_TYPES[-1]}'",
+        )
+        return values.to_numpy(zero_copy_only=False)
+
+    def numeric(
+        self,
+        name: str,
+        *,
+        integer: bool = False,
+        required: bool = True,
+        ge: float | None = None,
+        le: float | None = None,
+        gt: float | None = None,
+    ) -> np.ndarray:
+        n = self._table.num_rows
+        if name not in self._table.column_names:
+            return np.full(n, np.nan)
+
+        col = self._table[name]
+        if pa.types.is_null(col.type):
+            values = np.full(n, np.nan)
+        elif pa.types.is_integer(col.type) or pa.types.is_floating(col.type):
+            values = col.cast(pa.float64()).to_numpy(zero_copy_only=False)
+        else:
+            kind = "int" if integer else "float"
+            self.errors.append(
+                _error(name, f"{kind}_type", f"Input should be a valid {_TYPE_NAMES[kind]}")
+            )
+            return np.full(n, np.nan)
+
+        missing = np.isnan(values)
+        if required:
+            self.check(missing, name, "missing", "Field required")
+        present = ~missing
+        with np.errstate(invalid="ignore"):
+            if integer:
+                self.check(
+                    present & (values != np.floor(values)),
+                    name,
+                    "int_from_float",
+                    "Input should be a valid integer, got a number with a fractional part",
+                )
+            if ge is not None:
+                self.check(
+                    present & ~(values >= ge),
+                    name,
+                    "greater_than_equal",
+                    f"Input should be greater than or equal to {ge}",
+                )
+            if le is not None:
+                self.check(
+                    present & ~(values <= le),
+                    name,
+                    "less_than_equal",
+                    f"Input should be less than or equal to {le}",
+                )
+            if gt is not None:
+                self.check(
+                    present & ~(values > gt),
+                    name,
+                    "greater_than",
+                    f"Input should be greater than {gt}",
+                )
+        return values
+
+    def check(self, bad: np.ndarray, name: str, error_type: str, msg: str) -> None:
+        count = int(np.count_nonzero(bad))
+        if count == 0:
+            return
+        error = _error(name, error_type, msg)
+        error["count"] = count
+        if self._ids is not None:
+            error["ids"] = self._ids[bad][:_MAX_REPORTED_IDS].tolist()
+        self.errors.append(error)
+
+
+_TYPE_NAMES = {"int": "integer", "float": "number"}
+
+
+def _error(name: str, error_type: str, msg: str) -> dict[str, Any]:
+    return {"type": error_type, "loc": ["body", name], "msg": msg}
+
+
+def _is_string(t: pa.DataType) -> bool:
+    if pa.types.is_dictionary(t):
+        t = t.value_type
+    return pa.types.is_string(t) or pa.types.is_large_string(t)
+
+
+def _to_mask(values: pa.ChunkedArray) -> np.ndarray:
+    return values.to_numpy(zero_copy_only=False).astype(bool, copy=False)
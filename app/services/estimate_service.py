@@ -1,28 +1,156 @@
+import json
+import time
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from json.encoder import encode_basestring
+
+import numpy as np
+
 from app.ml.base import Predictor
-from app.schemas import EstimateResponse, EstimateResult, EstimationFeatures
+from app.observability.prometheus import (
+    ESTIMATE_BATCH_SIZE,
+    ESTIMATE_ITEM_LATENCY_SECONDS,
+    ESTIMATE_STAGE_DURATION_SECONDS,
+    PREDICTIONS_TOTAL,
+)
+from app.schemas import (
+    EstimateResult,
+    EstimationFeaturesBase,
+    RealEstateType,
+    ValidatedEstimateRequest,
+)
+from app.services.micro_batcher import MicroBatcher
+from app.services.prediction_cache import PredictionCache
+
+_SERIALIZATION_SECONDS = ESTIMATE_STAGE_DURATION_SECONDS.labels(stage="serialization")
+_PREDICTIONS_BY_TYPE = {
+    rt: PREDICTIONS_TOTAL.labels(realestate_type=rt.value) for rt in RealEstateType
+}
+
+
+def estimate_batch_json(
+    payload: ValidatedEstimateRequest,
+    predictor: Predictor,
+    cache: PredictionCache | None = None,
+) -> tuple[bytes, np.ndarray]:
+    """
+    Estimate a batch and render it straight to the JSON body of an EstimateResponse.
+
+    Skips per-item EstimateResult construction and FastAPI's response re-validation;
+    the bytes are identical to FastAPI's response_model encoding of the same results.
+    Returns the body and the served prices, in payload order.
+    """
+    started = time.perf_counter()
+    model_version = getattr(predictor, "model_version", "unknown")
+    prices = _predict_prices(payload, predictor, model_version, cache)
+    body = render_response_json(payload, prices, model_version)
+    _observe_batch(payload, started)
+    return body, prices
 
 
-def estimate_batch(
-    payload: dict[str, EstimationFeatures],
+async def estimate_batch_coalesced(
+    payload: ValidatedEstimateRequest,
     predictor: Predictor,
-) -> EstimateResponse:
-    features_by_id = payload
-
-    results: dict[str, EstimateResult] = {}
-    for property_id, f in features_by_id.items():
-        estimated = predictor.predict_one(f)
-
-        warnings: list[str] = []
-        if f.bedrooms is None:
-            warnings.append("bedrooms_missing")
-        if f.rooms is None:
-            warnings.append("rooms_missing")
-
-        results[property_id] = EstimateResult(
-            estimated_price=estimated,
-            currency="NOK",
-            model_version=getattr(predictor, "model_version", "unknown"),
-            warnings=warnings,
+    batcher: MicroBatcher,
+    cache: PredictionCache | None = None,
+) -> tuple[bytes, np.ndarray]:
+    """
+    Like estimate_batch_json, but the model call is coalesced with concurrent requests.
+
+    Meant for small payloads: cache lookups and rendering run on the event loop, only
+    the (shared) vectorized prediction goes to the inference executor.
+    """
+    started = time.perf_counter()
+    model_version = getattr(predictor, "model_version", "unknown")
+
+    features = list(payload.values())
+    if cache is None:
+        prices = await batcher.predict_batch(predictor, features)
+    else:
+        prices, miss_idx = cache.lookup(features, model_version)
+        if miss_idx:
+            predicted = await batcher.predict_batch(predictor, [features[i] for i in miss_idx])
+            prices[miss_idx] = predicted
+            cache.store(features, miss_idx, predicted, model_version)
+
+    body = render_response_json(payload, prices, model_version)
+    _observe_batch(payload, started)
+    return body, prices
+
+
+def build_result(f: EstimationFeaturesBase, estimated: int, model_version: str) -> EstimateResult:
+    return EstimateResult(
+        estimated_price=estimated,
+        currency="NOK",
+        model_version=model_version,
+        warnings=_warnings(f.bedrooms is None, f.rooms is None),
+    )
+
+
+def count_predictions(features: Iterable[EstimationFeaturesBase]) -> None:
+    """Add a batch's estimates to model_predictions_total by realestate_type."""
+    for realestate_type, count in Counter(f.realestate_type for f in features).items():
+        _PREDICTIONS_BY_TYPE[realestate_type].inc(count)
+
+
+@_SERIALIZATION_SECONDS.time()
+def render_response_json(
+    features_by_id: Mapping[str, EstimationFeaturesBase],
+    prices: np.ndarray,
+    model_version: str,
+) -> bytes:
+    """Serialize an EstimateResponse from prediction arrays, matching FastAPI's JSON."""
+    # Everything after the price depends only on the model version and on which of the
+    # two warnings apply, so the four possible tails are rendered once per batch.
+    version_json = _dumps(model_version)
+    tails = {
+        (bedrooms_missing, rooms_missing): (
+            f',"currency":"NOK","model_version":{version_json},"warnings":'
+            f"{_dumps(_warnings(bedrooms_missing, rooms_missing))}}}"
         )
+        for bedrooms_missing in (False, True)
+        for rooms_missing in (False, True)
+    }
+
+    parts = [
+        f'{encode_basestring(property_id)}:{{"estimated_price":{estimated}'
+        f"{tails[f.bedrooms is None, f.rooms is None]}"
+        for (property_id, f), estimated in zip(features_by_id.items(), prices.tolist())
+    ]
+    return ("{" + ",".join(parts) + "}").encode("utf-8")
+
+
+def _predict_prices(
+    features_by_id: Mapping[str, EstimationFeaturesBase],
+    predictor: Predictor,
+    model_version: str,
+    cache: PredictionCache | None,
+) -> np.ndarray:
+    # One vectorized model call for the whole batch (or its cache misses); results keep
+    # payload order.
+    features = list(features_by_id.values())
+    if cache is None:
+        return predictor.predict_batch(features)
+    return cache.predict_batch(predictor, features, model_version)
+
+
+def _observe_batch(features_by_id: Mapping[str, EstimationFeaturesBase], started: float) -> None:
+    n = len(features_by_id)
+    ESTIMATE_BATCH_SIZE.observe(n)
+    if n:
+        ESTIMATE_ITEM_LATENCY_SECONDS.observe((time.perf_counter() - started) / n)
+    count_predictions(features_by_id.values())
+
+
+def _warnings(bedrooms_missing: bool, rooms_missing: bool) -> list[str]:
+    warnings: list[str] = []
+    if bedrooms_missing:
+        warnings.append("bedrooms_missing")
+    if rooms_missing:
+        warnings.append("rooms_missing")
+    return warnings
+
 
-    return results
+def _dumps(value: object) -> str:
+    # Same settings as starlette's JSONResponse.render.
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TypeVar
+
+from app.observability.prometheus import (
+    INFERENCE_QUEUE_DEPTH,
+    INFERENCE_QUEUE_WAIT_SECONDS,
+    INFERENCE_REJECTED_TOTAL,
+)
+
+T = TypeVar("T")
+
+
+class InferenceQueueFullError(Exception):
+    pass
+
+
+class InferenceExecutor:
+    """
+    Dedicated thread pool for CPU-bound scoring with a bounded backlog.
+
+    At most max_workers jobs run and max_queue jobs wait; anything beyond that is
+    rejected immediately with InferenceQueueFullError instead of queueing unboundedly.
+    The pool is separate from Starlette's default threadpool, so a burst of large
+    batches cannot starve /health, /ready or /metrics.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 32):
+        self.max_workers = max(int(max_workers), 1)
+        self.max_queue = max(int(max_queue), 0)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="inference"
+        )
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._queued = 0
+        self._queued_lock = threading.Lock()
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        if not self._slots.acquire(blocking=False):
+            INFERENCE_REJECTED_TOTAL.inc()
+            raise InferenceQueueFullError(
+                f"Inference queue is full ({self.max_workers} running, {self.max_queue} queued)"
+            )
+
+        submitted_at = time.perf_counter()
+        self._update_queued(+1)
+
+        def job() -> T:
+            self._update_queued(-1)
+            INFERENCE_QUEUE_WAIT_SECONDS.observe(time.perf_counter() - submitted_at)
+            return fn(*args)
+
+        try:
+            future: Future[T] = self._executor.submit(job)
+        except BaseException:
+            self._update_queued(-1)
+            self._slots.release()
+            raise
+        # Release on completion rather than on await, so a disconnected client does not
+        # free a slot whose job is still occupying a worker thread.
+        future.add_done_callback(lambda _f: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _update_queued(self, delta: int) -> None:
+        with self._queued_lock:
+            self._queued += delta
+            INFERENCE_QUEUE_DEPTH.set(self._queued)
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from app.ml.base import Predictor
+from app.observability.prometheus import MICRO_BATCH_SIZE, MICRO_BATCH_WAIT_SECONDS
+from app.schemas import EstimationFeaturesBase
+from app.services.inference_executor import InferenceExecutor
+
+
+@dataclass
+class _Pending:
+    predictor: Predictor
+    features: Sequence[EstimationFeaturesBase]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class MicroBatcher:
+    """
+    Coalesces predict_batch calls from concurrent requests into one model call.
+
+    Requests are collected for up to window_ms (or until max_batch_size items are
+    pending), then scored with one vectorized call per predictor on the inference
+    executor; each caller gets back its own slice of the result. Lives on a single
+    event loop and is not thread-safe.
+    """
+
+    def __init__(
+        self,
+        executor: InferenceExecutor,
+        window_ms: float = 2.0,
+        max_batch_size: int = 256,
+    ):
+        self.window_seconds = max(float(window_ms), 0.0) / 1000.0
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self._executor = executor
+        self._pending: list[_Pending] = []
+        self._pending_items = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def predict_batch(
+        self, predictor: Predictor, features: Sequence[EstimationFeaturesBase]
+    ) -> np.ndarray:
+        if not features:
+            return np.empty(0, dtype=np.int64)
+
+        loop = asyncio.get_running_loop()
+        if self._pending and self._pending_items + len(features) > self.max_batch_size:
+            self._flush()
+
+        pending = _Pending(predictor=predictor, features=features, future=loop.create_future())
+        self._pending.append(pending)
+        self._pending_items += len(features)
+
+        if self._pending_items >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_seconds, self._flush)
+
+        return await pending.future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, []
+        self._pending_items = 0
+
+        # A model swap can land mid-window; never score one version's requests with another.
+        groups: dict[int, list[_Pending]] = {}
+        flushed_at = time.perf_counter()
+        for p in pending:
+            MICRO_BATCH_WAIT_SECONDS.observe(flushed_at - p.enqueued_at)
+            groups.setdefault(id(p.predictor), []).append(p)
+
+        for group in groups.values():
+            task = asyncio.create_task(self._run(group))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, group: list[_Pending]) -> None:
+        predictor = group[0].predictor
+        features = [f for p in group for f in p.features]
+        MICRO_BATCH_SIZE.observe(len(features))
+
+        try:
+            prices = await self._executor.run(predictor.predict_batch, features)
+        except asyncio.CancelledError:
+            for p in group:
+                p.future.cancel()
+            raise
+        except Exception as e:
+            for p in group:
+                if not p.future.done():
+                    p.future.set_exception(e)
+            return
+
+        offset = 0
+        for p in group:
+            n = len(p.features)
+            if not p.future.done():
+                p.future.set_result(prices[offset : offset + n])
+            offset += n
@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Sequence
+
+import numpy as np
+
+from app.ml.base import Predictor
+from app.ml.features import MODEL_INPUT_FIELDS
+from app.observability.prometheus import PREDICTION_CACHE_ITEMS_TOTAL, PREDICTION_CACHE_SIZE
+from app.schemas import EstimationFeaturesBase
+
+
+def cache_key(features: EstimationFeaturesBase, model_version: str) -> tuple[Hashable, ...]:
+    """Canonical key: model version plus every field a model reads, in declaration order."""
+    values = tuple(getattr(features, name) for name in MODEL_INPUT_FIELDS)
+    return (model_version, *values)
+
+
+class PredictionCache:
+    """
+    In-process LRU cache of estimated prices keyed by input features and model version.
+
+    Entries expire after ttl_seconds; the cache is bounded to max_entries and should be
+    cleared whenever the registry swaps in a new model.
+    """
+
+    def __init__(self, max_entries: int = 100_000, ttl_seconds: float = 300.0):
+        self._max_entries = max(int(max_entries), 1)
+        self._ttl_seconds = float(ttl_seconds)
+        self._entries: OrderedDict[tuple[Hashable, ...], tuple[float, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        PREDICTION_CACHE_SIZE.set(0)
+
+    def predict_batch(
+        self,
+        predictor: Predictor,
+        features: Sequence[EstimationFeaturesBase],
+        model_version: str,
+    ) -> np.ndarray:
+        """Serve cached prices and run the predictor only on the misses (in one call)."""
+        prices, miss_idx = self.lookup(features, model_version)
+        if miss_idx:
+            predicted = predictor.predict_batch([features[i] for i in miss_idx])
+            prices[miss_idx] = predicted
+            self.store(features, miss_idx, predicted, model_version)
+        return prices
+
+    def lookup(
+        self, features: Sequence[EstimationFeaturesBase], model_version: str
+    ) -> tuple[np.ndarray, list[int]]:
+        """
+        Return a price array filled at the cached positions and the indices of the misses.
+
+        Positions listed in the miss indices are left uninitialized.
+        """
+        prices = np.empty(len(features), dtype=np.int64)
+        miss_idx: list[int] = []
+
+        now = time.monotonic()
+        with self._lock:
+            for i, f in enumerate(features):
+                key = cache_key(f, model_version)
+                entry = self._entries.get(key)
+                if entry is None or entry[0] <= now:
+                    miss_idx.append(i)
+                    continue
+                self._entries.move_to_end(key)
+                prices[i] = entry[1]
+
+        hits = len(features) - len(miss_idx)
+        if hits:
+            PREDICTION_CACHE_ITEMS_TOTAL.labels(result="hit").inc(hits)
+        if miss_idx:
+            PREDICTION_CACHE_ITEMS_TOTAL.labels(result="miss").inc(len(miss_idx))
+        return prices, miss_idx
+
+    def store(
+        self,
+        features: Sequence[EstimationFeaturesBase],
+        indices: Sequence[int],
+        prices: np.ndarray,
+        model_version: str,
+    ) -> None:
+        """Cache prices[k] as the result for features[indices[k]]."""
+        expires_at = time.monotonic() + self._ttl_seconds
+        with self._lock:
+            for i, price in zip(indices, prices.tolist()):
+                key = cache_key(features[i], model_version)
+                self._entries[key] = (expires_at, price)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            size = len(self._entries)
+        PREDICTION_CACHE_SIZE.set(size)
@@ -0,0 +1,123 @@
+import random
+import threading
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from app.ml.base import Predictor
+from app.ml.registry import ModelNotReadyError, ModelRegistry
+from app.observability.logging import log
+from app.observability.prometheus import (
+    SHADOW_BATCHES_TOTAL,
+    SHADOW_PREDICTION_ABS_PCT_DIFF,
+    SHADOW_PREDICTION_DIFF_NOK,
+    SHADOW_PREDICTION_LATENCY_SECONDS,
+    off_request_path,
+)
+from app.schemas import EstimationFeaturesBase
+
+
+class ShadowScorer:
+    """
+    Scores a sampled share of live /estimate batches with a candidate model version.
+
+    Runs on its own single-threaded executor after the response has been sent, so it
+    never holds an inference slot or delays the primary path. Only the candidate is run:
+    its prices are compared with the ones the primary model already served, and its
+    latency is comparable with model_prediction_latency_seconds. When more than
+    max_pending batches are outstanding, new ones are dropped rather than queued.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        candidate_version: str,
+        sample_rate: float = 0.05,
+        max_pending: int = 4,
+        load_retry_seconds: float = 60.0,
+    ):
+        self.candidate_version = candidate_version
+        self.sample_rate = min(max(float(sample_rate), 0.0), 1.0)
+        self._registry = registry
+        self._load_retry_seconds = float(load_retry_seconds)
+        self._retry_at = 0.0
+        self._slots = threading.BoundedSemaphore(max(int(max_pending), 1))
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+
+    def should_sample(self, primary: Predictor) -> bool:
+        if getattr(primary, "model_version", None) == self.candidate_version:
+            return False
+        if time.monotonic() < self._retry_at:
+            return False
+        return random.random() < self.sample_rate
+
+    def submit(
+        self,
+        features: Sequence[EstimationFeaturesBase],
+        primary_prices: np.ndarray,
+        primary: Predictor,
+    ) -> None:
+        """
+        Hand a served batch to the shadow executor without blocking; drops it if saturated.
+
+        primary_prices are the prices the response carried for features, in order.
+        """
+        if not self._slots.acquire(blocking=False):
+            SHADOW_BATCHES_TOTAL.labels(result="dropped").inc()
+            return
+        try:
+            future = self._executor.submit(self._score, features, primary_prices, primary)
+        except RuntimeError:
+            # Executor already shut down.
+            self._slots.release()
+            return
+        future.add_done_callback(lambda _f: self._slots.release())
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _score(
+        self,
+        features: Sequence[EstimationFeaturesBase],
+        primary_prices: np.ndarray,
+        primary: Predictor,
+    ) -> None:
+        try:
+            # Loaded lazily into the registry's pool on first use, off the request path.
+            candidate = self._registry.get_predictor(model_version=self.candidate_version)
+        except ModelNotReadyError as e:
+            self._retry_at = time.monotonic() + self._load_retry_seconds
+            SHADOW_BATCHES_TOTAL.labels(result="error").inc()
+            log().warning(
+                "shadow_candidate_unavailable", model_version=self.candidate_version, error=str(e)
+            )
+            return
+
+        primary_version = getattr(primary, "model_version", "unknown")
+        try:
+            started = time.perf_counter()
+            with off_request_path():
+                candidate_prices = candidate.predict_batch(features)
+            SHADOW_PREDICTION_LATENCY_SECONDS.labels(model_version=self.candidate_version).observe(
+                time.perf_counter() - started
+            )
+        except Exception as e:
+            SHADOW_BATCHES_TOTAL.labels(result="error").inc()
+            log().warning(
+                "shadow_scoring_failed", model_version=self.candidate_version, error=str(e)
+            )
+            return
+
+        diff = candidate_prices.astype(np.float64) - primary_prices.astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            abs_pct = np.abs(diff) / primary_prices
+        labels = {"primary_version": primary_version, "candidate_version": self.candidate_version}
+        abs_pct_hist = SHADOW_PREDICTION_ABS_PCT_DIFF.labels(**labels)
+        diff_summary = SHADOW_PREDICTION_DIFF_NOK.labels(**labels)
+        for d, p in zip(diff.tolist(), abs_pct.tolist(), strict=True):
+            diff_summary.observe(d)
+            if np.isfinite(p):
+                abs_pct_hist.observe(p)
+        SHADOW_BATCHES_TOTAL.labels(result="scored").inc()
@@ -0,0 +1,90 @@
+import json
+from collections.abc import Sequence
+from typing import Any
+
+from pydantic import ValidationError
+
+from app.api.ndjson import NDJSONLine
+from app.ml.base import Predictor
+from app.schemas import EstimationFeatures
+from app.services.estimate_service import build_result, count_predictions
+from app.services.prediction_cache import PredictionCache
+
+
+def score_ndjson_chunk(
+    lines: Sequence[NDJSONLine],
+    predictor: Predictor,
+    cache: PredictionCache | None = None,
+) -> bytes:
+    """
+    Validate and score one chunk of NDJSON request lines.
+
+    Each input line is `{"id": ..., <EstimationFeatures fields>}`. Returns the NDJSON
+    output for the chunk in input order: one `{"id", "estimated_price", ...}` record per
+    valid line and one `{"line", "id", "error", "detail"}` record per invalid line.
+    """
+    model_version = getattr(predictor, "model_version", "unknown")
+
+    records: list[dict[str, Any] | None] = []
+    valid_pos: list[int] = []
+    valid_ids: list[str] = []
+    valid_features: list[EstimationFeatures] = []
+
+    for line_no, raw in lines:
+        property_id, features, error = _parse_line(line_no, raw)
+        if error is not None:
+            records.append(error)
+            continue
+        valid_pos.append(len(records))
+        valid_ids.append(property_id)
+        valid_features.append(features)
+        records.append(None)
+
+    if valid_features:
+        # One vectorized model call per chunk, as in estimate_batch_json.
+        if cache is None:
+            prices = predictor.predict_batch(valid_features)
+        else:
+            prices = cache.predict_batch(predictor, valid_features, model_version)
+
+        for pos, property_id, f, estimated in zip(
+            valid_pos, valid_ids, valid_features, prices.tolist()
+        ):
+            result = build_result(f, estimated, model_version)
+            records[pos] = {"id": property_id, **result.model_dump()}
+        count_predictions(valid_features)
+
+    return "".join(
+        json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records
+    ).encode()
+
+
+def _parse_line(
+    line_no: int, raw: bytes | None
+) -> tuple[str, EstimationFeatures | None, dict[str, Any] | None]:
+    if raw is None:
+        return "", None, _error(line_no, None, "line_too_long")
+
+    try:
+        obj = json.loads(raw)
+    except ValueError as e:
+        return "", None, _error(line_no, None, "invalid_json", str(e))
+    if not isinstance(obj, dict):
+        return "", None, _error(line_no, None, "invalid_json", "line must be a JSON object")
+
+    property_id = obj.pop("id", None)
+    if property_id is None or isinstance(property_id, (dict, list, bool)):
+        return "", None, _error(line_no, None, "missing_id", "'id' must be a string or number")
+    property_id = str(property_id)
+
+    try:
+        features = EstimationFeatures.model_validate(obj)
+    except ValidationError as e:
+        detail = e.errors(include_url=False, include_context=False)
+        return property_id, None, _error(line_no, property_id, "validation_error", detail)
+
+    return property_id, features, None
+
+
+def _error(line_no: int, property_id: str | None, error: str, detail: Any = None) -> dict:
+    return {"line": line_no, "id": property_id, "error": error, "detail": detail}
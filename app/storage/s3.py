@@ -1,10 +1,7 @@
+import io
 import json
 from typing import Any
 
-import boto3
-from botocore.config import Config
-from botocore.exceptions import BotoCoreError, ClientError
-
 from app.config import settings
 
 
@@ -12,16 +9,22 @@ class S3StorageError(RuntimeError):
     pass
 
 
-cfg = Config(
-    signature_version="s3v4",
-    request_checksum_calculation="when_required",
-    response_checksum_validation="when_required",
-    s3={"addressing_style": "path"},
-)
-
-
 class S3Storage:
     def __init__(self):
+        # boto3/botocore are imported here rather than at module import (API cold start).
+        import boto3
+        from botocore.config import Config
+        from botocore.exceptions import BotoCoreError, ClientError
+
+        self._client_error = ClientError
+        self._errors = (ClientError, BotoCoreError)
+
+        cfg = Config(
+            signature_version="s3v4",
+            request_checksum_calculation="when_required",
+            response_checksum_validation="when_required",
+            s3={"addressing_style": "path"},
+        )
         self._client = boto3.client(
             "s3",
             endpoint_url=settings.s3_endpoint or None,
@@ -36,18 +39,44 @@ class S3Storage:
         try:
             self._client.head_object(Bucket=bucket, Key=key)
             return True
-        except ClientError as e:
+        except self._client_error as e:
             code = str(e.response.get("Error", {}).get("Code", ""))
             if code in {"404", "NoSuchKey", "NotFound"}:
                 return False
             raise S3StorageError(f"Failed to head s3://{bucket}/{key}") from e
 
+    def get_etag(self, bucket: str, key: str) -> str:
+        try:
+            resp = self._client.head_object(Bucket=bucket, Key=key)
+        except self._errors as e:
+            raise S3StorageError(f"Failed to head s3://{bucket}/{key}") from e
+        return str(resp.get("ETag", "")).strip('"')
+
+    def get_size(self, bucket: str, key: str) -> int:
+        try:
+            resp = self._client.head_object(Bucket=bucket, Key=key)
+        except self._errors as e:
+            raise S3StorageError(f"Failed to head s3://{bucket}/{key}") from e
+        return int(resp["ContentLength"])
+
+    def get_range(self, bucket: str, key: str, start: int, length: int) -> bytes:
+        """Read `length` bytes starting at `start` (fewer at the end of the object)."""
+        if length <= 0:
+            return b""
+        try:
+            resp = self._client.get_object(
+                Bucket=bucket, Key=key, Range=f"bytes={start}-{start + length - 1}"
+            )
+            return resp["Body"].read()
+        except self._errors as e:
+            raise S3StorageError(f"Failed to get range of s3://{bucket}/{key}") from e
+
     def get_bytes(self, bucket: str, key: str) -> bytes:
         try:
             resp = self._client.get_object(Bucket=bucket, Key=key)
             body = resp["Body"].read()
             return body
-        except (ClientError, BotoCoreError) as e:
+        except self._errors as e:
             raise S3StorageError(f"Failed to get s3://{bucket}/{key}") from e
 
     def put_bytes(
@@ -62,7 +91,7 @@ class S3Storage:
             if content_type:
                 extra["ContentType"] = content_type
             self._client.put_object(Bucket=bucket, Key=key, Body=data, **extra)
-        except (ClientError, BotoCoreError) as e:
+        except self._errors as e:
             raise S3StorageError(f"Failed to put s3://{bucket}/{key}") from e
 
     def get_json(self, bucket: str, key: str) -> dict[str, Any]:
@@ -80,7 +109,7 @@ class S3Storage:
             for line in body.iter_lines():
                 if line:
                     yield line.decode("utf-8")
-        except (ClientError, BotoCoreError) as e:
+        except self._errors as e:
             raise S3StorageError(f"Failed to stream s3://{bucket}/{key}") from e
         finally:
             if body is not None:
@@ -96,5 +125,55 @@ class S3Storage:
     def delete(self, bucket: str, key: str) -> None:
         try:
             self._client.delete_object(Bucket=bucket, Key=key)
-        except (ClientError, BotoCoreError) as e:
+        except self._errors as e:
             raise S3StorageError(f"Failed to delete s3://{bucket}/{key}") from e
+
+
+class S3ObjectReader(io.RawIOBase):
+    """
+    Seekable read-only file over an S3 object using ranged GETs.
+
+    Lets readers such as pyarrow.parquet fetch the footer and individual row groups
+    without downloading the whole object; wrap in io.BufferedReader for small reads.
+    """
+
+    def __init__(self, storage: S3Storage, bucket: str, key: str):
+        super().__init__()
+        self._storage = storage
+        self._bucket = bucket
+        self._key = key
+        self._size = storage.get_size(bucket=bucket, key=key)
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError("Negative seek position")
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer) -> int:
+        length = min(len(buffer), self._size - self._pos)
+        if length <= 0:
+            return 0
+        data = self._storage.get_range(self._bucket, self._key, self._pos, length)
+        n = len(data)
+        buffer[:n] = data
+        self._pos += n
+        return n
@@ -0,0 +1,177 @@
+import dataclasses
+import math
+import time
+
+from celery import group
+
+from app.celery_app import BulkTask, celery_app
+from app.config import settings
+from app.ml.base import Predictor
+from app.ml.registry import ModelRef, create_registry
+from app.observability.logging import log
+from app.observability.prometheus import (
+    BULK_ESTIMATE_CHUNK_DURATION_SECONDS,
+    BULK_ESTIMATE_ROWS_TOTAL,
+)
+from app.services.bulk_service import (
+    BulkJobPaths,
+    load_chunk_results,
+    pending_chunks,
+    plan_chunks,
+    score_chunk,
+    summarize_job,
+)
+from app.storage.s3 import S3Storage
+
+# One loaded model per worker process, reused across the chunks it scores.
+_predictor_cache: dict[str, Predictor] = {}
+
+
+def _predictor_for(storage: S3Storage, ref: ModelRef) -> Predictor:
+    predictor = _predictor_cache.get(ref.model_version)
+    if predictor is None:
+        predictor = create_registry(storage, background_refresh=False).load_predictor(ref)
+        _predictor_cache.clear()
+        _predictor_cache[ref.model_version] = predictor
+    return predictor
+
+
+@celery_app.task(
+    name="app.tasks.bulk.bulk_estimate",
+    queue="bulk",
+    base=BulkTask,
+    bind=True,
+    # Not retried: a re-run after the fan-out would queue every chunk and the finalize
+    # poller a second time. Only chunk scoring retries.
+    autoretry_for=(),
+)
+def bulk_estimate(
+    self,
+    input_key: str,
+    row_groups_per_chunk: int | None = None,
+) -> dict:
+    """
+    Score a Parquet file from the snapshots bucket with the currently published model.
+
+    Fans out one chunk task per group of row groups plus a finalize task and returns the
+    job description. Progress and the final summary live in the snapshots bucket
+    (`<output_prefix>/manifest.json`), not in the result backend, so any backend works;
+    Celery's rpc:// backend does not support chords.
+    """
+    storage = S3Storage()
+    bucket = settings.s3_bucket_snapshots
+    ref = create_registry(storage, background_refresh=False).latest_ref()
+    chunks = plan_chunks(
+        storage,
+        bucket=bucket,
+        key=input_key,
+        row_groups_per_chunk=row_groups_per_chunk or settings.bulk_estimate_row_groups_per_chunk,
+    )
+
+    job_id = self.request.id
+    paths = BulkJobPaths(prefix=f"{settings.bulk_estimate_output_prefix}/{job_id}")
+    job = {
+        "job_id": job_id,
+        "input_key": input_key,
+        "output_prefix": paths.prefix,
+        # Pinned so every chunk is scored by the same model even if latest.json moves.
+        "model_ref": dataclasses.asdict(ref),
+        "chunks": len(chunks),
+        "started_at": time.time(),
+    }
+    storage.put_json(bucket=bucket, key=paths.job_key, obj=job)
+
+    group(
+        bulk_estimate_chunk.s(job, chunk_index=i, row_groups=row_groups)
+        for i, row_groups in enumerate(chunks)
+    ).apply_async()
+    bulk_estimate_finalize.apply_async(
+        args=(job,), countdown=settings.bulk_estimate_finalize_poll_seconds
+    )
+
+    log().info(
+        "bulk_estimate_started",
+        job_id=job_id,
+        input_key=input_key,
+        chunks=len(chunks),
+        model_version=ref.model_version,
+    )
+    return job
+
+
+@celery_app.task(
+    name="app.tasks.bulk.bulk_estimate_chunk",
+    queue="bulk",
+    base=BulkTask,
+)
+def bulk_estimate_chunk(job: dict, chunk_index: int, row_groups: list[int]) -> dict:
+    started = time.perf_counter()
+    try:
+        storage = S3Storage()
+        predictor = _predictor_for(storage, ModelRef(**job["model_ref"]))
+        paths = BulkJobPaths(prefix=job["output_prefix"])
+        result = score_chunk(
+            storage,
+            bucket=settings.s3_bucket_snapshots,
+            input_key=job["input_key"],
+            row_groups=row_groups,
+            predictor=predictor,
+            output_key=paths.part_key(chunk_index),
+        )
+        result = {"chunk_index": chunk_index, **result}
+        # Read by bulk_estimate_finalize; the result backend is not involved.
+        storage.put_json(
+            bucket=settings.s3_bucket_snapshots,
+            key=paths.chunk_result_key(chunk_index),
+            obj=result,
+        )
+        BULK_ESTIMATE_ROWS_TOTAL.labels(result=result["status"]).inc(result["rows"])
+        return result
+    finally:
+        BULK_ESTIMATE_CHUNK_DURATION_SECONDS.observe(time.perf_counter() - started)
+
+
+@celery_app.task(
+    name="app.tasks.bulk.bulk_estimate_finalize",
+    queue="bulk",
+    base=BulkTask,
+    bind=True,
+)
+def bulk_estimate_finalize(self, job: dict, pending: list[int] | None = None) -> dict:
+    """
+    Write the job manifest once every chunk has stored its result.
+
+    Re-schedules itself every REE_BULK_ESTIMATE_FINALIZE_POLL_SECONDS while chunks are
+    pending, passing the still-pending chunk indexes along so each poll only checks
+    those; after REE_BULK_ESTIMATE_TIMEOUT_SECONDS (e.g. a chunk that exhausted its
+    retries) the manifest is written with status "incomplete" and the missing chunks.
+    """
+    storage = S3Storage()
+    bucket = settings.s3_bucket_snapshots
+    paths = BulkJobPaths(prefix=job["output_prefix"])
+    all_chunks = range(job["chunks"])
+    missing = pending_chunks(storage, bucket, paths, all_chunks if pending is None else pending)
+
+    timeout = settings.bulk_estimate_timeout_seconds
+    poll = max(settings.bulk_estimate_finalize_poll_seconds, 1)
+    if missing and time.time() - job["started_at"] < timeout:
+        raise self.retry(
+            args=(job,),
+            kwargs={"pending": missing},
+            countdown=poll,
+            max_retries=math.ceil(timeout / poll) + 1,
+        )
+
+    done = sorted(set(all_chunks).difference(missing))
+    chunk_results = load_chunk_results(storage, bucket, paths, done)
+    summary = summarize_job(job, chunk_results, missing_chunks=missing)
+    storage.put_json(bucket=bucket, key=paths.manifest_key, obj=summary)
+    log().info(
+        "bulk_estimate_finished",
+        job_id=job["job_id"],
+        status=summary["status"],
+        rows_scored=summary["rows_scored"],
+        rows_invalid=summary["rows_invalid"],
+        chunks_missing=len(missing),
+    )
+    return summary
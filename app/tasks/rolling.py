@@ -19,6 +19,8 @@ from app.training.fetch import FetchConfig
 from app.training.gating import evaluate_publish_gate
 from app.training.modeling import train_and_evaluate
 from app.training.publish import (
+    NATIVE_MODEL_FORMAT,
+    serialize_native_model,
     try_load_previous_metrics,
     update_latest_json,
     upload_model_artifacts_from_bytes,
@@ -150,6 +152,17 @@ def train_rolling_12m(ctx: dict, train: bool = True) -> dict:
             "feature_schema": train_result.feature_schema,
             "tmp_model_key": tmp_model_key,
         }
+
+        native_bytes = serialize_native_model(train_result.pipeline)
+        if native_bytes:
+            tmp_native_model_key = f"{ctx['snapshot_prefix']}/model_tmp.{NATIVE_MODEL_FORMAT}"
+            storage.put_bytes(
+                bucket=settings.s3_bucket_snapshots,
+                key=tmp_native_model_key,
+                data=native_bytes,
+                content_type="application/octet-stream",
+            )
+            ctx["train"]["tmp_native_model_key"] = tmp_native_model_key
         return ctx
     finally:
         TRAINING_STEP_DURATION_SECONDS.labels(step="train_rolling_12m").observe(
@@ -225,6 +238,12 @@ def publish_rolling_12m(ctx: dict, publish: bool = True) -> dict:
 
         storage = S3Storage()
         pipeline_bytes = storage.get_bytes(bucket=settings.s3_bucket_snapshots, key=tmp_model_key)
+        tmp_native_model_key = train.get("tmp_native_model_key")
+        native_model_bytes = None
+        if tmp_native_model_key:
+            native_model_bytes = storage.get_bytes(
+                bucket=settings.s3_bucket_snapshots, key=tmp_native_model_key
+            )
 
         model_version = make_model_version()
         manifest = ctx.get("manifest") or {}
@@ -246,18 +265,23 @@ def publish_rolling_12m(ctx: dict, publish: bool = True) -> dict:
                 metrics=train.get("metrics") or {},
                 feature_schema=train.get("feature_schema") or {},
                 training_manifest=training_manifest,
+                native_model_bytes=native_model_bytes,
             )
         finally:
-            try:
-                storage.delete(bucket=settings.s3_bucket_snapshots, key=tmp_model_key)
-            except Exception as e:
-                log().warning("temp_model_delete_failed", key=tmp_model_key, error=str(e))
+            for key in (tmp_model_key, tmp_native_model_key):
+                if not key:
+                    continue
+                try:
+                    storage.delete(bucket=settings.s3_bucket_snapshots, key=key)
+                except Exception as e:
+                    log().warning("temp_model_delete_failed", key=key, error=str(e))
 
         update_latest_json(
             storage=storage,
             model_version=model_version,
             artifact_key=keys["model_key"],
             snapshot_prefix=ctx["snapshot_prefix"],
+            native_artifact_key=keys.get("native_model_key"),
         )
 
         ctx["published"] = {
@@ -266,6 +290,7 @@ def publish_rolling_12m(ctx: dict, publish: bool = True) -> dict:
             "latest_updated": True,
             "model_version": model_version,
             "model_key": keys["model_key"],
+            "native_model_key": keys.get("native_model_key"),
             "gating_passed": gating.get("passed", False),
             "gating_reasons": gating.get("reasons", []),
         }
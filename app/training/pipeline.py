@@ -208,6 +208,7 @@ class Pipeline:
                 model_version=model_version,
                 artifact_key=keys["model_key"],
                 snapshot_prefix=snapshot_prefix,
+                native_artifact_key=keys.get("native_model_key"),
             )
             published = True
             latest_updated = True
@@ -1,3 +1,5 @@
+import os
+import tempfile
 from datetime import UTC, datetime
 from io import BytesIO
 from typing import Any
@@ -7,6 +9,8 @@ import joblib
 from app.config import settings
 from app.storage.s3 import S3Storage, S3StorageError
 
+NATIVE_MODEL_FORMAT = "cbm"
+
 
 def try_load_previous_metrics(storage: S3Storage) -> dict[str, Any] | None:
     """
@@ -31,6 +35,24 @@ def try_load_previous_metrics(storage: S3Storage) -> dict[str, Any] | None:
         return None
 
 
+def serialize_native_model(model: Any) -> bytes | None:
+    """
+    Serialize a CatBoost model in its native binary format.
+    Returns None for models without a native format (e.g. plain sklearn pipelines).
+    """
+    if not hasattr(model, "save_model") or not hasattr(model, "get_cat_feature_indices"):
+        return None
+
+    fd, path = tempfile.mkstemp(suffix=f".{NATIVE_MODEL_FORMAT}")
+    os.close(fd)
+    try:
+        model.save_model(path, format=NATIVE_MODEL_FORMAT)
+        with open(path, "rb") as fh:
+            return fh.read()
+    finally:
+        os.unlink(path)
+
+
 def _upload_model_artifacts_from_bytes(
     storage: S3Storage,
     model_version: str,
@@ -38,9 +60,11 @@ def _upload_model_artifacts_from_bytes(
     metrics: dict[str, Any],
     feature_schema: dict[str, Any],
     training_manifest: dict[str, Any],
+    native_model_bytes: bytes | None = None,
 ) -> dict[str, str]:
     prefix = f"models/{model_version}"
     model_key = f"{prefix}/model.pkl"
+    native_model_key = f"{prefix}/model.{NATIVE_MODEL_FORMAT}"
     metrics_key = f"{prefix}/metrics.json"
     schema_key = f"{prefix}/feature_schema.json"
     manifest_key = f"{prefix}/training_manifest.json"
@@ -52,17 +76,33 @@ def _upload_model_artifacts_from_bytes(
         content_type="application/octet-stream",
     )
 
-    storage.put_json(bucket=settings.s3_bucket_models, key=metrics_key, obj=metrics)
-    storage.put_json(bucket=settings.s3_bucket_models, key=schema_key, obj=feature_schema)
-    storage.put_json(bucket=settings.s3_bucket_models, key=manifest_key, obj=training_manifest)
-
-    return {
+    keys = {
         "model_key": model_key,
         "metrics_key": metrics_key,
         "schema_key": schema_key,
         "manifest_key": manifest_key,
     }
 
+    if native_model_bytes:
+        storage.put_bytes(
+            bucket=settings.s3_bucket_models,
+            key=native_model_key,
+            data=native_model_bytes,
+            content_type="application/octet-stream",
+        )
+        feature_schema = {
+            **feature_schema,
+            "native_model_format": NATIVE_MODEL_FORMAT,
+            "native_model_key": native_model_key,
+        }
+        keys["native_model_key"] = native_model_key
+
+    storage.put_json(bucket=settings.s3_bucket_models, key=metrics_key, obj=metrics)
+    storage.put_json(bucket=settings.s3_bucket_models, key=schema_key, obj=feature_schema)
+    storage.put_json(bucket=settings.s3_bucket_models, key=manifest_key, obj=training_manifest)
+
+    return keys
+
 
 def upload_model_artifacts(
     storage: S3Storage,
@@ -81,6 +121,7 @@ def upload_model_artifacts(
         metrics=metrics,
         feature_schema=feature_schema,
         training_manifest=training_manifest,
+        native_model_bytes=serialize_native_model(pipeline),
     )
 
 
@@ -91,6 +132,7 @@ def upload_model_artifacts_from_bytes(
     metrics: dict[str, Any],
     feature_schema: dict[str, Any],
     training_manifest: dict[str, Any],
+    native_model_bytes: bytes | None = None,
 ) -> dict[str, str]:
     return _upload_model_artifacts_from_bytes(
         storage=storage,
@@ -99,6 +141,7 @@ def upload_model_artifacts_from_bytes(
         metrics=metrics,
         feature_schema=feature_schema,
         training_manifest=training_manifest,
+        native_model_bytes=native_model_bytes,
     )
 
 
@@ -107,6 +150,7 @@ def update_latest_json(
     model_version: str,
     artifact_key: str,
     snapshot_prefix: str,
+    native_artifact_key: str | None = None,
 ) -> None:
     latest = {
         "model_version": model_version,
@@ -115,4 +159,7 @@ def update_latest_json(
         "created_at": datetime.now(UTC).isoformat(),
         "snapshot_prefix": snapshot_prefix,
     }
+    if native_artifact_key:
+        latest["native_artifact_key"] = native_artifact_key
+        latest["native_artifact_format"] = NATIVE_MODEL_FORMAT
     storage.put_json(bucket=settings.s3_bucket_models, key="latest.json", obj=latest)
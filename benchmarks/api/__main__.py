@@ -0,0 +1,206 @@
+"""
+HTTP load test of POST /estimate against a locally trained CatBoost model.
+
+`run` trains a small model on synthetic listings, publishes it to a temporary
+LocalStorage directory, starts the real app (benchmarks.api.server) in a subprocess and
+drives it over HTTP at every batch size x concurrency combination. Results (throughput,
+p50/p95/p99 latency, errors) are written as JSON; with --baseline they are compared
+against an earlier report and the exit code is 1 on regression. `compare` compares two
+saved reports.
+
+    uv run python -m benchmarks.api run --output benchmarks/results/api.json
+    uv run python -m benchmarks.api run --baseline benchmarks/results/api.json
+    uv run python -m benchmarks.api compare base.json new.json --threshold 0.15
+
+The load generator is a single asyncio process; at batch size 1 and high concurrency it
+can saturate before the server does. Use --url to target an already running deployment
+(e.g. docker compose with MinIO) instead of the local server.
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.api.load import build_bodies, run_scenario
+from benchmarks.report import (
+    build_report,
+    compare_results,
+    load_report,
+    print_changes,
+    write_report,
+)
+
+SUITE = "api"
+KEY_FIELDS = ("batch_size", "concurrency")
+COMPARED_METRICS = {
+    "p50_ms": "lower",
+    "p95_ms": "lower",
+    "p99_ms": "lower",
+    "throughput_rps": "higher",
+    "error_rate": "lower",
+}
+
+
+def _start_server(storage_dir: str, port: int, prediction_cache: bool) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "REE_PREDICTION_CACHE_ENABLED": str(prediction_cache).lower(),
+        "REE_LOG_LEVEL": os.environ.get("REE_LOG_LEVEL", "WARNING"),
+    }
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.api.server",
+            "--storage-dir",
+            storage_dir,
+            "--port",
+            str(port),
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def _wait_ready(base_url: str, server: subprocess.Popen | None, timeout_s: float) -> None:
+    """Poll /ready until the model is loaded and warmed (200)."""
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise RuntimeError(f"benchmark server exited with code {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/ready", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"{base_url}/ready did not return 200 within {timeout_s:.0f}s")
+
+
+def _print_table(results: list[dict]) -> None:
+    print(
+        f"{'batch':>6} {'conc':>5} {'req/s':>9} {'items/s':>10} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}",
+        file=sys.stderr,
+    )
+    for r in results:
+        print(
+            f"{r['batch_size']:>6} {r['concurrency']:>5} {r['throughput_rps']:>9.1f} "
+            f"{r['items_per_s']:>10.0f} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+            f"{r['p99_ms']:>9.2f} {r['errors']:>7}",
+            file=sys.stderr,
+        )
+
+
+def _compare(baseline: dict, current: dict, threshold: float) -> int:
+    if baseline.get("suite") != SUITE:
+        raise SystemExit(f"baseline is a {baseline.get('suite')!r} report, not {SUITE!r}")
+    changes = compare_results(
+        baseline["results"], current["results"], KEY_FIELDS, COMPARED_METRICS, threshold
+    )
+    print_changes(changes)
+    return 1 if any(c.regression for c in changes) else 0
+
+
+def run(args: argparse.Namespace) -> int:
+    from benchmarks.api.model import publish_bench_model
+
+    config = {
+        "batch_sizes": args.batch_sizes,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "warmup_s": args.warmup,
+        "prediction_cache": args.prediction_cache,
+        "model_rows": args.model_rows,
+        "model_iterations": args.model_iterations,
+        "url": args.url or "",
+    }
+    server = None
+    with tempfile.TemporaryDirectory(prefix="ree-bench-") as storage_dir:
+        if args.url:
+            base_url = args.url.rstrip("/")
+        else:
+            print("training benchmark model...", file=sys.stderr)
+            publish_bench_model(
+                storage_dir, rows=args.model_rows, iterations=args.model_iterations
+            )
+            base_url = f"http://127.0.0.1:{args.port}"
+            server = _start_server(storage_dir, args.port, args.prediction_cache)
+        try:
+            _wait_ready(base_url, server, timeout_s=args.ready_timeout)
+            results = []
+            for batch_size in args.batch_sizes:
+                bodies = build_bodies(batch_size, count=max(4, min(64, 50_000 // batch_size)))
+                for concurrency in args.concurrency:
+                    print(f"batch_size={batch_size} concurrency={concurrency}", file=sys.stderr)
+                    result = asyncio.run(
+                        run_scenario(
+                            base_url,
+                            bodies,
+                            batch_size=batch_size,
+                            concurrency=concurrency,
+                            duration_s=args.duration,
+                            warmup_s=args.warmup,
+                        )
+                    )
+                    results.append(result.summary())
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+
+    report = build_report(SUITE, config, results)
+    _print_table(results)
+    write_report(report, args.output)
+    if args.baseline:
+        return _compare(load_report(args.baseline), report, args.threshold)
+    return 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Load test POST /estimate")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="Run the load test")
+    run_p.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 100, 1_000, 10_000])
+    run_p.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    run_p.add_argument(
+        "--duration", type=float, default=10.0, help="Measured seconds per scenario."
+    )
+    run_p.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds first.")
+    run_p.add_argument("--url", help="Benchmark a running server instead of starting one.")
+    run_p.add_argument("--port", type=int, default=8765)
+    run_p.add_argument("--ready-timeout", type=float, default=120.0)
+    run_p.add_argument(
+        "--prediction-cache",
+        action="store_true",
+        help="Keep the prediction cache on (off by default so the model is measured).",
+    )
+    run_p.add_argument("--model-rows", type=int, default=20_000)
+    run_p.add_argument("--model-iterations", type=int, default=300)
+    run_p.add_argument("--output", help="Report path (default: stdout).")
+    run_p.add_argument("--baseline", help="Report to compare against; exit 1 on regression.")
+    run_p.add_argument("--threshold", type=float, default=0.10)
+
+    cmp_p = sub.add_parser("compare", help="Compare two saved reports")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--threshold", type=float, default=0.10)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.command == "compare":
+        return _compare(load_report(args.baseline), load_report(args.current), args.threshold)
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import cycle
+
+import httpx
+
+from benchmarks.synthetic import synthetic_listings
+
+
+def build_bodies(batch_size: int, count: int, seed: int = 0) -> list[bytes]:
+    """`count` distinct /estimate request bodies of `batch_size` items each."""
+    rows = synthetic_listings(batch_size * count, seed=seed)
+    bodies = []
+    for i in range(count):
+        batch = rows[i * batch_size : (i + 1) * batch_size]
+        payload = {
+            str(n): {k: v for k, v in row.items() if k != "price" and v is not None}
+            for n, row in enumerate(batch, start=1)
+        }
+        bodies.append(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+    return bodies
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list (q in 0..100)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(-(-q * len(sorted_values) // 100)), 1)  # ceil
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+@dataclass
+class ScenarioResult:
+    batch_size: int
+    concurrency: int
+    elapsed_s: float
+    latencies_s: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+
+    def summary(self) -> dict:
+        ok = sorted(self.latencies_s)
+        total = sum(self.statuses.values())
+        errors = total - self.statuses.get(200, 0)
+        ms = [v * 1000 for v in ok]
+        return {
+            "batch_size": self.batch_size,
+            "concurrency": self.concurrency,
+            "requests": total,
+            "errors": errors,
+            "error_rate": errors / total if total else 0.0,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "duration_s": round(self.elapsed_s, 3),
+            "throughput_rps": len(ok) / self.elapsed_s if self.elapsed_s else 0.0,
+            "items_per_s": len(ok) * self.batch_size / self.elapsed_s if self.elapsed_s else 0.0,
+            "mean_ms": sum(ms) / len(ms) if ms else 0.0,
+            "p50_ms": percentile(ms, 50),
+            "p95_ms": percentile(ms, 95),
+            "p99_ms": percentile(ms, 99),
+            "max_ms": ms[-1] if ms else 0.0,
+        }
+
+
+async def _drive(
+    client: httpx.AsyncClient,
+    bodies: list[bytes],
+    concurrency: int,
+    duration_s: float,
+    result: ScenarioResult | None,
+) -> None:
+    """Closed loop: `concurrency` workers each send the next body as soon as they get a reply."""
+    next_body = cycle(bodies).__next__
+    deadline = time.perf_counter() + duration_s
+    headers = {"content-type": "application/json"}
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await client.post("/estimate", content=next_body(), headers=headers)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0  # connection error or timeout
+            elapsed = time.perf_counter() - start
+            if result is not None:
+                result.statuses[status] += 1
+                if status == 200:
+                    result.latencies_s.append(elapsed)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def run_scenario(
+    base_url: str,
+    bodies: list[bytes],
+    batch_size: int,
+    concurrency: int,
+    duration_s: float,
+    warmup_s: float,
+    timeout_s: float = 120.0,
+) -> ScenarioResult:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout_s) as client:
+        if warmup_s > 0:
+            await _drive(client, bodies, concurrency, warmup_s, result=None)
+        result = ScenarioResult(batch_size=batch_size, concurrency=concurrency, elapsed_s=0.0)
+        start = time.perf_counter()
+        await _drive(client, bodies, concurrency, duration_s, result=result)
+        # In-flight requests finish after the deadline, so measure the real window.
+        result.elapsed_s = time.perf_counter() - start
+    return result
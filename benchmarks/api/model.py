@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from catboost import CatBoostRegressor, Pool
+
+from app.training.modeling import (
+    CATEGORICAL_COLS,
+    DERIVED_COLS,
+    NUMERIC_COLS,
+    PREDICTION_TRANSFORM,
+    TARGET_TRANSFORM,
+    _add_derived_features,
+)
+from app.training.publish import update_latest_json, upload_model_artifacts
+from benchmarks.storage import LocalStorage
+from benchmarks.synthetic import synthetic_columns
+
+BENCH_MODEL_VERSION = "bench-v1"
+
+
+def train_bench_model(rows: int = 20_000, iterations: int = 300, seed: int = 0):
+    """
+    Small CatBoost model with the production feature layout.
+
+    Same columns, derived features and log1p target as app.training.modeling, but a
+    fixed iteration count so training takes seconds and the model is deterministic.
+    """
+    df = _add_derived_features(pd.DataFrame(synthetic_columns(rows, seed)))
+    X = df[CATEGORICAL_COLS + NUMERIC_COLS].copy()
+    for c in CATEGORICAL_COLS:
+        X[c] = X[c].astype(str)
+    y_log = np.log1p(df["price"].to_numpy(dtype=float))
+
+    model = CatBoostRegressor(
+        loss_function="RMSE",
+        learning_rate=0.1,
+        depth=6,
+        iterations=iterations,
+        random_seed=seed,
+        thread_count=-1,
+        verbose=False,
+        allow_writing_files=False,
+    )
+    cat_features = [X.columns.get_loc(c) for c in CATEGORICAL_COLS]
+    model.fit(Pool(X, y_log, cat_features=cat_features))
+    return model
+
+
+def publish_bench_model(root: str | Path, rows: int = 20_000, iterations: int = 300) -> str:
+    """Train the benchmark model and publish it (model.pkl, model.cbm, latest.json) to root."""
+    storage = LocalStorage(root)
+    keys = upload_model_artifacts(
+        storage=storage,
+        model_version=BENCH_MODEL_VERSION,
+        pipeline=train_bench_model(rows=rows, iterations=iterations),
+        metrics={},
+        feature_schema={
+            "categorical": CATEGORICAL_COLS,
+            "numeric": NUMERIC_COLS,
+            "derived": DERIVED_COLS,
+            "label": "price",
+            "target_transform": TARGET_TRANSFORM,
+            "prediction_transform": PREDICTION_TRANSFORM,
+        },
+        training_manifest={"source": "benchmarks.api", "rows": rows, "iterations": iterations},
+    )
+    update_latest_json(
+        storage=storage,
+        model_version=BENCH_MODEL_VERSION,
+        artifact_key=keys["model_key"],
+        snapshot_prefix="",
+        native_artifact_key=keys.get("native_model_key"),
+    )
+    return BENCH_MODEL_VERSION
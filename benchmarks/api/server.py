@@ -0,0 +1,47 @@
+"""
+The production app served from a LocalStorage directory instead of S3.
+
+    uv run python -m benchmarks.api.server --storage-dir /tmp/ree-bench --port 8765
+
+The directory must contain a published model (benchmarks.api.model.publish_bench_model);
+all other settings come from REE_* environment variables as usual.
+"""
+
+import argparse
+import os
+
+import uvicorn
+from fastapi import FastAPI
+
+from benchmarks.storage import LocalStorage
+
+STORAGE_DIR_ENV = "REE_BENCH_STORAGE_DIR"
+
+
+def create_bench_app() -> FastAPI:
+    from app.main import create_app
+
+    root = os.environ[STORAGE_DIR_ENV]
+    return create_app(storage_factory=lambda: LocalStorage(root))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the API from a local model directory")
+    parser.add_argument("--storage-dir", required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    os.environ[STORAGE_DIR_ENV] = args.storage_dir
+    uvicorn.run(
+        "benchmarks.api.server:create_bench_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Per-request overhead of the observability middleware stack.
+
+Drives the ASGI app directly (no server, no HTTP client) with a tiny POST /estimate
+and compares three stacks: no middleware, the previous BaseHTTPMiddleware
+implementations, and the current pure ASGI ones. Logs are rendered as in production
+but written to /dev/null.
+
+    uv run python -m benchmarks.middleware --requests 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+
+from fastapi import FastAPI, Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from structlog.contextvars import bind_contextvars, clear_contextvars
+
+from app.observability.logging import configure_logging, log
+from app.observability.prometheus import (
+    HTTP_REQUEST_DURATION_SECONDS,
+    HTTP_REQUESTS_TOTAL,
+    PrometheusMiddleware,
+)
+from app.observability.request_id import RequestIdMiddleware
+
+_BODY = b'{"1":{"realestate_type":"leilighet","municipality_number":301,"bra":50}}'
+_RESPONSE = (
+    b'{"1":{"estimated_price":2500000,"currency":"NOK","model_version":"bench","warnings":[]}}'
+)
+
+
+class LegacyPrometheusMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Callable):
+        start = time.perf_counter()
+        response: Response = await call_next(request)
+        elapsed = time.perf_counter() - start
+
+        path = request.url.path
+        method = request.method
+        status = str(response.status_code)
+
+        HTTP_REQUESTS_TOTAL.labels(method=method, path=path, status=status).inc()
+        HTTP_REQUEST_DURATION_SECONDS.labels(method=method, path=path).observe(elapsed)
+        return response
+
+
+class LegacyRequestIdMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, header_name: str = "X-Request-Id"):
+        super().__init__(app)
+        self.header_name = header_name
+
+    async def dispatch(self, request: Request, call_next: Callable):
+        clear_contextvars()
+
+        request_id = request.headers.get(self.header_name) or str(uuid.uuid4())
+        bind_contextvars(request_id=request_id)
+
+        start = time.perf_counter()
+        response: Response = await call_next(request)
+        latency_ms = int((time.perf_counter() - start) * 1000)
+        response.headers[self.header_name] = request_id
+
+        log().info(
+            "http_request_completed",
+            method=request.method,
+            path=request.url.path,
+            status_code=response.status_code,
+            latency_ms=latency_ms,
+        )
+        return response
+
+
+STACKS: dict[str, tuple[type, ...]] = {
+    "none": (),
+    "base_http": (LegacyRequestIdMiddleware, LegacyPrometheusMiddleware),
+    "asgi": (RequestIdMiddleware, PrometheusMiddleware),
+}
+
+
+def build_app(middlewares: tuple[type, ...]) -> FastAPI:
+    api = FastAPI()
+
+    @api.post("/estimate")
+    async def estimate() -> Response:
+        return Response(content=_RESPONSE, media_type="application/json")
+
+    # Same order as app.main: the last one added is the outermost.
+    for middleware in middlewares:
+        api.add_middleware(middleware)
+    return api
+
+
+async def _request(app: FastAPI) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/estimate",
+        "raw_path": b"/estimate",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"bench"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(_BODY)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+        "state": {},
+    }
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": _BODY, "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def _bench(app: FastAPI, requests: int, warmup: int) -> list[float]:
+    for _ in range(warmup):
+        await _request(app)
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await _request(app)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the observability middlewares")
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--warmup", type=int, default=2_000)
+    args = parser.parse_args()
+
+    results = {}
+    with open(os.devnull, "w") as devnull:
+        # Installed before configure_logging(), whose basicConfig() then leaves it alone.
+        logging.basicConfig(format="%(message)s", stream=devnull, level=logging.INFO)
+        configure_logging()
+
+        for name, middlewares in STACKS.items():
+            timings = asyncio.run(_bench(build_app(middlewares), args.requests, args.warmup))
+            timings.sort()
+            results[name] = {
+                "mean_us": statistics.fmean(timings) * 1e6,
+                "p50_us": timings[len(timings) // 2] * 1e6,
+                "p99_us": timings[int(len(timings) * 0.99)] * 1e6,
+            }
+
+    baseline = results["none"]["mean_us"]
+    print(f"{'stack':<10} {'mean µs':>9} {'p50 µs':>9} {'p99 µs':>9} {'overhead µs':>12}")
+    for name, r in results.items():
+        print(
+            f"{name:<10} {r['mean_us']:>9.1f} {r['p50_us']:>9.1f} {r['p99_us']:>9.1f} "
+            f"{r['mean_us'] - baseline:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+JSON reports and baseline comparison shared by the benchmark suites.
+
+A report is {"suite", "created_at", "environment", "config", "results": [...]}; every
+result is a flat dict of key fields (what was measured, e.g. batch_size) and metrics.
+Two reports of the same suite are compared result by result, matched on the key fields.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Literal
+
+Better = Literal["lower", "higher"]
+
+
+@dataclass(frozen=True)
+class MetricChange:
+    key: dict[str, Any]
+    metric: str
+    baseline: float
+    current: float
+    change_pct: float
+    regression: bool
+
+
+def environment() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+    return {
+        "git_commit": commit,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def build_report(suite: str, config: dict[str, Any], results: list[dict[str, Any]]) -> dict:
+    return {
+        "suite": suite,
+        "created_at": datetime.now(UTC).isoformat(),
+        "environment": environment(),
+        "config": config,
+        "results": results,
+    }
+
+
+def write_report(report: dict[str, Any], path: str | Path | None) -> None:
+    """Write the report to `path`, or to stdout when no path is given."""
+    data = json.dumps(report, ensure_ascii=False, indent=2)
+    if path is None:
+        print(data)
+        return
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(data + "\n", encoding="utf-8")
+
+
+def load_report(path: str | Path) -> dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare_results(
+    baseline: list[dict[str, Any]],
+    current: list[dict[str, Any]],
+    key_fields: tuple[str, ...],
+    metrics: dict[str, Better],
+    threshold: float,
+) -> list[MetricChange]:
+    """
+    Relative change of each metric for results present in both reports.
+
+    A change is a regression when it moves in the wrong direction by more than
+    `threshold` (0.10 = 10%). A metric that was 0 regresses on any increase (or any
+    decrease for higher-is-better), e.g. errors appearing.
+    """
+    by_key = {tuple(r[f] for f in key_fields): r for r in baseline}
+    changes = []
+    for result in current:
+        key = tuple(result[f] for f in key_fields)
+        base = by_key.get(key)
+        if base is None:
+            continue
+        for metric, better in metrics.items():
+            if metric not in base or metric not in result:
+                continue
+            old, new = float(base[metric]), float(result[metric])
+            if old == new:
+                change = 0.0
+            elif old == 0:
+                change = float("inf") if new > old else float("-inf")
+            else:
+                change = (new - old) / abs(old)
+            worse = change > threshold if better == "lower" else change < -threshold
+            changes.append(
+                MetricChange(
+                    key=dict(zip(key_fields, key, strict=True)),
+                    metric=metric,
+                    baseline=old,
+                    current=new,
+                    change_pct=change * 100,
+                    regression=worse,
+                )
+            )
+    return changes
+
+
+def print_changes(changes: list[MetricChange], file=sys.stderr) -> None:
+    for c in changes:
+        key = " ".join(f"{k}={v}" for k, v in c.key.items())
+        flag = "REGRESSION" if c.regression else ""
+        print(
+            f"{key:<32} {c.metric:<16} {c.baseline:>12.3f} -> {c.current:>12.3f} "
+            f"{c.change_pct:>+8.1f}%  {flag}",
+            file=file,
+        )
+    regressions = sum(c.regression for c in changes)
+    print(f"{regressions} regression(s) in {len(changes)} compared metrics", file=file)
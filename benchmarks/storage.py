@@ -0,0 +1,83 @@
+import hashlib
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from app.storage.s3 import S3StorageError
+
+
+class LocalStorage:
+    """
+    S3Storage stand-in backed by a local directory (<root>/<bucket>/<key>).
+
+    Lets the benchmark server load models without MinIO; raises S3StorageError like the
+    real client so the registry's error handling is exercised unchanged.
+    """
+
+    def __init__(self, root: str | Path):
+        self._root = Path(root)
+
+    def _path(self, bucket: str, key: str) -> Path:
+        return self._root / bucket / key
+
+    def _read(self, bucket: str, key: str) -> bytes:
+        try:
+            return self._path(bucket, key).read_bytes()
+        except OSError as e:
+            raise S3StorageError(f"Failed to get s3://{bucket}/{key}") from e
+
+    def exists(self, bucket: str, key: str) -> bool:
+        return self._path(bucket, key).is_file()
+
+    def get_etag(self, bucket: str, key: str) -> str:
+        return hashlib.md5(self._read(bucket, key), usedforsecurity=False).hexdigest()
+
+    def get_size(self, bucket: str, key: str) -> int:
+        try:
+            return self._path(bucket, key).stat().st_size
+        except OSError as e:
+            raise S3StorageError(f"Failed to head s3://{bucket}/{key}") from e
+
+    def get_range(self, bucket: str, key: str, start: int, length: int) -> bytes:
+        if length <= 0:
+            return b""
+        try:
+            with self._path(bucket, key).open("rb") as fh:
+                fh.seek(start)
+                return fh.read(length)
+        except OSError as e:
+            raise S3StorageError(f"Failed to get range of s3://{bucket}/{key}") from e
+
+    def get_bytes(self, bucket: str, key: str) -> bytes:
+        return self._read(bucket, key)
+
+    def put_bytes(
+        self,
+        bucket: str,
+        key: str,
+        data: bytes,
+        content_type: str | None = None,
+    ) -> None:
+        path = self._path(bucket, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def get_json(self, bucket: str, key: str) -> dict[str, Any]:
+        raw = self._read(bucket, key)
+        try:
+            return json.loads(raw.decode("utf-8"))
+        except Exception as e:
+            raise S3StorageError(f"Invalid JSON at s3://{bucket}/{key}") from e
+
+    def iter_lines(self, bucket: str, key: str) -> Iterator[str]:
+        for line in self._read(bucket, key).splitlines():
+            if line:
+                yield line.decode("utf-8")
+
+    def put_json(self, bucket: str, key: str, obj: dict[str, Any]) -> None:
+        data = json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+        self.put_bytes(bucket=bucket, key=key, data=data, content_type="application/json")
+
+    def delete(self, bucket: str, key: str) -> None:
+        self._path(bucket, key).unlink(missing_ok=True)
@@ -0,0 +1,102 @@
+"""
+Seeded synthetic listings with roughly realistic Norwegian distributions.
+
+Field names and value ranges follow the training rows (app.training.dataset) and the
+/estimate contract (app.schemas.EstimationFeatures), so the same rows can be used to
+train a model, to build request payloads and to feed the training pipeline stages.
+"""
+
+from typing import Any
+
+import numpy as np
+
+# (municipality_number, lat, lon, price per m² in NOK)
+MUNICIPALITIES = [
+    (301, 59.91, 10.75, 95_000),  # Oslo
+    (4601, 60.39, 5.32, 62_000),  # Bergen
+    (5001, 63.43, 10.39, 58_000),  # Trondheim
+    (1103, 58.97, 5.73, 55_000),  # Stavanger
+    (3024, 59.89, 10.52, 75_000),  # Bærum
+    (5501, 69.65, 18.96, 48_000),  # Tromsø
+    (4204, 58.15, 8.00, 45_000),  # Kristiansand
+    (3005, 59.74, 10.20, 42_000),  # Drammen
+    (3403, 60.79, 11.07, 32_000),  # Hamar
+    (1804, 67.28, 14.40, 38_000),  # Bodø
+]
+_MUNICIPALITY_WEIGHTS = [0.30, 0.14, 0.12, 0.10, 0.08, 0.06, 0.06, 0.06, 0.04, 0.04]
+
+# (realestate_type, share, median BRA m², price factor)
+REALESTATE_TYPES = [
+    ("leilighet", 0.46, 65.0, 1.00),
+    ("enebolig", 0.28, 150.0, 0.80),
+    ("rekkehus", 0.11, 110.0, 0.85),
+    ("tomannsbolig", 0.08, 120.0, 0.85),
+    ("hytte", 0.05, 70.0, 0.55),
+    ("næringseiendom", 0.02, 300.0, 0.60),
+]
+
+
+def synthetic_columns(n: int, seed: int = 0) -> dict[str, np.ndarray]:
+    """Column arrays for `n` listings; optional fields use NaN for missing values."""
+    rng = np.random.default_rng(seed)
+
+    type_idx = rng.choice(len(REALESTATE_TYPES), size=n, p=[t[1] for t in REALESTATE_TYPES])
+    muni_idx = rng.choice(len(MUNICIPALITIES), size=n, p=_MUNICIPALITY_WEIGHTS)
+
+    types = np.array([t[0] for t in REALESTATE_TYPES], dtype=object)[type_idx]
+    median_bra = np.array([t[2] for t in REALESTATE_TYPES])[type_idx]
+    type_factor = np.array([t[3] for t in REALESTATE_TYPES])[type_idx]
+    munis = np.array(MUNICIPALITIES, dtype=float)[muni_idx]
+
+    is_flat = types == "leilighet"
+    bra = np.round(np.clip(median_bra * rng.lognormal(0.0, 0.35, n), 15.0, 2_000.0), 1)
+    # Flats: total_area is BRA plus storage; houses and cabins include part of the plot.
+    total_area = np.round(
+        bra * np.where(is_flat, rng.uniform(1.0, 1.15, n), rng.uniform(1.1, 6.0, n)), 1
+    )
+    built_year = np.clip(np.round(rng.normal(1980, 28, n)), 1850, 2025).astype(np.int64)
+
+    floor = np.where(is_flat, rng.integers(1, 13, n), np.nan)
+    rooms = np.clip(np.round(bra / 25.0 + rng.normal(0.5, 0.8, n)), 1, 15)
+    bedrooms = np.clip(rooms - 1, 0, 10)
+    rooms = np.where(rng.random(n) < 0.15, np.nan, rooms)
+    bedrooms = np.where(rng.random(n) < 0.25, np.nan, bedrooms)
+
+    age_factor = 1.0 - np.clip(2025 - built_year, 0, 100) * 0.003
+    price = np.round(
+        bra * munis[:, 3] * type_factor * age_factor * rng.lognormal(0.0, 0.18, n), -3
+    )
+
+    return {
+        "price": price,
+        "realestate_type": types,
+        "municipality_number": munis[:, 0].astype(np.int64),
+        "lat": np.round(munis[:, 1] + rng.normal(0.0, 0.05, n), 5),
+        "lon": np.round(munis[:, 2] + rng.normal(0.0, 0.10, n), 5),
+        "built_year": built_year,
+        "bra": bra,
+        "total_area": total_area,
+        "floor": floor,
+        "bedrooms": bedrooms,
+        "rooms": rooms,
+    }
+
+
+def synthetic_listings(n: int, seed: int = 0) -> list[dict[str, Any]]:
+    """Listings as the row dicts the training pipeline works on (None for missing)."""
+    columns = synthetic_columns(n, seed)
+    names = list(columns)
+    values = [
+        [None if v != v else v for v in col.tolist()]  # NaN -> None
+        if col.dtype.kind == "f"
+        else col.tolist()
+        for col in columns.values()
+    ]
+    rows = []
+    for row in zip(*values, strict=True):
+        item = dict(zip(names, row, strict=True))
+        for key in ("floor", "bedrooms", "rooms"):
+            if item[key] is not None:
+                item[key] = int(item[key])
+        rows.append(item)
+    return rows
@@ -0,0 +1,141 @@
+"""
+Scaling benchmarks for the training data path on synthetic rolling windows.
+
+Runs every stage (benchmarks.training.stages) at each row count: --repeat timed runs and
+one tracemalloc run, each in a fresh interpreter. For every stage and size the report has
+the best wall time, peak RSS (whole process and added by the stage), tracemalloc
+peak/retained bytes, and a scaling exponent against the previous size: 1.0 is linear,
+clearly above 1 means the stage stops scaling. A run that fails (e.g. killed on OOM) is
+recorded with its error instead of aborting the suite.
+
+    uv run python -m benchmarks.training run --output benchmarks/results/training.json
+    uv run python -m benchmarks.training run --rows 100000 --stages compute_metrics
+    uv run python -m benchmarks.training compare base.json new.json --threshold 0.15
+
+5M rows need several GB of RAM for the row-dict stages.
+"""
+
+import argparse
+import sys
+
+from benchmarks.report import (
+    build_report,
+    compare_results,
+    load_report,
+    print_changes,
+    write_report,
+)
+from benchmarks.training.runner import add_scaling_exponents, measure_stage
+from benchmarks.training.stages import STAGES
+
+SUITE = "training"
+KEY_FIELDS = ("stage", "rows")
+COMPARED_METRICS = {
+    "wall_s": "lower",
+    "peak_rss_mb": "lower",
+    "alloc_peak_mb": "lower",
+}
+
+
+def _fmt(value, spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def _print_table(results: list[dict]) -> None:
+    print(
+        f"{'stage':<34} {'rows':>9} {'wall s':>9} {'rows/s':>11} {'peak MB':>9} "
+        f"{'+RSS MB':>9} {'alloc MB':>9} {'scaling':>8}",
+        file=sys.stderr,
+    )
+    for r in results:
+        if "error" in r:
+            print(f"{r['stage']:<34} {r['rows']:>9} FAILED: {r['error']}", file=sys.stderr)
+            continue
+        print(
+            f"{r['stage']:<34} {r['rows']:>9} {r['wall_s']:>9.3f} {r['rows_per_s']:>11.0f} "
+            f"{r['peak_rss_mb']:>9.0f} {_fmt(r['peak_rss_delta_mb'], '>9.0f')} "
+            f"{_fmt(r.get('alloc_peak_mb'), '>9.0f')} "
+            f"{_fmt(r['scaling_exponent'], '>8.2f')}",
+            file=sys.stderr,
+        )
+
+
+def _compare(baseline: dict, current: dict, threshold: float) -> int:
+    if baseline.get("suite") != SUITE:
+        raise SystemExit(f"baseline is a {baseline.get('suite')!r} report, not {SUITE!r}")
+    changes = compare_results(
+        baseline["results"], current["results"], KEY_FIELDS, COMPARED_METRICS, threshold
+    )
+    print_changes(changes)
+    return 1 if any(c.regression for c in changes) else 0
+
+
+def run(args: argparse.Namespace) -> int:
+    stages = args.stages or list(STAGES)
+    results = []
+    for rows in sorted(args.rows):
+        for stage in stages:
+            print(f"{stage} rows={rows}", file=sys.stderr)
+            results.append(
+                measure_stage(
+                    stage,
+                    rows,
+                    seed=args.seed,
+                    repeat=args.repeat,
+                    allocations=args.allocations,
+                    timeout=args.timeout,
+                )
+            )
+    add_scaling_exponents(results)
+
+    config = {
+        "rows": sorted(args.rows),
+        "stages": stages,
+        "repeat": args.repeat,
+        "allocations": args.allocations,
+        "seed": args.seed,
+    }
+    report = build_report(SUITE, config, results)
+    _print_table(results)
+    write_report(report, args.output)
+    if args.baseline:
+        return _compare(load_report(args.baseline), report, args.threshold)
+    return 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark the training data path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="Run the benchmarks")
+    run_p.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000])
+    run_p.add_argument("--stages", nargs="+", choices=sorted(STAGES))
+    run_p.add_argument("--repeat", type=int, default=1, help="Timed runs; the best is kept.")
+    run_p.add_argument(
+        "--no-allocations",
+        dest="allocations",
+        action="store_false",
+        help="Skip the tracemalloc run.",
+    )
+    run_p.add_argument("--seed", type=int, default=0)
+    run_p.add_argument("--timeout", type=float, help="Seconds per measurement run.")
+    run_p.add_argument("--output", help="Report path (default: stdout).")
+    run_p.add_argument("--baseline", help="Report to compare against; exit 1 on regression.")
+    run_p.add_argument("--threshold", type=float, default=0.10)
+
+    cmp_p = sub.add_parser("compare", help="Compare two saved reports")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--threshold", type=float, default=0.10)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.command == "compare":
+        return _compare(load_report(args.baseline), load_report(args.current), args.threshold)
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
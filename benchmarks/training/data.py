@@ -0,0 +1,77 @@
+from datetime import date
+from typing import Any
+
+import numpy as np
+
+from app.training.window import shift_months
+from benchmarks.synthetic import synthetic_columns
+
+# Share of rows that are a repeat sale of a property already in the window.
+REPEAT_SALE_SHARE = 0.08
+# Shares of rows that build_trainable_dataset drops, by reason.
+MISSING_BUILT_YEAR_SHARE = 0.02
+TOTAL_AREA_BELOW_BRA_SHARE = 0.01
+LEILIGHET_FLOOR_MISSING_SHARE = 0.01
+
+
+def window_start(as_of: date, months: int) -> date:
+    return shift_months(as_of.replace(day=1), -months)
+
+
+def turnover_dates(n: int, as_of: date, months: int = 12, seed: int = 0) -> np.ndarray:
+    """ISO dates ("2025-03-14", as in raw monthly snapshots) spread over the window."""
+    rng = np.random.default_rng(seed + 1)
+    start = np.datetime64(window_start(as_of, months))
+    days = int((np.datetime64(as_of.replace(day=1)) - start).astype(int))
+    return (start + rng.integers(0, days, n)).astype(str)
+
+
+def synthetic_raw_rows(
+    n: int, as_of: date, months: int = 12, seed: int = 0
+) -> list[dict[str, Any]]:
+    """
+    Rows shaped like app.training.fetch.build_rows output for a rolling window.
+
+    Includes repeat sales (same id, different turnover_date) for the dedupe step and a
+    few rows that fail build_trainable_dataset, at roughly production rates.
+    """
+    rng = np.random.default_rng(seed + 2)
+    columns = synthetic_columns(n, seed)
+
+    n_props = max(int(n * (1 - REPEAT_SALE_SHARE)), 1)
+    prop_idx = np.concatenate([np.arange(n_props), rng.integers(0, n_props, n - n_props)])
+    rng.shuffle(prop_idx)
+    ids = (10_000_000 + prop_idx).tolist()
+    dates = turnover_dates(n, as_of, months, seed).tolist()
+
+    no_built_year = (rng.random(n) < MISSING_BUILT_YEAR_SHARE).tolist()
+    area_below_bra = (rng.random(n) < TOTAL_AREA_BELOW_BRA_SHARE).tolist()
+    no_floor = (rng.random(n) < LEILIGHET_FLOOR_MISSING_SHARE).tolist()
+
+    cols = {name: values.tolist() for name, values in columns.items()}
+    rows = []
+    for i, (prop_id, turnover_date) in enumerate(zip(ids, dates, strict=True)):
+        floor, bedrooms, rooms = cols["floor"][i], cols["bedrooms"][i], cols["rooms"][i]
+        bra = cols["bra"][i]
+        municipality_number = cols["municipality_number"][i]
+        rows.append(
+            {
+                "id": prop_id,
+                "remote_id": prop_id,
+                "price": int(cols["price"][i]),
+                "turnover_date": turnover_date,
+                "cadastral_num": f"{municipality_number}-{prop_id % 500}/{i % 97}",
+                "realestate_type": cols["realestate_type"][i],
+                "municipality_number": municipality_number,
+                "lat": cols["lat"][i],
+                "lon": cols["lon"][i],
+                "built_year": None if no_built_year[i] else cols["built_year"][i],
+                "bra": bra,
+                "total_area": round(bra * 0.8, 1) if area_below_bra[i] else cols["total_area"][i],
+                # NaN (x != x) marks a missing optional field.
+                "floor": None if floor != floor or no_floor[i] else int(floor),
+                "bedrooms": None if bedrooms != bedrooms else int(bedrooms),
+                "rooms": None if rooms != rooms else int(rooms),
+            }
+        )
+    return rows
@@ -0,0 +1,100 @@
+"""
+Measures one stage in the current process; run once per measurement in a fresh
+interpreter (benchmarks.training starts them) so peak RSS is not inherited.
+
+    uv run python -m benchmarks.training.measure --stage compute_metrics --rows 100000
+
+Prints one JSON object. Without --allocations: wall time and RSS. With --allocations:
+tracemalloc peak and retained bytes; tracing slows Python code severalfold, which is
+why it is a separate run.
+"""
+
+import argparse
+import gc
+import json
+import re
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.training.stages import STAGES
+
+_MB = 1024 * 1024
+
+
+def _proc_status_kb(field: str) -> int | None:
+    try:
+        with open("/proc/self/status", encoding="ascii") as fh:
+            match = re.search(rf"^{field}:\s+(\d+) kB", fh.read(), re.MULTILINE)
+    except OSError:
+        return None
+    return int(match.group(1)) if match else None
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's RSS high-water mark (Linux); False where that is unsupported."""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as fh:
+            fh.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def _peak_rss_bytes() -> int:
+    hwm_kb = _proc_status_kb("VmHWM")
+    if hwm_kb is not None:
+        return hwm_kb * 1024
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def _rss_bytes() -> int:
+    rss_kb = _proc_status_kb("VmRSS")
+    return rss_kb * 1024 if rss_kb is not None else 0
+
+
+def measure(stage: str, rows: int, seed: int, allocations: bool) -> dict:
+    with tempfile.TemporaryDirectory(prefix="ree-bench-train-") as workdir:
+        call = STAGES[stage](rows, seed, Path(workdir))
+        gc.collect()
+
+        if allocations:
+            tracemalloc.start()
+            result = call()
+            retained, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del result
+            return {"alloc_peak_mb": peak / _MB, "alloc_retained_mb": retained / _MB}
+
+        rss_before = _rss_bytes()
+        peak_reset = _reset_peak_rss()
+        start = time.perf_counter()
+        result = call()
+        wall_s = time.perf_counter() - start
+        peak = _peak_rss_bytes()
+        del result
+        return {
+            "wall_s": wall_s,
+            "rss_before_mb": rss_before / _MB,
+            "peak_rss_mb": peak / _MB,
+            # Memory the stage itself added on top of its input; needs the peak reset.
+            "peak_rss_delta_mb": (peak - rss_before) / _MB if peak_reset else None,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure one training data-path stage")
+    parser.add_argument("--stage", required=True, choices=sorted(STAGES))
+    parser.add_argument("--rows", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--allocations", action="store_true")
+    args = parser.parse_args()
+    print(json.dumps(measure(args.stage, args.rows, args.seed, args.allocations)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import json
+import math
+import subprocess
+import sys
+
+
+def _measure(stage: str, rows: int, seed: int, allocations: bool, timeout: float | None):
+    cmd = [
+        sys.executable,
+        "-m",
+        "benchmarks.training.measure",
+        "--stage",
+        stage,
+        "--rows",
+        str(rows),
+        "--seed",
+        str(seed),
+    ]
+    if allocations:
+        cmd.append("--allocations")
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, check=False)
+    except subprocess.TimeoutExpired:
+        return None, f"timed out after {timeout:.0f}s"
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-1:] or [f"exit code {proc.returncode}"]
+        return None, tail[0]
+    return json.loads(proc.stdout.strip().splitlines()[-1]), None
+
+
+def measure_stage(
+    stage: str, rows: int, seed: int, repeat: int, allocations: bool, timeout: float | None
+) -> dict:
+    result: dict = {"stage": stage, "rows": rows}
+    runs = []
+    for _ in range(max(repeat, 1)):
+        run, error = _measure(stage, rows, seed, allocations=False, timeout=timeout)
+        if error:
+            result["error"] = error
+            return result
+        runs.append(run)
+
+    best = min(runs, key=lambda r: r["wall_s"])
+    deltas = [r["peak_rss_delta_mb"] for r in runs if r["peak_rss_delta_mb"] is not None]
+    result.update(
+        {
+            "wall_s": best["wall_s"],
+            "wall_s_runs": [r["wall_s"] for r in runs],
+            "rows_per_s": rows / best["wall_s"] if best["wall_s"] else 0.0,
+            "rss_before_mb": best["rss_before_mb"],
+            "peak_rss_mb": max(r["peak_rss_mb"] for r in runs),
+            "peak_rss_delta_mb": max(deltas) if deltas else None,
+        }
+    )
+    if allocations:
+        allocs, error = _measure(stage, rows, seed, allocations=True, timeout=timeout)
+        if error:
+            result["alloc_error"] = error
+        else:
+            result.update(allocs)
+    return result
+
+
+def add_scaling_exponents(results: list[dict]) -> None:
+    """log(time ratio) / log(rows ratio) against the stage's next smaller size."""
+    previous: dict[str, dict] = {}
+    for result in sorted(results, key=lambda r: (r["stage"], r["rows"])):
+        prev = previous.get(result["stage"])
+        result["scaling_exponent"] = None
+        if prev is not None and "wall_s" in prev and "wall_s" in result:
+            if prev["wall_s"] > 0 and result["rows"] > prev["rows"]:
+                result["scaling_exponent"] = math.log(
+                    result["wall_s"] / prev["wall_s"]
+                ) / math.log(result["rows"] / prev["rows"])
+        previous[result["stage"]] = result
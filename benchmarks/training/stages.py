@@ -0,0 +1,118 @@
+"""
+Training data-path stages as (setup, measured call) pairs.
+
+Each setup builds the stage's input for `rows` synthetic listings outside the
+measurement and returns the zero-argument call that is timed.
+"""
+
+from collections import defaultdict
+from collections.abc import Callable
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.training.dataset import build_trainable_dataset
+from app.training.metrics import compute_metrics
+from app.training.modeling import _metrics_by_group
+from app.training.rolling import (
+    _parse_turnover_date,
+    build_rolling_snapshot,
+    dedupe_latest_by_property_id,
+    month_ranges,
+)
+from app.training.snapshots import (
+    load_trainable_rows_from_parquet,
+    upload_parquet,
+    upload_raw_snapshot,
+)
+from benchmarks.storage import LocalStorage
+from benchmarks.synthetic import synthetic_columns
+from benchmarks.training.data import synthetic_raw_rows, turnover_dates
+
+AS_OF = date(2026, 1, 1)
+MONTHS = 12
+
+Setup = Callable[[int, int, Path], Callable[[], Any]]
+
+
+def _parse_turnover_dates(rows: int, seed: int, workdir: Path) -> Callable[[], Any]:
+    dates = turnover_dates(rows, AS_OF, MONTHS, seed).tolist()
+    return lambda: [_parse_turnover_date(d) for d in dates]
+
+
+def _dedupe(rows: int, seed: int, workdir: Path) -> Callable[[], Any]:
+    raw_rows = synthetic_raw_rows(rows, AS_OF, MONTHS, seed)
+    return lambda: dedupe_latest_by_property_id(raw_rows)
+
+
+def _rolling_snapshot(rows: int, seed: int, workdir: Path) -> Callable[[], Any]:
+    """Monthly JSONL snapshots in LocalStorage; measures read + dedupe + dataset + upload."""
+    storage = LocalStorage(workdir)
+    by_month: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for row in synthetic_raw_rows(rows, AS_OF, MONTHS, seed):
+        by_month[row["turnover_date"][:7]].append(row)
+    month_snapshots = [
+        upload_raw_snapshot(
+            storage=storage,
+            start_date=month.start.isoformat(),
+            end_date=month.end.isoformat(),
+            raw_rows=by_month.pop(month.start.isoformat()[:7], []),
+            manifest={},
+        )
+        for month in month_ranges(AS_OF, MONTHS)
+    ]
+    return lambda: build_rolling_snapshot(storage, month_snapshots, AS_OF, MONTHS)
+
+
+def _trainable_dataset(rows: int, seed: int, workdir: Path) -> Callable[[], Any]:
+    deduped = dedupe_latest_by_property_id(synthetic_raw_rows(rows, AS_OF, MONTHS, seed))
+    return lambda: build_trainable_dataset(deduped)
+
+
+def _load_parquet(rows: int, seed: int, workdir: Path) -> Callable[[], Any]:
+    storage = LocalStorage(workdir)
+    trainable = build_trainable_dataset(
+        dedupe_latest_by_property_id(synthetic_raw_rows(rows, AS_OF, MONTHS, seed))
+    ).trainable_rows
+    key = "snapshots/bench/dataset.parquet"
+    upload_parquet(storage, settings.s3_bucket_snapshots, key, trainable)
+    del trainable
+    return lambda: load_trainable_rows_from_parquet(storage, key)
+
+
+def _predictions(rows: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    y_true = np.round(rng.lognormal(15.2, 0.6, rows), -3)
+    return y_true, y_true * rng.lognormal(0.0, 0.15, rows)
+
+
+def _compute_metrics(rows: int, seed: int, workdir: Path) -> Callable[[], Any]:
+    y_true, y_pred = _predictions(rows, seed)
+    return lambda: compute_metrics(y_true, y_pred)
+
+
+def _metrics_by_realestate_type(rows: int, seed: int, workdir: Path) -> Callable[[], Any]:
+    y_true, y_pred = _predictions(rows, seed)
+    df = pd.DataFrame(
+        {
+            "realestate_type": synthetic_columns(rows, seed)["realestate_type"],
+            "y_true": y_true,
+            "y_pred": y_pred,
+        }
+    )
+    return lambda: _metrics_by_group(df, "realestate_type")
+
+
+STAGES: dict[str, Setup] = {
+    "parse_turnover_date": _parse_turnover_dates,
+    "dedupe_latest_by_property_id": _dedupe,
+    "build_rolling_snapshot": _rolling_snapshot,
+    "build_trainable_dataset": _trainable_dataset,
+    "load_trainable_rows_from_parquet": _load_parquet,
+    "compute_metrics": _compute_metrics,
+    "metrics_by_group": _metrics_by_realestate_type,
+}
@@ -0,0 +1,54 @@
+import argparse
+import json
+
+from app.config import settings
+from app.services.bulk_service import BulkJobPaths, job_status
+from app.storage.s3 import S3Storage
+from app.tasks.bulk import bulk_estimate
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Bulk estimation: score a Parquet file from the snapshots bucket "
+        "on the 'bulk' Celery queue, or check a job's status"
+    )
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument(
+        "--input-key",
+        help="Parquet key in the snapshots bucket (id + EstimationFeatures columns).",
+    )
+    group.add_argument(
+        "--status",
+        metavar="JOB_ID",
+        help="Print the progress (and summary, once finished) of a queued job.",
+    )
+    parser.add_argument(
+        "--row-groups-per-chunk",
+        type=int,
+        default=None,
+        help="Row groups scored per chunk task (default: REE_BULK_ESTIMATE_ROW_GROUPS_PER_CHUNK).",
+    )
+    return parser
+
+
+def main() -> None:
+    parser = _build_parser()
+    args = parser.parse_args()
+
+    if args.status:
+        paths = BulkJobPaths(prefix=f"{settings.bulk_estimate_output_prefix}/{args.status}")
+        status = job_status(S3Storage(), bucket=settings.s3_bucket_snapshots, paths=paths)
+        print(json.dumps(status, indent=2, ensure_ascii=False))
+        return
+
+    res = bulk_estimate.delay(
+        input_key=args.input_key,
+        row_groups_per_chunk=args.row_groups_per_chunk,
+    )
+    print("OK: bulk_estimate task queued")
+    print(f"- job_id: {res.id}")
+    print("- check progress with --status <job_id>")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Import-time report and budget for the API process.
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters, prints the
+slowest imports and fails when the import takes longer than the budget or pulls in a
+library that must stay lazy (loaded only by the code path that needs it).
+
+    uv run python -m scripts.check_import_time --budget-ms 1000
+"""
+
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass
+
+# Loaded on demand: by the predictor type, storage client or endpoint that needs them.
+DEFAULT_FORBIDDEN = ("pandas", "joblib", "catboost", "sklearn", "boto3", "botocore", "pyarrow")
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> list[ImportTiming]:
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # header line
+        stripped = name.lstrip()
+        timings.append(
+            ImportTiming(
+                module=stripped.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(name) - len(stripped) - 1) // 2,
+            )
+        )
+    return timings
+
+
+def measure(module: str) -> list[ImportTiming]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+
+def total_ms(timings: list[ImportTiming], module: str) -> float:
+    return next(t.cumulative_us for t in timings if t.module == module and t.depth == 0) / 1000
+
+
+def forbidden_imports(timings: list[ImportTiming], forbidden: tuple[str, ...]) -> list[str]:
+    found = {t.module.split(".", 1)[0] for t in timings}
+    return [name for name in forbidden if name in found]
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Check the API's import time against a budget")
+    parser.add_argument(
+        "--module", default="app.main", help="Module to import (default: app.main)."
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=1000.0,
+        help="Maximum cumulative import time in ms (best of --runs).",
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to measure.")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list.")
+    parser.add_argument(
+        "--forbid",
+        nargs="*",
+        default=list(DEFAULT_FORBIDDEN),
+        help="Top-level packages that must not be imported.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_parser().parse_args(argv)
+
+    runs = [measure(args.module) for _ in range(max(args.runs, 1))]
+    best = min(runs, key=lambda timings: total_ms(timings, args.module))
+    elapsed_ms = total_ms(best, args.module)
+
+    print(f"import {args.module}: {elapsed_ms:.0f} ms (best of {len(runs)})")
+    print(f"budget: {args.budget_ms:.0f} ms")
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for t in sorted(best, key=lambda t: t.cumulative_us, reverse=True)[: args.top]:
+        print(
+            f"{t.cumulative_us / 1000:>14.1f} {t.self_us / 1000:>8.1f}  {'  ' * t.depth}{t.module}"
+        )
+
+    failed = False
+    forbidden = forbidden_imports(best, tuple(args.forbid))
+    if forbidden:
+        print(f"FAIL: eagerly imported: {', '.join(forbidden)}")
+        failed = True
+    if elapsed_ms > args.budget_ms:
+        print(f"FAIL: import time {elapsed_ms:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
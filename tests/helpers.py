@@ -0,0 +1,93 @@
+"""Helpers shared across test modules."""
+
+from collections.abc import Iterator
+
+from app.ml.stub import StubPredictor
+from app.observability.prometheus import REGISTRY
+from app.schemas import EstimationFeatures
+from app.storage.s3 import S3Storage, S3StorageError
+
+
+def features(bra: float = 100.0, **kwargs) -> EstimationFeatures:
+    """A valid enebolig in Oslo; total_area defaults to bra + 10."""
+    data = {
+        "realestate_type": "enebolig",
+        "municipality_number": 301,
+        "lat": 59.91,
+        "lon": 10.75,
+        "built_year": 2000,
+        "total_area": bra + 10,
+        "bra": bra,
+    }
+    data.update(kwargs)
+    return EstimationFeatures(**data)
+
+
+def sample(name: str, **labels) -> float:
+    """Current value of a sample in the app's Prometheus registry (0.0 when absent)."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class CountingPredictor(StubPredictor):
+    """StubPredictor that records the size of every predict_batch call."""
+
+    def __init__(self, model_version: str = "stub-v1"):
+        super().__init__(
+            model_version=model_version, usable_area_coef=50_000, total_area_coef=5_000
+        )
+        self.batches: list[int] = []
+
+    def predict_batch(self, features):
+        self.batches.append(len(features))
+        return super().predict_batch(features)
+
+
+class MemoryStorage(S3Storage):
+    """
+    S3Storage over a dict of key -> bytes (buckets are ignored).
+
+    Only the object-level calls are replaced; JSON helpers are S3Storage's own, and any
+    S3Storage method not overridden here fails loudly instead of silently drifting.
+    """
+
+    def __init__(self):
+        # No boto3 client.
+        self.objects: dict[str, bytes] = {}
+        self.range_reads = 0
+
+    def _get(self, bucket: str, key: str) -> bytes:
+        try:
+            return self.objects[key]
+        except KeyError:
+            raise S3StorageError(f"Failed to get s3://{bucket}/{key}") from None
+
+    def exists(self, bucket: str, key: str) -> bool:
+        return key in self.objects
+
+    def get_etag(self, bucket: str, key: str) -> str:
+        return f"etag-{hash(self._get(bucket, key)) & 0xFFFFFFFF:08x}"
+
+    def get_size(self, bucket: str, key: str) -> int:
+        return len(self._get(bucket, key))
+
+    def get_range(self, bucket: str, key: str, start: int, length: int) -> bytes:
+        self.range_reads += 1
+        if length <= 0:
+            return b""
+        return self._get(bucket, key)[start : start + length]
+
+    def get_bytes(self, bucket: str, key: str) -> bytes:
+        return self._get(bucket, key)
+
+    def put_bytes(
+        self, bucket: str, key: str, data: bytes, content_type: str | None = None
+    ) -> None:
+        self.objects[key] = bytes(data)
+
+    def iter_lines(self, bucket: str, key: str) -> Iterator[str]:
+        for line in self._get(bucket, key).splitlines():
+            if line:
+                yield line.decode("utf-8")
+
+    def delete(self, bucket: str, key: str) -> None:
+        self.objects.pop(key, None)
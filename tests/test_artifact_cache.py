@@ -0,0 +1,53 @@
+import os
+from unittest.mock import Mock, patch
+
+from app.ml.artifact_cache import ArtifactCache
+from app.ml.registry import ModelRegistry
+from app.storage.s3 import S3Storage
+
+
+def test_cache_roundtrip_is_keyed_by_version_and_etag(tmp_path):
+    cache = ArtifactCache(tmp_path, max_bytes=1024)
+
+    assert cache.get("v1", "model.pkl", "etag-a") is None
+    cache.put("v1", "model.pkl", "etag-a", b"model-bytes")
+
+    assert cache.get("v1", "model.pkl", "etag-a") == b"model-bytes"
+    assert cache.get("v1", "model.pkl", "etag-b") is None
+    assert cache.get("v2", "model.pkl", "etag-a") is None
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ArtifactCache(tmp_path, max_bytes=25)
+    cache.put("v1", "model.pkl", "e1", b"x" * 10)
+    cache.put("v2", "model.pkl", "e2", b"x" * 10)
+    os.utime(cache.path_for("v1", "model.pkl", "e1"), (1, 1))
+    os.utime(cache.path_for("v2", "model.pkl", "e2"), (2, 2))
+
+    cache.put("v3", "model.pkl", "e3", b"x" * 10)
+
+    assert cache.get("v1", "model.pkl", "e1") is None
+    assert cache.get("v2", "model.pkl", "e2") is not None
+    assert cache.get("v3", "model.pkl", "e3") is not None
+    assert not (tmp_path / "v1").exists()
+
+
+def test_registry_loads_artifact_from_disk_cache(tmp_path):
+    storage = Mock(spec=S3Storage)
+    storage.get_json.side_effect = lambda bucket, key: (
+        {"model_version": "v2", "type": "sklearn", "artifact_key": "models/v2/model.pkl"}
+        if key == "latest.json"
+        else {"prediction_transform": "expm1"}
+    )
+    storage.get_etag.return_value = "etag-1"
+    storage.get_bytes.return_value = b"fake-joblib-data"
+    cache = ArtifactCache(tmp_path, max_bytes=1024)
+
+    # The mock model cannot predict, so skip the warm-up.
+    with patch("joblib.load", return_value="mock-model"), patch("app.ml.registry.warm_up"):
+        ModelRegistry(storage, artifact_cache=cache).get_predictor()
+        ModelRegistry(storage, artifact_cache=cache).get_predictor()
+
+    storage.get_bytes.assert_called_once()
+    assert cache.get("v2", "model.pkl", "etag-1") == b"fake-joblib-data"
@@ -0,0 +1,119 @@
+import json
+from datetime import date
+
+import pytest
+
+from app.schemas import EstimationFeatures
+from app.storage.s3 import S3StorageError
+from app.training.dataset import build_trainable_dataset
+from app.training.rolling import dedupe_latest_by_property_id
+from benchmarks.api.load import build_bodies, percentile
+from benchmarks.report import compare_results
+from benchmarks.storage import LocalStorage
+from benchmarks.training.data import synthetic_raw_rows
+from benchmarks.training.measure import measure
+from benchmarks.training.runner import add_scaling_exponents
+
+METRICS = {"p95_ms": "lower", "throughput_rps": "higher", "error_rate": "lower"}
+
+
+def _result(batch_size, p95_ms, throughput_rps, error_rate=0.0):
+    return {
+        "batch_size": batch_size,
+        "concurrency": 4,
+        "p95_ms": p95_ms,
+        "throughput_rps": throughput_rps,
+        "error_rate": error_rate,
+    }
+
+
+def test_compare_flags_regressions_in_the_wrong_direction_only():
+    baseline = [_result(1, 10.0, 100.0), _result(100, 50.0, 20.0)]
+    current = [_result(1, 12.0, 120.0), _result(100, 40.0, 15.0)]
+
+    changes = compare_results(
+        baseline, current, ("batch_size", "concurrency"), METRICS, threshold=0.10
+    )
+    regressions = {(c.key["batch_size"], c.metric) for c in changes if c.regression}
+
+    assert regressions == {(1, "p95_ms"), (100, "throughput_rps")}
+
+
+def test_compare_treats_any_increase_from_zero_as_regression_and_skips_unmatched():
+    baseline = [_result(1, 10.0, 100.0)]
+    current = [_result(1, 10.0, 100.0, error_rate=0.01), _result(10, 1.0, 1.0)]
+
+    changes = compare_results(baseline, current, ("batch_size",), METRICS, threshold=0.10)
+
+    assert [(c.metric, c.regression) for c in changes] == [
+        ("p95_ms", False),
+        ("throughput_rps", False),
+        ("error_rate", True),
+    ]
+
+
+def test_percentile_is_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 50) == 0.0
+
+
+def test_build_bodies_are_valid_distinct_estimate_requests():
+    bodies = build_bodies(batch_size=50, count=3)
+
+    assert len(set(bodies)) == 3
+    for body in bodies:
+        payload = json.loads(body)
+        assert list(payload) == [str(i) for i in range(1, 51)]
+        for item in payload.values():
+            EstimationFeatures.model_validate(item)
+
+
+def test_local_storage_round_trip_and_missing_keys(tmp_path):
+    storage = LocalStorage(tmp_path)
+    storage.put_json("models", "latest.json", {"model_version": "v1"})
+    storage.put_bytes("models", "models/v1/model.cbm", b"0123456789")
+
+    assert storage.get_json("models", "latest.json") == {"model_version": "v1"}
+    assert storage.exists("models", "models/v1/model.cbm")
+    assert storage.get_size("models", "models/v1/model.cbm") == 10
+    assert storage.get_range("models", "models/v1/model.cbm", 8, 5) == b"89"
+    assert not storage.exists("models", "missing.json")
+    with pytest.raises(S3StorageError):
+        storage.get_json("models", "missing.json")
+
+
+def test_synthetic_raw_rows_have_repeat_sales_and_dropped_rows():
+    rows = synthetic_raw_rows(5_000, as_of=date(2026, 1, 1))
+
+    deduped = dedupe_latest_by_property_id(rows)
+    dataset = build_trainable_dataset(deduped)
+
+    assert len(rows) > len(deduped) > len(dataset.trainable_rows) > 0.85 * len(rows)
+    assert min(r["turnover_date"] for r in rows) >= "2025-01-01"
+    assert max(r["turnover_date"] for r in rows) <= "2025-12-31"
+
+
+def test_training_stage_measurement_reports_wall_time_and_memory():
+    timed = measure("compute_metrics", rows=1_000, seed=0, allocations=False)
+    allocs = measure("compute_metrics", rows=1_000, seed=0, allocations=True)
+
+    assert timed["wall_s"] > 0
+    assert timed["peak_rss_mb"] > 0
+    assert allocs["alloc_peak_mb"] > 0
+
+
+def test_scaling_exponent_is_relative_to_the_previous_size_of_the_same_stage():
+    results = [
+        {"stage": "a", "rows": 1_000, "wall_s": 1.0},
+        {"stage": "a", "rows": 10_000, "wall_s": 100.0},
+        {"stage": "b", "rows": 1_000, "wall_s": 1.0},
+        {"stage": "b", "rows": 10_000, "error": "killed"},
+    ]
+
+    add_scaling_exponents(results)
+
+    assert [r["scaling_exponent"] for r in results] == [None, pytest.approx(2.0), None, None]
@@ -0,0 +1,219 @@
+import io
+import time
+from unittest.mock import Mock
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from celery.exceptions import Retry
+
+from app.ml.registry import ModelRef
+from app.ml.stub import StubPredictor
+from app.services.bulk_service import (
+    BulkJobPaths,
+    job_status,
+    plan_chunks,
+    score_chunk,
+    summarize_job,
+)
+from app.storage.s3 import S3ObjectReader
+from app.tasks import bulk as bulk_tasks
+from tests.helpers import MemoryStorage
+
+BUCKET = "ree-snapshots"
+STUB = StubPredictor(model_version="stub-v1", usable_area_coef=50_000, total_area_coef=5_000)
+
+
+def _portfolio(n: int, bad_row: int | None = None) -> pa.Table:
+    bra = [50.0 + i for i in range(n)]
+    if bad_row is not None:
+        bra[bad_row] = -1.0
+    return pa.table(
+        {
+            "id": [f"p{i}" for i in range(n)],
+            "realestate_type": ["enebolig"] * n,
+            "municipality_number": [301] * n,
+            "lat": [59.9] * n,
+            "lon": [10.7] * n,
+            "built_year": [2000] * n,
+            "total_area": [200.0] * n,
+            "bra": bra,
+            "bedrooms": [2] * n,
+            "rooms": [None] * n,
+        }
+    )
+
+
+def _put_parquet(storage: MemoryStorage, key: str, table: pa.Table, row_group_size: int):
+    buf = io.BytesIO()
+    pq.write_table(table, buf, row_group_size=row_group_size)
+    storage.objects[key] = buf.getvalue()
+
+
+def test_s3_object_reader_seeks_and_reads_ranges():
+    storage = MemoryStorage()
+    storage.objects["k"] = bytes(range(100))
+    reader = io.BufferedReader(S3ObjectReader(storage, BUCKET, "k"), buffer_size=16)
+
+    reader.seek(-10, io.SEEK_END)
+    assert reader.read() == bytes(range(90, 100))
+    reader.seek(5)
+    assert reader.read(3) == bytes([5, 6, 7])
+
+
+def test_plan_chunks_groups_row_groups():
+    storage = MemoryStorage()
+    _put_parquet(storage, "in.parquet", _portfolio(50), row_group_size=10)
+
+    assert plan_chunks(storage, BUCKET, "in.parquet", row_groups_per_chunk=2) == [
+        [0, 1],
+        [2, 3],
+        [4],
+    ]
+
+
+def test_score_chunk_writes_result_part():
+    storage = MemoryStorage()
+    _put_parquet(storage, "in.parquet", _portfolio(30), row_group_size=10)
+
+    result = score_chunk(storage, BUCKET, "in.parquet", [1], STUB, "out/part-00001.parquet")
+
+    assert result == {
+        "row_groups": [1],
+        "rows": 10,
+        "status": "scored",
+        "output_key": "out/part-00001.parquet",
+    }
+    part = pq.read_table(io.BytesIO(storage.objects["out/part-00001.parquet"])).to_pylist()
+    assert [r["id"] for r in part] == [f"p{i}" for i in range(10, 20)]
+    assert part[0]["estimated_price"] == int(60 * 50_000 + 200 * 5_000)
+    assert part[0]["model_version"] == "stub-v1"
+    assert part[0]["warnings"] == ["rooms_missing"]
+
+
+def test_invalid_chunk_is_reported_not_written():
+    storage = MemoryStorage()
+    _put_parquet(storage, "in.parquet", _portfolio(20, bad_row=15), row_group_size=10)
+
+    ok = score_chunk(storage, BUCKET, "in.parquet", [0], STUB, "out/part-00000.parquet")
+    bad = score_chunk(storage, BUCKET, "in.parquet", [1], STUB, "out/part-00001.parquet")
+
+    assert bad["status"] == "invalid"
+    assert bad["errors"][0]["ids"] == ["p15"]
+    assert "out/part-00001.parquet" not in storage.objects
+
+    summary = summarize_job({"job_id": "j"}, [ok, bad])
+    assert summary["status"] == "completed_with_errors"
+    assert (summary["rows_scored"], summary["rows_invalid"]) == (10, 10)
+    assert summary["parts"] == ["out/part-00000.parquet"]
+
+
+def _job(chunks: int, started_at: float | None = None) -> dict:
+    return {
+        "job_id": "job-1",
+        "input_key": "in.parquet",
+        "output_prefix": "bulk/job-1",
+        "model_ref": {
+            "model_version": "stub-v1",
+            "model_type": "stub",
+            "artifact_key": "models/stub-v1/model.json",
+            "native_artifact_key": "",
+        },
+        "chunks": chunks,
+        "started_at": time.time() if started_at is None else started_at,
+    }
+
+
+def test_chunk_task_scores_with_pinned_model(monkeypatch):
+    storage = MemoryStorage()
+    _put_parquet(storage, "in.parquet", _portfolio(10), row_group_size=10)
+    monkeypatch.setattr(bulk_tasks, "S3Storage", lambda: storage)
+    monkeypatch.setattr(bulk_tasks, "_predictor_cache", {"stub-v1": STUB})
+    job = _job(chunks=1)
+
+    chunk = bulk_tasks.bulk_estimate_chunk(job, chunk_index=0, row_groups=[0])
+    summary = bulk_tasks.bulk_estimate_finalize(job)
+
+    paths = BulkJobPaths("bulk/job-1")
+    assert chunk["output_key"] == paths.part_key(0)
+    assert storage.get_json(BUCKET, paths.chunk_result_key(0)) == chunk
+    assert summary["status"] == "completed"
+    assert storage.get_json(BUCKET, "bulk/job-1/manifest.json") == summary
+
+
+def test_finalize_waits_for_pending_chunks_then_gives_up(monkeypatch):
+    storage = MemoryStorage()
+    _put_parquet(storage, "in.parquet", _portfolio(20), row_group_size=10)
+    monkeypatch.setattr(bulk_tasks, "S3Storage", lambda: storage)
+    monkeypatch.setattr(bulk_tasks, "_predictor_cache", {"stub-v1": STUB})
+    job = _job(chunks=2)
+    storage.put_json(BUCKET, BulkJobPaths("bulk/job-1").job_key, job)
+    bulk_tasks.bulk_estimate_chunk(job, chunk_index=0, row_groups=[0])
+
+    with pytest.raises(Retry):
+        bulk_tasks.bulk_estimate_finalize(job)
+    assert job_status(storage, BUCKET, BulkJobPaths("bulk/job-1"))["chunks_missing"] == [1]
+
+    expired = {
+        **job,
+        "started_at": time.time() - bulk_tasks.settings.bulk_estimate_timeout_seconds,
+    }
+    summary = bulk_tasks.bulk_estimate_finalize(expired)
+
+    assert summary["status"] == "incomplete"
+    assert summary["chunks_missing"] == [1]
+    assert summary["rows_scored"] == 10
+    assert job_status(storage, BUCKET, BulkJobPaths("bulk/job-1")) == summary
+
+
+def test_finalize_only_checks_chunks_pending_at_the_previous_poll(monkeypatch):
+    storage = MemoryStorage()
+    monkeypatch.setattr(bulk_tasks, "S3Storage", lambda: storage)
+    retry = Mock(return_value=Retry())
+    monkeypatch.setattr(bulk_tasks.bulk_estimate_finalize, "retry", retry)
+    paths = BulkJobPaths("bulk/job-1")
+    job = _job(chunks=3)
+    storage.put_json(BUCKET, paths.chunk_result_key(0), {"chunk_index": 0})
+    probed = []
+    exists = storage.exists
+    monkeypatch.setattr(
+        storage, "exists", lambda bucket, key: probed.append(key) or exists(bucket, key)
+    )
+
+    with pytest.raises(Retry):
+        bulk_tasks.bulk_estimate_finalize(job)
+    assert retry.call_args.kwargs["kwargs"] == {"pending": [1, 2]}
+
+    probed.clear()
+    with pytest.raises(Retry):
+        bulk_tasks.bulk_estimate_finalize(job, pending=[1, 2])
+    assert probed == [paths.chunk_result_key(1), paths.chunk_result_key(2)]
+
+
+def test_bulk_estimate_queues_chunks_and_finalize_without_a_chord(monkeypatch):
+    storage = MemoryStorage()
+    _put_parquet(storage, "in.parquet", _portfolio(30), row_group_size=10)
+    monkeypatch.setattr(bulk_tasks, "S3Storage", lambda: storage)
+    registry = Mock()
+    registry.latest_ref.return_value = ModelRef(
+        model_version="stub-v1", model_type="stub", artifact_key="models/stub-v1/model.json"
+    )
+    monkeypatch.setattr(bulk_tasks, "create_registry", lambda *a, **kw: registry)
+    group = Mock()
+    monkeypatch.setattr(bulk_tasks, "group", group)
+    finalize = Mock()
+    monkeypatch.setattr(bulk_tasks.bulk_estimate_finalize, "apply_async", finalize)
+
+    job = bulk_tasks.bulk_estimate.run("in.parquet", row_groups_per_chunk=2)
+
+    assert job["chunks"] == 2
+    assert storage.get_json(BUCKET, BulkJobPaths(job["output_prefix"]).job_key) == job
+    assert len(list(group.call_args.args[0])) == 2
+    group.return_value.apply_async.assert_called_once_with()
+    finalize.assert_called_once()
+    assert finalize.call_args.kwargs["args"] == (job,)
+
+
+def test_bulk_estimate_is_not_auto_retried_after_fanning_out():
+    assert bulk_tasks.bulk_estimate.autoretry_for == ()
+    assert bulk_tasks.bulk_estimate_chunk.autoretry_for == (Exception,)
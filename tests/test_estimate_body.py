@@ -0,0 +1,77 @@
+import json
+
+import pytest
+from fastapi import Body, FastAPI
+from fastapi.testclient import TestClient
+
+from app.schemas import EstimateRequest
+
+HOUSE = {
+    "realestate_type": "enebolig",
+    "municipality_number": 4003,
+    "lat": 59.21,
+    "lon": 9.58,
+    "built_year": 2016,
+    "total_area": 200.0,
+    "bra": 150.0,
+}
+
+JSON = {"Content-Type": "application/json"}
+
+INVALID_BODIES = {
+    "missing_fields": (json.dumps({"ok": HOUSE, "bad": {"realestate_type": "enebolig"}}), JSON),
+    "rule_total_area": (json.dumps({"ok": HOUSE, "bad": {**HOUSE, "bra": 300.0}}), JSON),
+    "rule_floor": (json.dumps({"bad": {**HOUSE, "realestate_type": "leilighet"}}), JSON),
+    "wrong_types": (json.dumps({"bad": {**HOUSE, "lat": "north", "floor": 1.5}}), JSON),
+    "unknown_type": (json.dumps({"bad": {**HOUSE, "realestate_type": "slott"}}), JSON),
+    "not_an_object": (json.dumps([HOUSE]), JSON),
+    "item_not_an_object": (json.dumps({"bad": 1}), JSON),
+    "invalid_json": ('{"bad": {', JSON),
+    "empty_body": ("", JSON),
+    "no_content_type": (json.dumps({"ok": HOUSE}), {}),
+    "text_content_type": (json.dumps({"ok": HOUSE}), {"Content-Type": "text/plain"}),
+}
+
+
+@pytest.fixture(scope="module")
+def reference_client():
+    """The pre-fast-path contract: a plain Body() parameter validated by FastAPI."""
+    api = FastAPI()
+
+    @api.post("/estimate")
+    def estimate(payload: EstimateRequest = Body(...)) -> dict:
+        return {}
+
+    return TestClient(api)
+
+
+@pytest.mark.parametrize("case", sorted(INVALID_BODIES))
+def test_invalid_bodies_keep_fastapi_422(client, reference_client, case):
+    body, headers = INVALID_BODIES[case]
+
+    expected = reference_client.post("/estimate", content=body, headers=headers)
+    resp = client.post("/estimate", content=body, headers=headers)
+
+    assert expected.status_code == 422
+    assert resp.status_code == 422
+    assert resp.json() == expected.json()
+
+
+def test_valid_body_with_charset_uses_fast_path(client):
+    resp = client.post(
+        "/estimate",
+        content=json.dumps({"1": {**HOUSE, "extra_field": "ignored"}}),
+        headers={"Content-Type": "application/json; charset=utf-8"},
+    )
+
+    assert resp.status_code == 200
+    assert resp.json()["1"]["estimated_price"] == int(150 * 50_000 + 200 * 5_000)
+
+
+def test_estimate_openapi_documents_request_body(client):
+    request_body = client.get("/openapi.json").json()["paths"]["/estimate"]["post"]["requestBody"]
+
+    content = request_body["content"]["application/json"]
+    assert "valid_batch" in content["examples"]
+    features = content["schema"]["additionalProperties"]
+    assert "realestate_type" in features["required"]
@@ -0,0 +1,142 @@
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from app.ml.features import FeatureEncoder
+from app.schemas import EstimationFeatures
+from app.services.columnar_media import (
+    ARROW_STREAM_MEDIA_TYPE,
+    PARQUET_MEDIA_TYPE,
+    ColumnarValidationError,
+)
+from app.services.columnar_service import read_table, validate_table, write_table
+
+ROWS = [
+    {
+        "id": "486002054",
+        "realestate_type": "enebolig",
+        "municipality_number": 4003,
+        "lat": 59.21,
+        "lon": 9.58,
+        "built_year": 2016,
+        "total_area": 472.8,
+        "bra": 167.0,
+        "floor": None,
+        "bedrooms": 2,
+        "rooms": 4,
+    },
+    {
+        "id": "123456789",
+        "realestate_type": "leilighet",
+        "municipality_number": 301,
+        "lat": 59.91,
+        "lon": 10.75,
+        "built_year": 1998,
+        "total_area": 68.0,
+        "bra": 62.0,
+        "floor": 3,
+        "bedrooms": None,
+        "rooms": None,
+    },
+]
+
+
+def _table(rows=ROWS, **overrides) -> pa.Table:
+    table = pa.Table.from_pylist(rows)
+    for name, values in overrides.items():
+        column = pa.array(values)
+        if name in table.column_names:
+            table = table.set_column(table.column_names.index(name), name, column)
+        else:
+            table = table.append_column(name, column)
+    return table
+
+
+def _post(client, table: pa.Table, media_type: str = ARROW_STREAM_MEDIA_TYPE):
+    return client.post(
+        "/estimate/columnar",
+        content=write_table(table, media_type),
+        headers={"Content-Type": media_type},
+    )
+
+
+@pytest.mark.parametrize("media_type", [ARROW_STREAM_MEDIA_TYPE, PARQUET_MEDIA_TYPE])
+def test_columnar_matches_json_estimate(client, media_type):
+    json_payload = {
+        r["id"]: {k: v for k, v in r.items() if k != "id" and v is not None} for r in ROWS
+    }
+    expected = client.post("/estimate", json=json_payload).json()
+
+    resp = _post(client, _table(), media_type)
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == media_type
+    result = read_table(resp.content, media_type).to_pylist()
+    for estimate in expected.values():
+        assert estimate.pop("currency") == "NOK"
+    assert result == [{"id": pid, **estimate} for pid, estimate in expected.items()]
+
+
+def test_columnar_reports_vectorized_validation_errors(client):
+    table = _table(bra=[500.0, -1.0], realestate_type=["enebolig", "slott"])
+
+    resp = _post(client, table)
+
+    assert resp.status_code == 422
+    errors = {(tuple(e["loc"]), e["type"]): e for e in resp.json()["detail"]}
+    assert errors[("body", "bra"), "greater_than"]["ids"] == ["123456789"]
+    assert errors[("body", "realestate_type"), "enum"]["count"] == 1
+
+
+def test_columnar_checks_cross_field_rules(client):
+    table = _table(bra=[500.0, 62.0], floor=[None, None])
+
+    resp = _post(client, table)
+
+    assert resp.status_code == 422
+    assert {(tuple(e["loc"]), e["ids"][0]) for e in resp.json()["detail"]} == {
+        (("body", "total_area"), "486002054"),
+        (("body", "floor"), "123456789"),
+    }
+
+
+def test_columnar_requires_columns_and_integral_values():
+    table = _table(built_year=[2016.5, 1998.0]).drop_columns(["lat"])
+
+    with pytest.raises(ColumnarValidationError) as exc_info:
+        validate_table(table)
+
+    errors = {(e["loc"][1], e["type"]) for e in exc_info.value.errors}
+    assert errors == {("lat", "missing")}
+
+    with pytest.raises(ColumnarValidationError) as exc_info:
+        validate_table(_table(built_year=[2016.5, 1998.0]))
+    assert [(e["loc"][1], e["type"]) for e in exc_info.value.errors] == [
+        ("built_year", "int_from_float")
+    ]
+
+
+def test_columnar_rejects_other_content_types(client):
+    resp = client.post("/estimate/columnar", content=b"{}", headers={"Content-Type": "text/csv"})
+    assert resp.status_code == 415
+
+    resp = client.post(
+        "/estimate/columnar", content=b"garbage", headers={"Content-Type": PARQUET_MEDIA_TYPE}
+    )
+    assert resp.status_code == 422
+    assert resp.json()["detail"][0]["type"] == "columnar_invalid"
+
+
+def test_encode_columns_matches_encode():
+    encoder = FeatureEncoder.from_schema(None)
+    features = [
+        EstimationFeatures(**{k: v for k, v in r.items() if k != "id" and v is not None})
+        for r in ROWS
+    ]
+    _, columns = validate_table(_table())
+
+    from_rows = encoder.encode(features)
+    from_columns = encoder.encode_columns(columns)
+
+    assert from_columns.categorical.tolist() == from_rows.categorical.tolist()
+    np.testing.assert_array_equal(from_columns.numeric, from_rows.numeric)
@@ -0,0 +1,60 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.ml.stub import StubPredictor
+from app.schemas import EstimateRequest, EstimateResponse, EstimationFeatures
+from app.services.estimate_service import build_result, estimate_batch_json
+
+STUB = StubPredictor(model_version="stub-v1", usable_area_coef=50_000, total_area_coef=5_000)
+
+BASE = {
+    "realestate_type": "enebolig",
+    "municipality_number": 301,
+    "lat": 59.91,
+    "lon": 10.75,
+    "built_year": 2000,
+    "total_area": 472.8,
+    "bra": 167,
+}
+
+PAYLOAD = {
+    "486002054": {**BASE, "bedrooms": 2, "rooms": 4},
+    "no-bedrooms": {**BASE, "rooms": 4},
+    "no-rooms": {**BASE, "bedrooms": 2},
+    'quoted "id" \\ æøå ✓': {**BASE},
+    "leilighet": {**BASE, "realestate_type": "leilighet", "floor": 3, "bra": 1, "total_area": 1},
+}
+
+
+def _reference_client() -> TestClient:
+    """The pre-fast-path route: EstimateResult models + FastAPI response_model encoding."""
+    api = FastAPI()
+
+    @api.post("/estimate", response_model=EstimateResponse)
+    def estimate(payload: EstimateRequest) -> EstimateResponse:
+        prices = STUB.predict_batch(list(payload.values()))
+        return {
+            property_id: build_result(f, estimated, STUB.model_version)
+            for (property_id, f), estimated in zip(payload.items(), prices.tolist())
+        }
+
+    return TestClient(api)
+
+
+def test_fast_json_matches_response_model_bytes():
+    features = {k: EstimationFeatures(**v) for k, v in PAYLOAD.items()}
+
+    reference = _reference_client().post("/estimate", json=PAYLOAD)
+
+    assert reference.status_code == 200
+    assert estimate_batch_json(features, STUB)[0] == reference.content
+
+
+def test_estimate_route_matches_response_model_bytes(client):
+    reference = _reference_client().post("/estimate", json=PAYLOAD)
+
+    resp = client.post("/estimate", json=PAYLOAD)
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == reference.headers["content-type"]
+    assert resp.content == reference.content
@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+from app.api.ndjson import iter_ndjson_chunks
+
+HOUSE = {
+    "realestate_type": "enebolig",
+    "municipality_number": 4003,
+    "lat": 59.21,
+    "lon": 9.58,
+    "built_year": 2016,
+    "total_area": 472.8,
+    "bra": 167,
+    "bedrooms": 2,
+    "rooms": 4,
+}
+
+
+def _ndjson(*objs) -> bytes:
+    return b"".join(json.dumps(o).encode() + b"\n" for o in objs)
+
+
+def _collect(parts: list[bytes], chunk_size: int = 2, max_line_bytes: int = 1024):
+    async def stream():
+        for part in parts:
+            yield part
+
+    async def run():
+        return [c async for c in iter_ndjson_chunks(stream(), chunk_size, max_line_bytes)]
+
+    return asyncio.run(run())
+
+
+def test_iter_ndjson_chunks_handles_split_lines_and_blank_lines():
+    chunks = _collect([b'{"a":', b"1}\n\n", b'{"b":2}\n{"c"', b":3}"])
+
+    assert chunks == [[(1, b'{"a":1}'), (3, b'{"b":2}')], [(4, b'{"c":3}')]]
+
+
+def test_iter_ndjson_chunks_flags_oversized_lines():
+    chunks = _collect([b"x" * 10, b"x" * 10 + b"\n", b'{"ok":1}\n'], max_line_bytes=15)
+
+    assert chunks == [[(1, None), (2, b'{"ok":1}')]]
+
+
+def test_estimate_stream_scores_lines_in_order(client):
+    body = _ndjson({"id": "a", **HOUSE}, {"id": 2, **HOUSE, "bedrooms": None})
+
+    resp = client.post(
+        "/estimate/stream", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["id"] for r in records] == ["a", "2"]
+    assert records[0]["estimated_price"] == int(167 * 50_000 + 472.8 * 5_000)
+    assert records[0]["model_version"] == "stub-v1"
+    assert records[1]["warnings"] == ["bedrooms_missing"]
+
+
+def test_estimate_stream_reports_line_errors_inline(client):
+    body = (
+        _ndjson({"id": "ok", **HOUSE})
+        + b"not json\n"
+        + _ndjson(HOUSE, {"id": "bad", **HOUSE, "bra": 1000}, {"id": "ok2", **HOUSE})
+    )
+
+    resp = client.post("/estimate/stream", content=body)
+
+    records = [json.loads(line) for line in resp.text.splitlines()]
+    assert resp.status_code == 200
+    assert [r.get("error") for r in records] == [
+        None,
+        "invalid_json",
+        "missing_id",
+        "validation_error",
+        None,
+    ]
+    assert [r["line"] for r in records if "error" in r] == [2, 3, 4]
+    assert records[3]["id"] == "bad"
+    assert "total_area must be >= bra" in records[3]["detail"][0]["msg"]
+    assert records[4]["id"] == "ok2"
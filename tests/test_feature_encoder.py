@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from catboost import CatBoostRegressor, Pool
+
+from app.ml.features import DEFAULT_CATEGORICAL_COLS, DEFAULT_NUMERIC_COLS, FeatureEncoder
+from app.ml.sklearn_predictor import SklearnPredictor
+from tests.helpers import features
+
+
+def test_encoder_writes_columnar_arrays():
+    encoder = FeatureEncoder.from_schema(
+        {"categorical": DEFAULT_CATEGORICAL_COLS, "numeric": DEFAULT_NUMERIC_COLS}
+    )
+    encoded = encoder.encode(
+        [
+            features(bedrooms=3, total_area=120.0),
+            features(realestate_type="leilighet", floor=4, bra=60.0, total_area=120.0),
+        ]
+    )
+
+    assert encoded.categorical.tolist() == [["enebolig", "301"], ["leilighet", "301"]]
+    assert encoded.numeric.dtype == np.float32
+    num = dict(zip(encoded.numeric_names, encoded.numeric.T))
+    assert num["building_age"].tolist() == [encoder.current_year() - 2000] * 2
+    assert num["area_ratio"] == pytest.approx([100 / 120, 60 / 120])
+    assert np.isnan(num["floor"][0]) and num["floor"][1] == 4
+    assert num["bedrooms"][0] == 3 and np.isnan(num["bedrooms"][1])
+
+
+def test_encoder_rejects_unknown_schema_columns():
+    with pytest.raises(ValueError, match="Unsupported feature columns"):
+        FeatureEncoder.from_schema({"categorical": ["realestate_type"], "numeric": ["garage"]})
+
+
+def test_catboost_prediction_matches_dataframe_path():
+    rng = np.random.default_rng(0)
+    rows = [
+        features(
+            realestate_type=str(rng.choice(["enebolig", "rekkehus", "hytte"])),
+            municipality_number=int(rng.choice([301, 4003])),
+            bra=float(rng.uniform(40, 200)),
+            total_area=250.0,
+            built_year=int(rng.integers(1950, 2020)),
+            rooms=int(rng.integers(1, 6)),
+        )
+        for _ in range(60)
+    ]
+    encoder = FeatureEncoder.from_schema(None)
+    encoded = encoder.encode(rows)
+    df = pd.DataFrame(encoded.numeric, columns=encoded.numeric_names)
+    for j, name in enumerate(encoded.categorical_names):
+        df.insert(j, name, encoded.categorical[:, j])
+    y = np.log1p(df["bra"].to_numpy() * 40_000)
+    model = CatBoostRegressor(iterations=20, depth=3, verbose=False, allow_writing_files=False)
+    model.fit(Pool(df, y, cat_features=[0, 1]))
+
+    predictor = SklearnPredictor(model_version="v1", pipeline=model, prediction_transform="expm1")
+
+    expected = np.maximum(np.expm1(model.predict(df)).astype(np.int64), 0)
+    assert predictor.predict_batch(rows).tolist() == expected.tolist()
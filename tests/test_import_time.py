@@ -0,0 +1,35 @@
+from scripts.check_import_time import (
+    DEFAULT_FORBIDDEN,
+    forbidden_imports,
+    main,
+    measure,
+    parse_importtime,
+    total_ms,
+)
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   numpy._core
+import time:        80 |        200 | numpy
+import time:        50 |        350 | app.main
+"""
+
+
+def test_parse_importtime_reads_depth_and_times():
+    timings = parse_importtime(SAMPLE)
+
+    assert [(t.module, t.depth) for t in timings] == [
+        ("numpy._core", 1),
+        ("numpy", 0),
+        ("app.main", 0),
+    ]
+    assert total_ms(timings, "app.main") == 0.35
+    assert forbidden_imports(timings, ("pandas", "numpy")) == ["numpy"]
+
+
+def test_api_import_keeps_heavy_libraries_lazy():
+    assert forbidden_imports(measure("app.main"), DEFAULT_FORBIDDEN) == []
+
+
+def test_budget_failure_sets_exit_code():
+    assert main(["--runs", "1", "--budget-ms", "1", "--top", "0"]) == 1
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.dependencies import get_inference_executor
+from app.services.inference_executor import InferenceExecutor, InferenceQueueFullError
+
+PAYLOAD = {
+    "1": {
+        "realestate_type": "enebolig",
+        "municipality_number": 301,
+        "lat": 59.91,
+        "lon": 10.75,
+        "built_year": 2000,
+        "total_area": 120.0,
+        "bra": 100.0,
+    }
+}
+
+
+def test_executor_runs_job_off_event_loop():
+    executor = InferenceExecutor(max_workers=1, max_queue=0)
+    try:
+        name = asyncio.run(executor.run(lambda: threading.current_thread().name))
+    finally:
+        executor.shutdown()
+
+    assert name.startswith("inference")
+
+
+def test_executor_rejects_when_full_and_recovers():
+    executor = InferenceExecutor(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait))
+        queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(InferenceQueueFullError):
+            await executor.run(lambda: "rejected")
+
+        release.set()
+        assert await running is True
+        assert await queued == "queued"
+        return await executor.run(lambda: "after")
+
+    try:
+        assert asyncio.run(scenario()) == "after"
+    finally:
+        executor.shutdown()
+
+
+def test_estimate_returns_503_with_retry_after_when_queue_full(client):
+    class FullExecutor:
+        async def run(self, fn, *args):
+            raise InferenceQueueFullError("full")
+
+    client.app.dependency_overrides[get_inference_executor] = lambda: FullExecutor()
+    try:
+        resp = client.post("/estimate", json=PAYLOAD)
+    finally:
+        client.app.dependency_overrides.pop(get_inference_executor)
+
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "1"
+    assert resp.json()["detail"]["message"] == "inference_queue_full"
+
+
+def test_estimate_runs_on_inference_executor(client):
+    resp = client.post("/estimate", json=PAYLOAD)
+
+    assert resp.status_code == 200
+    assert resp.json()["1"]["model_version"] == "stub-v1"
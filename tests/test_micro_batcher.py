@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+
+from app.dependencies import get_micro_batcher
+from app.ml.stub import StubPredictor
+from app.services.estimate_service import estimate_batch_coalesced, estimate_batch_json
+from app.services.inference_executor import InferenceExecutor
+from app.services.micro_batcher import MicroBatcher
+from app.services.prediction_cache import PredictionCache
+from tests.helpers import CountingPredictor, features
+
+
+class FailingPredictor(StubPredictor):
+    def __init__(self):
+        super().__init__(model_version="broken", usable_area_coef=1, total_area_coef=1)
+
+    def predict_batch(self, features):
+        raise RuntimeError("boom")
+
+
+@pytest.fixture
+def executor():
+    executor = InferenceExecutor(max_workers=1, max_queue=8)
+    yield executor
+    executor.shutdown()
+
+
+def test_concurrent_requests_share_one_model_call(executor):
+    predictor = CountingPredictor()
+    batcher = MicroBatcher(executor, window_ms=20, max_batch_size=100)
+    requests = [[features(10 * i + j) for j in range(1, i + 2)] for i in range(4)]
+
+    async def scenario():
+        return await asyncio.gather(*(batcher.predict_batch(predictor, r) for r in requests))
+
+    results = asyncio.run(scenario())
+
+    assert predictor.batches == [sum(len(r) for r in requests)]
+    for request, prices in zip(requests, results):
+        assert prices.tolist() == [predictor.predict_one(f) for f in request]
+
+
+def test_flushes_when_max_batch_size_reached(executor):
+    predictor = CountingPredictor()
+    batcher = MicroBatcher(executor, window_ms=10_000, max_batch_size=3)
+
+    async def scenario():
+        return await asyncio.wait_for(
+            asyncio.gather(
+                batcher.predict_batch(predictor, [features(1), features(2)]),
+                batcher.predict_batch(predictor, [features(3)]),
+            ),
+            timeout=2,
+        )
+
+    first, second = asyncio.run(scenario())
+
+    assert predictor.batches == [3]
+    assert len(first) == 2 and len(second) == 1
+
+
+def test_groups_by_predictor(executor):
+    old, new = CountingPredictor("v1"), CountingPredictor("v2")
+    batcher = MicroBatcher(executor, window_ms=20, max_batch_size=100)
+
+    async def scenario():
+        await asyncio.gather(
+            batcher.predict_batch(old, [features(1)]),
+            batcher.predict_batch(new, [features(2)]),
+            batcher.predict_batch(old, [features(3)]),
+        )
+
+    asyncio.run(scenario())
+
+    assert old.batches == [2]
+    assert new.batches == [1]
+
+
+def test_model_errors_reach_every_caller(executor):
+    batcher = MicroBatcher(executor, window_ms=5, max_batch_size=100)
+    predictor = FailingPredictor()
+
+    async def scenario():
+        return await asyncio.gather(
+            batcher.predict_batch(predictor, [features(1)]),
+            batcher.predict_batch(predictor, [features(2)]),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_coalesced_estimate_matches_direct(executor):
+    predictor = CountingPredictor()
+    batcher = MicroBatcher(executor, window_ms=1, max_batch_size=100)
+    cache = PredictionCache(max_entries=100, ttl_seconds=60)
+    payload = {"a": features(100), "b": features(60)}
+
+    async def scenario():
+        cold, _ = await estimate_batch_coalesced(payload, predictor, batcher, cache)
+        warm, _ = await estimate_batch_coalesced(payload, predictor, batcher, cache)
+        return cold, warm
+
+    cold, warm = asyncio.run(scenario())
+
+    assert cold == estimate_batch_json(payload, predictor)[0]
+    assert warm == cold
+    assert predictor.batches[:1] == [2]
+    assert len(predictor.batches) == 2  # the warm call hit the cache; the other is direct
+
+
+def test_estimate_route_uses_micro_batcher(client):
+    batcher = MicroBatcher(client.app.state.inference_executor, window_ms=1, max_batch_size=16)
+    client.app.dependency_overrides[get_micro_batcher] = lambda: batcher
+    payload = {
+        "1": {
+            "realestate_type": "enebolig",
+            "municipality_number": 301,
+            "lat": 59.91,
+            "lon": 10.75,
+            "built_year": 2000,
+            "total_area": 120.0,
+            "bra": 100.0,
+        }
+    }
+    try:
+        resp = client.post("/estimate", json=payload)
+    finally:
+        client.app.dependency_overrides.pop(get_micro_batcher)
+
+    assert resp.status_code == 200
+    assert resp.json()["1"]["estimated_price"] == int(100 * 50_000 + 120 * 5_000)
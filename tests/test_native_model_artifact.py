@@ -0,0 +1,100 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from catboost import CatBoostRegressor, Pool
+
+from app.ml.registry import ModelRegistry
+from app.schemas import EstimationFeatures
+from app.training.publish import update_latest_json, upload_model_artifacts
+from tests.helpers import MemoryStorage
+
+
+def _train_model() -> CatBoostRegressor:
+    rng = np.random.default_rng(1)
+    n = 80
+    df = pd.DataFrame(
+        {
+            "realestate_type": rng.choice(["enebolig", "leilighet"], n),
+            "municipality_number": rng.choice(["301", "4003"], n),
+            "lat": rng.uniform(58, 63, n),
+            "lon": rng.uniform(5, 11, n),
+            "built_year": rng.integers(1950, 2020, n).astype(float),
+            "building_age": rng.integers(5, 70, n).astype(float),
+            "bra": rng.uniform(40, 200, n),
+            "total_area": rng.uniform(200, 300, n),
+            "floor": rng.integers(1, 5, n).astype(float),
+            "bedrooms": rng.integers(1, 5, n).astype(float),
+            "rooms": rng.integers(1, 7, n).astype(float),
+            "area_ratio": rng.uniform(0.2, 1, n),
+        }
+    )
+    y = np.log1p(df["bra"].to_numpy() * 40_000)
+    model = CatBoostRegressor(iterations=20, depth=3, verbose=False, allow_writing_files=False)
+    model.fit(Pool(df, y, cat_features=[0, 1]))
+    return model
+
+
+def test_publish_writes_native_model_and_registry_prefers_it():
+    storage = MemoryStorage()
+    model = _train_model()
+
+    keys = upload_model_artifacts(
+        storage=storage,
+        model_version="v-native",
+        pipeline=model,
+        metrics={},
+        feature_schema={"prediction_transform": "expm1"},
+        training_manifest={},
+    )
+    update_latest_json(
+        storage=storage,
+        model_version="v-native",
+        artifact_key=keys["model_key"],
+        snapshot_prefix="snapshots/x",
+        native_artifact_key=keys.get("native_model_key"),
+    )
+
+    assert keys["native_model_key"] == "models/v-native/model.cbm"
+    schema = storage.get_json("b", keys["schema_key"])
+    assert schema["native_model_format"] == "cbm"
+    assert storage.get_json("b", "latest.json")["native_artifact_key"] == keys["native_model_key"]
+
+    with patch("joblib.load", side_effect=AssertionError("pickle must not be used")):
+        predictor = ModelRegistry(storage).get_predictor()
+
+    features = EstimationFeatures(
+        realestate_type="enebolig",
+        municipality_number=301,
+        lat=59.9,
+        lon=10.7,
+        built_year=2000,
+        total_area=250.0,
+        bra=120.0,
+    )
+    assert predictor.model_version == "v-native"
+    assert predictor.predict_one(features) > 0
+
+
+def test_registry_falls_back_to_pickle_when_native_is_unreadable():
+    storage = MemoryStorage()
+    keys = upload_model_artifacts(
+        storage=storage,
+        model_version="v1",
+        pipeline=_train_model(),
+        metrics={},
+        feature_schema={"prediction_transform": "expm1"},
+        training_manifest={},
+    )
+    storage.objects[keys["native_model_key"]] = b"corrupted"
+    update_latest_json(
+        storage=storage,
+        model_version="v1",
+        artifact_key=keys["model_key"],
+        snapshot_prefix="snapshots/x",
+        native_artifact_key=keys["native_model_key"],
+    )
+
+    predictor = ModelRegistry(storage).get_predictor()
+
+    assert predictor.model_version == "v1"
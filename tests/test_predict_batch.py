@@ -0,0 +1,65 @@
+import json
+
+import numpy as np
+
+from app.ml.sklearn_predictor import SklearnPredictor
+from app.ml.stub import StubPredictor
+from app.services.estimate_service import estimate_batch_json
+from tests.helpers import features
+
+
+class FakePipeline:
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, df):
+        self.calls += 1
+        return np.log1p(df["bra"].to_numpy(dtype=float) * 10_000)
+
+
+def test_stub_predict_batch_matches_predict_one():
+    stub = StubPredictor(model_version="stub-v1", usable_area_coef=50_000, total_area_coef=5_000)
+    batch = [features(167, total_area=472.8), features(55.5), features(80)]
+
+    prices = stub.predict_batch(batch)
+
+    assert prices.dtype == np.int64
+    assert prices.tolist() == [stub.predict_one(f) for f in batch]
+
+
+def test_sklearn_predict_batch_calls_model_once():
+    pipeline = FakePipeline()
+    predictor = SklearnPredictor(
+        model_version="v1", pipeline=pipeline, prediction_transform="expm1"
+    )
+
+    prices = predictor.predict_batch([features(100), features(50), features(75)])
+
+    assert pipeline.calls == 1
+    assert np.allclose(prices, [1_000_000, 500_000, 750_000], atol=1)
+
+
+def test_sklearn_predict_batch_empty():
+    pipeline = FakePipeline()
+    predictor = SklearnPredictor(model_version="v1", pipeline=pipeline)
+
+    assert predictor.predict_batch([]).shape == (0,)
+    assert pipeline.calls == 0
+
+
+def test_estimate_batch_uses_single_model_call():
+    pipeline = FakePipeline()
+    predictor = SklearnPredictor(
+        model_version="v1", pipeline=pipeline, prediction_transform="expm1"
+    )
+    payload = {"a": features(100, bedrooms=2, rooms=3), "b": features(50)}
+
+    body, prices = estimate_batch_json(payload, predictor=predictor)
+    results = json.loads(body)
+
+    assert pipeline.calls == 1
+    assert list(results) == ["a", "b"]
+    assert results["a"]["warnings"] == []
+    assert results["b"]["warnings"] == ["bedrooms_missing", "rooms_missing"]
+    assert results["b"]["model_version"] == "v1"
+    assert prices.tolist() == [results[k]["estimated_price"] for k in ("a", "b")]
@@ -0,0 +1,88 @@
+import numpy as np
+
+from app.services.estimate_service import estimate_batch_json
+from app.services.prediction_cache import PredictionCache
+from tests.helpers import CountingPredictor, features
+
+
+def test_cache_predicts_only_misses():
+    predictor = CountingPredictor()
+    cache = PredictionCache(max_entries=100, ttl_seconds=60)
+
+    first = cache.predict_batch(predictor, [features(100), features(50)], "stub-v1")
+    second = cache.predict_batch(predictor, [features(50), features(75), features(100)], "stub-v1")
+
+    assert predictor.batches == [2, 1]
+    expected = predictor.predict_batch([features(50), features(75), features(100)])
+    assert second.tolist() == expected.tolist()
+    assert first.tolist() == [second[2], second[0]]
+
+
+def test_cache_key_includes_model_version():
+    predictor = CountingPredictor()
+    cache = PredictionCache(max_entries=100, ttl_seconds=60)
+
+    cache.predict_batch(predictor, [features(100)], "v1")
+    cache.predict_batch(predictor, [features(100)], "v2")
+
+    assert predictor.batches == [1, 1]
+
+
+def test_cache_key_ignores_fields_the_model_never_reads():
+    predictor = CountingPredictor()
+    cache = PredictionCache(max_entries=100, ttl_seconds=60)
+
+    cache.predict_batch(predictor, [features(100, gnr_number=1, bnr_number=2)], "v1")
+    cache.predict_batch(predictor, [features(100, gnr_number=7, snr_number=3)], "v1")
+
+    assert predictor.batches == [1]
+    assert len(cache) == 1
+
+
+def test_cache_expires_entries_after_ttl():
+    predictor = CountingPredictor()
+    cache = PredictionCache(max_entries=100, ttl_seconds=0)
+
+    cache.predict_batch(predictor, [features(100)], "stub-v1")
+    cache.predict_batch(predictor, [features(100)], "stub-v1")
+
+    assert predictor.batches == [1, 1]
+
+
+def test_cache_evicts_least_recently_used():
+    predictor = CountingPredictor()
+    cache = PredictionCache(max_entries=2, ttl_seconds=60)
+
+    cache.predict_batch(predictor, [features(10), features(20)], "stub-v1")
+    cache.predict_batch(predictor, [features(10)], "stub-v1")  # refresh 10
+    cache.predict_batch(predictor, [features(30)], "stub-v1")  # evicts 20
+
+    assert len(cache) == 2
+    predictor.batches.clear()
+    cache.predict_batch(predictor, [features(10), features(20)], "stub-v1")
+    assert predictor.batches == [1]
+
+
+def test_clear_flushes_cache():
+    predictor = CountingPredictor()
+    cache = PredictionCache(max_entries=100, ttl_seconds=60)
+    cache.predict_batch(predictor, [features(100)], "stub-v1")
+
+    cache.clear()
+
+    assert len(cache) == 0
+
+
+def test_estimate_batch_json_with_cache_matches_uncached():
+    predictor = CountingPredictor()
+    cache = PredictionCache(max_entries=100, ttl_seconds=60)
+    payload = {"a": features(100, bedrooms=None), "b": features(60)}
+
+    uncached, _ = estimate_batch_json(payload, predictor)
+    cached_cold, _ = estimate_batch_json(payload, predictor, cache=cache)
+    cached_warm, _ = estimate_batch_json(payload, predictor, cache=cache)
+
+    assert cached_cold == uncached
+    assert cached_warm == uncached
+    assert predictor.batches == [2, 2]
+    assert isinstance(cache.predict_batch(predictor, [], "stub-v1"), np.ndarray)
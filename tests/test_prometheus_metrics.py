@@ -1,5 +1,93 @@
+import numpy as np
+
+from app.dependencies import get_prediction_cache
+from app.ml.stub import StubPredictor
+from app.ml.warmup import warm_up
+from app.observability.prometheus import off_request_path
+from tests.helpers import sample
+
+
 def test_prometheus_metrics_endpoint(client):
     resp = client.get("/metrics/prometheus")
     assert resp.status_code == 200
     assert "http_requests_total" in resp.text
     assert "http_request_duration_seconds" in resp.text
+
+
+def _requests_total(method: str, path: str, status: str) -> float:
+    return sample("http_requests_total", method=method, path=path, status=status)
+
+
+def test_http_metrics_are_labelled_by_route_template(client):
+    before = _requests_total("GET", "/health", "200")
+    unmatched_before = _requests_total("GET", "<unmatched>", "404")
+
+    assert client.get("/health").status_code == 200
+    assert client.get("/no/such/path/123").status_code == 404
+
+    assert _requests_total("GET", "/health", "200") == before + 1
+    assert _requests_total("GET", "<unmatched>", "404") == unmatched_before + 1
+    assert _requests_total("GET", "/no/such/path/123", "404") == 0
+
+
+def test_request_id_is_echoed_or_generated(client):
+    resp = client.get("/health", headers={"X-Request-Id": "req-123"})
+    assert resp.headers["X-Request-Id"] == "req-123"
+
+    generated = client.get("/health").headers["X-Request-Id"]
+    assert len(generated) == 36
+
+
+def test_estimate_records_stage_batch_and_type_metrics(client):
+    item = {
+        "realestate_type": "enebolig",
+        "municipality_number": 301,
+        "lat": 59.91,
+        "lon": 10.75,
+        "built_year": 2000,
+        "total_area": 120.0,
+        "bra": 100.0,
+    }
+    payload = {"a": item, "b": item, "c": {**item, "realestate_type": "tomannsbolig"}}
+    stages = ("validation", "predict", "serialization")
+    before = {s: sample("estimate_stage_duration_seconds_count", stage=s) for s in stages}
+    enebolig = sample("model_predictions_total", realestate_type="enebolig")
+    tomannsbolig = sample("model_predictions_total", realestate_type="tomannsbolig")
+    batches = sample("estimate_batch_size_count")
+    batch_items = sample("estimate_batch_size_sum")
+
+    # Bypass the result cache so the predictor is actually called.
+    client.app.dependency_overrides[get_prediction_cache] = lambda: None
+    try:
+        assert client.post("/estimate", json=payload).status_code == 200
+    finally:
+        client.app.dependency_overrides.pop(get_prediction_cache)
+
+    for stage in stages:
+        assert sample("estimate_stage_duration_seconds_count", stage=stage) == before[stage] + 1
+    assert sample("model_predictions_total", realestate_type="enebolig") == enebolig + 2
+    assert sample("model_predictions_total", realestate_type="tomannsbolig") == tomannsbolig + 1
+    assert sample("estimate_batch_size_count") == batches + 1
+    assert sample("estimate_batch_size_sum") == batch_items + 3
+    assert sample("estimate_item_latency_seconds_count") >= 1
+    assert sample("model_prediction_latency_seconds_count") >= 1
+
+
+def test_warm_up_and_bulk_calls_stay_out_of_request_path_metrics():
+    predictor = StubPredictor(model_version="stub-v1", usable_area_coef=1, total_area_coef=1)
+    before = (
+        sample("model_prediction_latency_seconds_count"),
+        sample("estimate_stage_duration_seconds_count", stage="predict"),
+    )
+
+    warm_up(predictor)
+    with off_request_path():
+        predictor.predict_columns({"bra": np.ones(3), "total_area": np.ones(3)})
+
+    assert (
+        sample("model_prediction_latency_seconds_count"),
+        sample("estimate_stage_duration_seconds_count", stage="predict"),
+    ) == before
+
+    predictor.predict_batch([])
+    assert sample("model_prediction_latency_seconds_count") == before[0] + 1
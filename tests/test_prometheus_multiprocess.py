@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+from prometheus_client import generate_latest
+
+from app.observability.prometheus import REGISTRY, mark_process_dead, scrape_registry
+
+_RECORD = """
+import os
+from app.observability.prometheus import INFERENCE_QUEUE_DEPTH, TRAINING_GATING_REASONS_TOTAL
+TRAINING_GATING_REASONS_TOTAL.labels(reason="mp_test", status="ok").inc()
+INFERENCE_QUEUE_DEPTH.set(3)
+print(os.getpid())
+"""
+
+
+def _record_in_subprocess(multiproc_dir) -> int:
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(multiproc_dir)}
+    out = subprocess.run(
+        [sys.executable, "-c", _RECORD], env=env, check=True, capture_output=True, text=True
+    )
+    return int(out.stdout.strip().splitlines()[-1])
+
+
+def test_scrape_registry_is_in_process_registry_by_default(monkeypatch):
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+
+    assert scrape_registry() is REGISTRY
+    mark_process_dead(os.getpid())  # no-op outside multiprocess mode
+
+
+def test_scrape_aggregates_metrics_of_other_processes(tmp_path, monkeypatch):
+    pids = [_record_in_subprocess(tmp_path), _record_in_subprocess(tmp_path)]
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    text = generate_latest(scrape_registry()).decode()
+    assert 'training_gating_reasons_total{reason="mp_test",status="ok"} 2.0' in text
+    assert "inference_queue_depth 6.0" in text
+
+    for pid in pids:
+        mark_process_dead(pid)
+    text = generate_latest(scrape_registry()).decode()
+    # Counters survive their process; livesum gauges do not.
+    assert 'training_gating_reasons_total{reason="mp_test",status="ok"} 2.0' in text
+    assert "inference_queue_depth 6.0" not in text
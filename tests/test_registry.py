@@ -1,10 +1,22 @@
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from unittest.mock import Mock, patch
 
 import pytest
 
-from app.ml.registry import ModelNotReadyError, ModelRegistry
+from app.dependencies import get_predictor
+from app.ml.pool import PredictorPool
+from app.ml.registry import (
+    ModelNotReadyError,
+    ModelRef,
+    ModelRegistry,
+    ModelVersionNotFoundError,
+)
 from app.ml.stub import StubPredictor
+from app.ml.warmup import warm_up
+from app.observability.prometheus import REGISTRY
+from app.schemas import RealEstateType
 from app.storage.s3 import S3Storage, S3StorageError
 
 
@@ -37,6 +49,7 @@ def test_get_predictor_refreshes_cache(mock_storage):
     assert isinstance(predictor, StubPredictor)
     assert registry._cached_version == "v1"
     assert mock_storage.get_json.call_count == 2
+    assert REGISTRY.get_sample_value("model_version_info", {"model_version": "v1"}) == 1
 
 
 def test_load_latest_missing(mock_storage):
@@ -80,7 +93,353 @@ def test_build_predictor_sklearn(mock_storage):
     ]
     mock_storage.get_bytes.return_value = b"fake-joblib-data"
 
-    with patch("joblib.load", return_value="mock-model"):
+    with patch("joblib.load", return_value="mock-model"), patch("app.ml.registry.warm_up"):
         predictor = registry.get_predictor()
 
     assert predictor.model_version == "v2"
+
+
+def test_load_predictor_leaves_no_artifact_size_behind(mock_storage):
+    """Test that models loaded outside the pool (bulk workers) don't keep size entries."""
+    registry = ModelRegistry(mock_storage)
+    mock_storage.get_json.return_value = {"prediction_transform": "log1p"}
+    mock_storage.get_bytes.return_value = b"fake-joblib-data"
+    ref = ModelRef(model_version="v2", model_type="sklearn", artifact_key="models/v2/model.pkl")
+
+    with patch("joblib.load", return_value="mock-model"):
+        predictor = registry.load_predictor(ref)
+
+    assert predictor.model_version == "v2"
+    assert registry._artifact_bytes == {}
+
+
+def test_refresh_skips_reload_when_version_unchanged(mock_storage):
+    """Test that an expired TTL only re-reads latest.json if the version is unchanged."""
+    registry = ModelRegistry(mock_storage, refresh_seconds=60)
+    latest = {"model_version": "v1", "type": "stub", "artifact_key": "models/v1/artifact.json"}
+    mock_storage.get_json.side_effect = [latest, {"params": {}}, latest]
+
+    first = registry.get_predictor()
+    registry._cached_at = 0.0
+    second = registry.get_predictor()
+
+    assert second is first
+    assert mock_storage.get_json.call_count == 3
+    assert registry._cached_at > 0.0
+
+
+def test_refresh_reloads_when_version_changes(mock_storage):
+    """Test that a new model_version in latest.json triggers an artifact reload."""
+    registry = ModelRegistry(mock_storage, refresh_seconds=60)
+    mock_storage.get_json.side_effect = [
+        {"model_version": "v1", "type": "stub", "artifact_key": "models/v1/artifact.json"},
+        {"params": {}},
+        {"model_version": "v2", "type": "stub", "artifact_key": "models/v2/artifact.json"},
+        {"params": {}},
+    ]
+
+    first = registry.get_predictor()
+    registry._cached_at = 0.0
+    second = registry.get_predictor()
+
+    assert second is not first
+    assert second.model_version == "v2"
+    assert registry._cached_version == "v2"
+
+
+def test_refresh_warms_and_swaps_new_version(mock_storage):
+    """Test that refresh() loads, warms up and swaps in a changed model."""
+    registry = ModelRegistry(mock_storage, refresh_seconds=60)
+    latest = {"model_version": "v1", "type": "stub", "artifact_key": "models/v1/artifact.json"}
+    mock_storage.get_json.side_effect = [latest, {"params": {}}, latest]
+
+    with patch("app.ml.registry.warm_up") as warm:
+        assert registry.refresh() is True
+        assert registry.refresh() is False
+
+    warm.assert_called_once()
+    assert registry._cached_version == "v1"
+
+
+def test_background_refresh_serves_current_reference(mock_storage):
+    """Test that with a running refresher get_predictor never touches storage."""
+    registry = ModelRegistry(mock_storage, refresh_seconds=3600, background_refresh=True)
+    mock_storage.get_json.side_effect = [
+        {"model_version": "v1", "type": "stub", "artifact_key": "models/v1/artifact.json"},
+        {"params": {}},
+    ]
+
+    registry.start_background_refresh()
+    try:
+        deadline = time.time() + 5
+        while registry._cached_predictor is None and time.time() < deadline:
+            time.sleep(0.01)
+        registry._cached_at = 0.0
+
+        predictor = registry.get_predictor()
+    finally:
+        registry.stop_background_refresh()
+
+    assert predictor.model_version == "v1"
+    assert mock_storage.get_json.call_count == 2
+
+
+def test_concurrent_reloads_are_single_flight(mock_storage):
+    """Test that concurrent cold callers share one artifact load."""
+    registry = ModelRegistry(mock_storage, refresh_seconds=60)
+    release = threading.Event()
+    calls = {"latest": 0}
+
+    def get_json(bucket, key):
+        if key == "latest.json":
+            calls["latest"] += 1
+            release.wait(5)
+            return {"model_version": "v1", "type": "stub", "artifact_key": "models/v1/a.json"}
+        return {"params": {}}
+
+    mock_storage.get_json.side_effect = get_json
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(registry.get_predictor) for _ in range(8)]
+        time.sleep(0.1)
+        release.set()
+        predictors = [f.result(timeout=5) for f in futures]
+
+    assert calls["latest"] == 1
+    assert all(p is predictors[0] for p in predictors)
+
+
+def test_stale_predictor_served_while_reload_in_flight(mock_storage):
+    """Test that callers with a stale predictor do not wait for an in-flight reload."""
+    registry = ModelRegistry(mock_storage, refresh_seconds=60)
+    stale = Mock(spec=StubPredictor)
+    registry._cached_predictor = stale
+    registry._inflight = Future()
+
+    assert registry.get_predictor() is stale
+    mock_storage.get_json.assert_not_called()
+
+
+def test_swap_listener_called_on_new_version(mock_storage):
+    """Test that swap listeners are notified once per swapped-in model."""
+    registry = ModelRegistry(mock_storage, refresh_seconds=60)
+    latest = {"model_version": "v1", "type": "stub", "artifact_key": "models/v1/artifact.json"}
+    mock_storage.get_json.side_effect = [latest, {"params": {}}, latest]
+    swapped = []
+    registry.add_swap_listener(lambda ref: swapped.append(ref.model_version))
+
+    with patch("app.ml.registry.warm_up"):
+        registry.refresh()
+        registry.refresh()
+
+    assert swapped == ["v1"]
+
+
+def test_detached_registry_serves_inherited_predictor(mock_storage):
+    """Test that a registry inherited over fork never reloads on its own."""
+    registry = ModelRegistry(mock_storage, refresh_seconds=1)
+    inherited = Mock(spec=StubPredictor)
+    registry._cached_predictor = inherited
+    registry._cached_at = 0.0
+    worker_storage = Mock(spec=S3Storage)
+
+    registry.detach_after_fork(worker_storage)
+
+    assert registry.get_predictor() is inherited
+    mock_storage.get_json.assert_not_called()
+    worker_storage.get_json.assert_not_called()
+
+
+def test_detach_after_fork_replaces_a_pool_lock_held_by_the_parent(mock_storage):
+    """Test that a pool lock held at fork time (parent mid-swap) does not hang the worker."""
+    pool = PredictorPool(max_versions=2)
+    pinned = Mock(spec=StubPredictor)
+    pool.put("v-old", pinned, 1)
+    registry = ModelRegistry(mock_storage, pool=pool)
+    pool._lock.acquire()
+
+    registry.detach_after_fork(Mock(spec=S3Storage))
+
+    assert registry.get_predictor(model_version="v-old") is pinned
+
+
+def _stub_storage(mock_storage, versions: set[str]) -> None:
+    mock_storage.exists.side_effect = lambda bucket, key: (
+        key.endswith("/model.json") and key.split("/")[1] in versions
+    )
+    mock_storage.get_json.side_effect = lambda bucket, key: {"params": {}}
+
+
+def test_pinned_version_loaded_lazily_into_pool(mock_storage):
+    """Test that get_predictor(model_version=...) loads models/<ver>/ once."""
+    registry = ModelRegistry(mock_storage, pool=PredictorPool(max_versions=2))
+    _stub_storage(mock_storage, {"v1"})
+
+    first = registry.get_predictor(model_version="v1")
+    second = registry.get_predictor(model_version="v1")
+
+    assert first is second
+    assert first.model_version == "v1"
+    mock_storage.get_json.assert_called_once()
+
+
+def test_pinned_unknown_version_raises_not_found(mock_storage):
+    """Test that unknown or malformed versions raise ModelVersionNotFoundError."""
+    registry = ModelRegistry(mock_storage)
+    _stub_storage(mock_storage, set())
+
+    with pytest.raises(ModelVersionNotFoundError, match="Unknown model version"):
+        registry.get_predictor(model_version="v9")
+    with pytest.raises(ModelVersionNotFoundError, match="Invalid model version"):
+        registry.get_predictor(model_version="../latest")
+
+
+def test_pool_evicts_least_recently_used_version(mock_storage):
+    """Test that the pool keeps at most max_versions pinned predictors."""
+    registry = ModelRegistry(mock_storage, pool=PredictorPool(max_versions=2))
+    _stub_storage(mock_storage, {"v1", "v2", "v3"})
+
+    v1 = registry.get_predictor(model_version="v1")
+    registry.get_predictor(model_version="v2")
+    assert registry.get_predictor(model_version="v1") is v1
+    registry.get_predictor(model_version="v3")
+
+    assert registry._pool.versions() == ["v1", "v3"]
+
+
+def test_pool_accounts_artifact_bytes():
+    """Test that the byte budget evicts older entries but keeps the newest."""
+    pool = PredictorPool(max_versions=5, max_bytes=100)
+    pool.put("v1", Mock(), 60)
+    pool.put("v2", Mock(), 30)
+    pool.put("v3", Mock(), 50)
+
+    assert pool.versions() == ["v2", "v3"]
+    assert pool.total_bytes == 80
+
+    pool.put("v4", Mock(), 500)
+    assert pool.versions() == ["v4"]
+
+
+def test_previous_active_version_stays_resident_after_swap(mock_storage):
+    """Test that a swapped-out model can still be pinned without reloading."""
+    registry = ModelRegistry(mock_storage, refresh_seconds=60)
+    mock_storage.get_json.side_effect = [
+        {"model_version": "v1", "type": "stub", "artifact_key": "models/v1/artifact.json"},
+        {"params": {}},
+        {"model_version": "v2", "type": "stub", "artifact_key": "models/v2/artifact.json"},
+        {"params": {}},
+    ]
+
+    v1 = registry.get_predictor()
+    registry._cached_at = 0.0
+    v2 = registry.get_predictor()
+
+    assert registry.get_predictor(model_version="v2") is v2
+    assert registry.get_predictor(model_version="v1") is v1
+    mock_storage.exists.assert_not_called()
+
+
+def test_estimate_pins_model_version_header(client):
+    """Test that X-Model-Version routes /estimate to the registry's pinned predictor."""
+    payload = {
+        "1": {
+            "realestate_type": "enebolig",
+            "municipality_number": 301,
+            "lat": 59.91,
+            "lon": 10.75,
+            "built_year": 2000,
+            "total_area": 120.0,
+            "bra": 100.0,
+        }
+    }
+    registry = Mock(spec=ModelRegistry)
+
+    def pinned_predictor(model_version=None):
+        if model_version != "v-old":
+            raise ModelVersionNotFoundError(f"Unknown model version: {model_version}")
+        return StubPredictor(model_version=model_version, usable_area_coef=1, total_area_coef=1)
+
+    registry.get_predictor.side_effect = pinned_predictor
+    override = client.app.dependency_overrides.pop(get_predictor)
+    original_registry = client.app.state.registry
+    client.app.state.registry = registry
+    try:
+        pinned = client.post("/estimate", json=payload, headers={"X-Model-Version": "v-old"})
+        missing = client.post("/estimate", json=payload, headers={"X-Model-Version": "nope"})
+    finally:
+        client.app.state.registry = original_registry
+        client.app.dependency_overrides[get_predictor] = override
+
+    assert pinned.status_code == 200
+    assert pinned.json()["1"]["model_version"] == "v-old"
+    assert missing.status_code == 404
+    assert missing.json()["detail"]["message"] == "model_version_not_found"
+
+
+def test_warm_up_covers_every_type_and_batch_size():
+    """Test that warm-up runs one batch per size, cycling through all RealEstateType values."""
+    predictor = Mock(spec=StubPredictor)
+    warm_up(predictor, batch_sizes=[1, 8, 0])
+
+    batches = [call.args[0] for call in predictor.predict_batch.call_args_list]
+    assert [len(b) for b in batches] == [1, 8]
+    assert {f.realestate_type for f in batches[1]} == set(RealEstateType)
+
+
+def test_lazy_load_is_warmed_and_timed(mock_storage):
+    """Test that even a request-path load warms the model before serving it."""
+    registry = ModelRegistry(mock_storage, warmup_batch_sizes=[4])
+    mock_storage.get_json.side_effect = [
+        {"model_version": "v1", "type": "stub", "artifact_key": "models/v1/artifact.json"},
+        {"params": {}},
+    ]
+    loads = REGISTRY.get_sample_value("model_load_duration_seconds_count") or 0.0
+    warmups = REGISTRY.get_sample_value("model_warmup_duration_seconds_count") or 0.0
+
+    with patch("app.ml.registry.warm_up") as warm:
+        predictor = registry.get_predictor()
+
+    warm.assert_called_once_with(predictor, (4,))
+    assert registry.is_ready()
+    assert REGISTRY.get_sample_value("model_load_duration_seconds_count") == loads + 1
+    assert REGISTRY.get_sample_value("model_warmup_duration_seconds_count") == warmups + 1
+
+
+def test_eager_load_warms_in_background_and_survives_missing_model(mock_storage):
+    """Test that start_eager_load() loads off-thread and only logs when there is no model."""
+    registry = ModelRegistry(mock_storage)
+    mock_storage.get_json.side_effect = S3StorageError("missing latest.json")
+
+    registry.start_eager_load()
+    _wait_for(lambda: mock_storage.get_json.called and not registry.is_loading())
+    assert not registry.is_ready()
+
+    mock_storage.get_json.side_effect = [
+        {"model_version": "v1", "type": "stub", "artifact_key": "models/v1/artifact.json"},
+        {"params": {}},
+    ]
+    registry.start_eager_load()
+    _wait_for(registry.is_ready)
+    assert registry._cached_version == "v1"
+
+
+def test_ready_returns_503_while_model_is_warming(client):
+    """Test that /ready reports warming up while the startup load is in flight."""
+    registry = client.app.state.registry
+    registry._inflight = Future()
+    try:
+        resp = client.get("/ready")
+    finally:
+        registry._inflight = None
+
+    assert resp.status_code == 503
+    assert resp.json()["detail"]["message"] == "model_warming_up"
+    assert client.get("/ready").status_code == 200
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
@@ -0,0 +1,128 @@
+import threading
+from unittest.mock import Mock
+
+import numpy as np
+
+from app.dependencies import get_shadow_scorer
+from app.ml.registry import ModelRegistry, ModelVersionNotFoundError
+from app.ml.stub import StubPredictor
+from app.schemas import EstimationFeatures
+from app.services.shadow_scorer import ShadowScorer
+from tests.helpers import sample
+
+PAYLOAD = {
+    "1": {
+        "realestate_type": "enebolig",
+        "municipality_number": 301,
+        "lat": 59.91,
+        "lon": 10.75,
+        "built_year": 2000,
+        "total_area": 120.0,
+        "bra": 100.0,
+    }
+}
+
+
+def _stub(version: str, coef: float) -> StubPredictor:
+    return StubPredictor(model_version=version, usable_area_coef=coef, total_area_coef=0)
+
+
+def _drain(scorer: ShadowScorer) -> None:
+    scorer._executor.submit(lambda: None).result(timeout=5)
+
+
+def test_shadow_scores_candidate_and_records_diff():
+    registry = Mock(spec=ModelRegistry)
+    registry.get_predictor.return_value = _stub("shadow-cand", 55_000)
+    scorer = ShadowScorer(registry, "shadow-cand", sample_rate=1.0)
+    features = [EstimationFeatures.model_validate(PAYLOAD["1"])] * 3
+    primary = Mock(spec=StubPredictor, model_version="shadow-prim")
+    labels = {"primary_version": "shadow-prim", "candidate_version": "shadow-cand"}
+    try:
+        assert scorer.should_sample(primary)
+        scorer.submit(features, np.full(3, 5_000_000), primary)
+        _drain(scorer)
+    finally:
+        scorer.shutdown()
+
+    registry.get_predictor.assert_called_once_with(model_version="shadow-cand")
+    # The served prices are reused; the primary model is not called again.
+    primary.predict_batch.assert_not_called()
+    assert sample("shadow_prediction_diff_nok_count", **labels) == 3
+    assert sample("shadow_prediction_diff_nok_sum", **labels) == 3 * 500_000
+    # 10% apart: above the 0.05 bucket, within 0.1.
+    assert sample("shadow_prediction_abs_pct_diff_bucket", le="0.05", **labels) == 0
+    assert sample("shadow_prediction_abs_pct_diff_bucket", le="0.1", **labels) == 3
+    assert sample("shadow_prediction_latency_seconds_count", model_version="shadow-cand") == 1
+
+
+def test_shadow_skips_candidate_serving_as_primary():
+    scorer = ShadowScorer(Mock(spec=ModelRegistry), "v2", sample_rate=1.0)
+    try:
+        assert not scorer.should_sample(_stub("v2", 1))
+        assert not ShadowScorer(Mock(spec=ModelRegistry), "v3", sample_rate=0.0).should_sample(
+            _stub("v2", 1)
+        )
+    finally:
+        scorer.shutdown()
+
+
+def test_shadow_backs_off_when_candidate_missing():
+    registry = Mock(spec=ModelRegistry)
+    registry.get_predictor.side_effect = ModelVersionNotFoundError("Unknown model version")
+    scorer = ShadowScorer(registry, "missing", sample_rate=1.0, load_retry_seconds=60)
+    before = sample("shadow_batches_total", result="error")
+    try:
+        scorer.submit(
+            [EstimationFeatures.model_validate(PAYLOAD["1"])], np.array([100]), _stub("v1", 1)
+        )
+        _drain(scorer)
+        assert not scorer.should_sample(_stub("v1", 1))
+    finally:
+        scorer.shutdown()
+
+    assert sample("shadow_batches_total", result="error") == before + 1
+
+
+def test_shadow_drops_batches_when_saturated():
+    release = threading.Event()
+
+    class SlowStub(StubPredictor):
+        def predict_batch(self, features):
+            release.wait(5)
+            return super().predict_batch(features)
+
+    registry = Mock(spec=ModelRegistry)
+    registry.get_predictor.return_value = SlowStub(
+        model_version="slow", usable_area_coef=1, total_area_coef=0
+    )
+    scorer = ShadowScorer(registry, "slow", sample_rate=1.0, max_pending=1)
+    features = [EstimationFeatures.model_validate(PAYLOAD["1"])]
+    before = sample("shadow_batches_total", result="dropped")
+    primary = _stub("v1", 1)
+    try:
+        scorer.submit(features, np.array([100]), primary)
+        scorer.submit(features, np.array([100]), primary)
+        release.set()
+        _drain(scorer)
+    finally:
+        scorer.shutdown()
+
+    assert sample("shadow_batches_total", result="dropped") == before + 1
+
+
+def test_estimate_hands_batch_to_shadow_after_response(client):
+    shadow = Mock(spec=ShadowScorer)
+    shadow.should_sample.return_value = True
+
+    client.app.dependency_overrides[get_shadow_scorer] = lambda: shadow
+    try:
+        resp = client.post("/estimate", json=PAYLOAD)
+    finally:
+        client.app.dependency_overrides.pop(get_shadow_scorer)
+
+    assert resp.status_code == 200
+    features, prices, primary = shadow.submit.call_args.args
+    assert [f.bra for f in features] == [100.0]
+    assert prices.tolist() == [resp.json()["1"]["estimated_price"]]
+    assert primary.model_version == "stub-v1"